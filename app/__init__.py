@@ -4,7 +4,18 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
-from .main import app  # noqa: E402
+
+def __getattr__(name):
+    # The Flask app builds an NFTBridge from the environment, so it is only
+    # imported when asked for (wsgi.py, gunicorn app:app); the other modules
+    # of the package can be imported on their own, e.g. by the tests.
+    if name == "app":
+        from .main import app
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 if __name__ == "__main__":
+    from .main import app
+
     app.run(host="0.0.0.0", port=int(os.environ.get("PORT", 5000)))
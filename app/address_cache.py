@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from .constants import ADDRESS_CACHE_NEGATIVE_TTL, ADDRESS_CACHE_POSITIVE_TTL
+
+BRIDGED = "bridged"
+ORIGINAL = "original"
+APPROVED = "approved"
+
+
+class AddressCache:
+    """In-process cache of SCCNFTBridge lookups keyed by (kind, address).
+
+    This process invalidates entries itself after a deploy, clear or
+    approval change, but transactions sent from elsewhere can flip any
+    answer: positive answers (a bridged/original address, an approval)
+    expire after ``positive_ttl`` seconds and negative ones after the
+    shorter ``negative_ttl``.
+    """
+
+    def __init__(self, negative_ttl: float = ADDRESS_CACHE_NEGATIVE_TTL,
+                 positive_ttl: float = ADDRESS_CACHE_POSITIVE_TTL):
+        self.negative_ttl = negative_ttl
+        self.positive_ttl = positive_ttl
+        self._entries: Dict[Tuple[str, str], Tuple[Any, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, kind: str, address: str) -> Tuple[bool, Any]:
+        """Return (hit, value) for a lookup."""
+        key = (kind, address.lower())
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            value, expires_at = entry
+            if time.monotonic() > expires_at:
+                del self._entries[key]
+                return False, None
+            return True, value
+
+    def put(self, kind: str, address: str, value: Any):
+        """Cache a lookup result; falsy results are cached as negative entries."""
+        expires_at = time.monotonic() + (self.positive_ttl if value else self.negative_ttl)
+        with self._lock:
+            self._entries[(kind, address.lower())] = (value, expires_at)
+
+    def link(self, original_address: str, bridged_address: str):
+        """Cache both directions of an original/bridged pair."""
+        self.put(BRIDGED, original_address, bridged_address)
+        self.put(ORIGINAL, bridged_address, original_address)
+
+    def invalidate(self, *addresses: Optional[str]):
+        """Drop every cached lookup for the given addresses."""
+        lowered = {address.lower() for address in addresses if address}
+        with self._lock:
+            for key in [key for key in self._entries if key[1] in lowered]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
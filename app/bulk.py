@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+
+import argparse
+from collections import deque
+from dataclasses import dataclass, field
+import logging
+import time
+from typing import Deque, Dict, List, Optional, Tuple
+
+from .constants import BULK_MAX_IN_FLIGHT
+from .contracts import contract_at
+from .metrics import record_receipts
+from .nft_bridge import NFTBridge, CollectionSnapshot
+from .tx_pipeline import PendingTx, TxPipeline
+from .utils import target_chain_context, has_too_many_nfts, has_too_many_owners
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BulkCollection:
+    snapshot: CollectionSnapshot
+    job_id: int
+    # Source token URIs to set after the deploy, read while preparing
+    uris: List[str] = field(default_factory=list)
+    # (stage, chunk_index, method name, args) still to be sent
+    calls: Deque[Tuple[str, int, str, list]] = field(default_factory=deque)
+    sent: List[PendingTx] = field(default_factory=list)
+    deploy_tx: Optional[PendingTx] = None
+    bridged_address: Optional[str] = None
+    stage: str = "pending"
+    error: Optional[str] = None
+
+    @property
+    def original_address(self) -> str:
+        return self.snapshot.original_address
+
+    @property
+    def num_tokens(self) -> int:
+        return sum(len(unit.token_ids) for unit in self.snapshot.holders.values())
+
+
+class BulkBridge:
+    """Bridge many collections at once through one shared transaction pipeline.
+
+    Collections are taken smallest first, ``max_in_flight`` at a time. Each
+    turn of the scheduler sends at most one transaction per active
+    collection, so a large airdrop cannot starve the others, and every
+    transaction goes through the same TxPipeline and therefore the same
+    deployer nonce sequence. Each collection is recorded as a normal bridge
+    job, so a failed one can be finished with ``resume_bridge``.
+    """
+
+    def __init__(self, nft_bridge: NFTBridge, max_in_flight: int = BULK_MAX_IN_FLIGHT,
+                 override_requirements: bool = False):
+        self.nft_bridge = nft_bridge
+        self.max_in_flight = max(1, max_in_flight)
+        self.override_requirements = override_requirements
+
+    def prepare(self, addresses: List[str]) -> Tuple[List[BulkCollection], Dict[str, str]]:
+        """Snapshot, validate and read the token URIs of collections.
+
+        Returns (collections smallest first, {address: skip reason}).
+        """
+        store = self.nft_bridge.job_store
+        collections, skipped = [], {}
+        for address in dict.fromkeys(addresses):
+            original_address = self.nft_bridge.get_original_address(address) or address
+            if bridged_address := self.nft_bridge.get_bridged_address(original_address, confirm=True):
+                skipped[original_address] = f"already bridged to {bridged_address}"
+                continue
+            if not self.nft_bridge.is_collection_approved(original_address):
+                skipped[original_address] = "not approved for bridging"
+                continue
+
+            try:
+                snapshot = self.nft_bridge.get_collection_snapshot(original_address)
+            except Exception as e:
+                logger.error(f"Failed to snapshot {original_address}: {str(e)}", exc_info=True)
+                skipped[original_address] = f"snapshot failed: {str(e)}"
+                continue
+            if not self.override_requirements and (
+                has_too_many_nfts(snapshot.collection_data) or has_too_many_owners(snapshot.collection_data)
+            ):
+                skipped[original_address] = "too many NFTs or owners"
+                continue
+            try:
+                uris = self.nft_bridge.snapshot_uris(snapshot)
+                snapshot = self.nft_bridge.with_uri_pattern(snapshot, uris)
+            except Exception as e:
+                logger.error(f"Failed to read token URIs of {original_address}: {str(e)}", exc_info=True)
+                skipped[original_address] = f"reading token URIs failed: {str(e)}"
+                continue
+
+            job_id = store.create_job("bridge", original_address, snapshot.original_owner)
+            collections.append(BulkCollection(snapshot=snapshot, job_id=job_id, uris=uris))
+
+        collections.sort(key=lambda collection: collection.num_tokens)
+        return collections, skipped
+
+    def _on_broadcast(self, item: PendingTx):
+        job_id, stage, chunk_index = item.tag
+        if stage == "deploy":
+            self.nft_bridge.job_store.update_job(job_id, deployment_tx=item.txn_hashes[-1])
+        else:
+            self.nft_bridge.job_store.record_chunk(job_id, stage, chunk_index, "submitted",
+                                                   item.txn_hashes, item.nonce)
+
+    def _fail(self, collection: BulkCollection, error: str):
+        logger.error(f"Bulk bridge of {collection.original_address} failed: {error}")
+        collection.error = error
+        self.nft_bridge.job_store.update_job(collection.job_id, status="failed", error=error)
+
+    def _start(self, collection: BulkCollection, pipeline: TxPipeline, bridge_control):
+        logger.info(f"Starting {collection.original_address} ({collection.num_tokens} tokens)")
+        collection.stage = "deploy"
+        self.nft_bridge.job_store.set_stage(collection.job_id, "deploy")
+        method_name, args = self.nft_bridge.deploy_call(collection.snapshot)
+        collection.deploy_tx = pipeline.submit(getattr(bridge_control, method_name), *args,
+                                               tag=(collection.job_id, "deploy", 0))
+
+    def _plan(self, collection: BulkCollection, pipeline: TxPipeline):
+        """Queue the airdrop and URI calls once the collection's deploy tx is confirmed."""
+        receipt = pipeline.confirm(collection.deploy_tx)
+        original_address = collection.original_address
+        self.nft_bridge.collection_changed(original_address)
+        record_receipts(original_address, "deploy", [receipt])
+        if receipt.failed:
+            raise RuntimeError(f"Deploy tx {receipt.txn_hash} reverted")
+        bridged_address = self.nft_bridge.get_bridged_address(original_address)
+        if not bridged_address:
+            raise RuntimeError("Failed to deploy contract to target chain")
+
+        collection.bridged_address = bridged_address
+        store = self.nft_bridge.job_store
+        store.update_job(collection.job_id, bridged_address=bridged_address)
+
+        stages = []
+        airdrop_units = collection.snapshot.airdrop_units
+        if airdrop_units:
+            stages.append(("airdrop", self.nft_bridge.airdrop_calls(bridged_address, airdrop_units)[0]))
+        stages.append(("uris", self.nft_bridge.snapshot_uri_calls(collection.snapshot, bridged_address,
+                                                                   collection.uris)))
+        for stage, calls in stages:
+            chunks = store.plan_chunks(collection.job_id, stage, [{"method": m, "args": a} for m, a in calls])
+            collection.calls.extend(
+                (stage, chunk["chunk_index"], chunk["payload"]["method"], chunk["payload"]["args"])
+                for chunk in chunks
+            )
+        logger.info(f"Queued {len(collection.calls)} txs for {original_address} -> {bridged_address}")
+
+    def _finish(self, collection: BulkCollection, pipeline: TxPipeline):
+        store = self.nft_bridge.job_store
+        for item in collection.sent:
+            receipt = pipeline.confirm(item)
+            _, stage, chunk_index = item.tag
+            if receipt.failed:
+                store.record_chunk(collection.job_id, stage, chunk_index, "failed")
+                self._fail(collection, f"{stage} tx {receipt.txn_hash} reverted")
+                return
+            store.record_chunk(collection.job_id, stage, chunk_index, "confirmed")
+            record_receipts(collection.original_address, stage, [receipt])
+        store.set_stage(collection.job_id, "done", status="done")
+        logger.info(f"Bulk bridged {collection.original_address} -> {collection.bridged_address}")
+
+    @target_chain_context
+    def run_collections(self, collections: List[BulkCollection]):
+        """Schedule the stages of prepared collections until all are done or failed."""
+        bridge_control = contract_at("SCCNFTBridge", self.nft_bridge.bridge_control_address)
+        pipeline = TxPipeline(self.nft_bridge.deployer, depth=self.nft_bridge.pipeline_depth,
+                              on_broadcast=self._on_broadcast, session=self.nft_bridge.target_session)
+        waiting = deque(collections)
+        active: List[BulkCollection] = []
+        last_poll = 0.0
+
+        while waiting or active:
+            while waiting and len(active) < self.max_in_flight:
+                collection = waiting.popleft()
+                try:
+                    self._start(collection, pipeline, bridge_control)
+                    active.append(collection)
+                except Exception as e:
+                    self._fail(collection, str(e))
+
+            sent_this_turn = False
+            for collection in list(active):
+                try:
+                    if collection.bridged_address is None:
+                        if not pipeline.is_confirmed(collection.deploy_tx):
+                            continue
+                        self._plan(collection, pipeline)
+
+                    if collection.calls:
+                        stage, chunk_index, method_name, args = collection.calls.popleft()
+                        if collection.stage != stage:
+                            collection.stage = stage
+                            self.nft_bridge.job_store.set_stage(collection.job_id, stage)
+                        collection.sent.append(pipeline.submit(getattr(bridge_control, method_name), *args,
+                                                               tag=(collection.job_id, stage, chunk_index)))
+                        sent_this_turn = True
+                    elif pipeline.is_confirmed(*collection.sent):
+                        self._finish(collection, pipeline)
+                        active.remove(collection)
+                except Exception as e:
+                    self._fail(collection, str(e))
+                    active.remove(collection)
+
+            if not sent_this_turn:
+                pipeline.idle()
+            # Mined deploys unblock their collection's airdrop, so check on them between sends too
+            if time.time() - last_poll >= pipeline.poll_interval:
+                pipeline.poll()
+                last_poll = time.time()
+
+    def run(self, addresses: List[str]) -> Dict[str, Dict]:
+        """Bridge every collection in ``addresses``. Returns a result per original address."""
+        collections, skipped = self.prepare(addresses)
+        logger.info(f"Bulk bridging {len(collections)} collections, skipping {len(skipped)}")
+        self.run_collections(collections)
+
+        results = {address: {"status": "skipped", "reason": reason} for address, reason in skipped.items()}
+        for collection in collections:
+            results[collection.original_address] = {
+                "status": "failed" if collection.error else "done",
+                "job_id": collection.job_id,
+                "bridged_address": collection.bridged_address,
+                "num_tokens": collection.num_tokens,
+                "error": collection.error,
+            }
+        return results
+
+
+def main():
+    from .config import env_vars
+
+    logging.basicConfig(
+        format='%(asctime)s - %(name)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s',
+        level=logging.INFO
+    )
+    parser = argparse.ArgumentParser(description="Bridge many collections through one deployer pipeline.")
+    parser.add_argument("addresses", nargs="*", help="Collection addresses to bridge")
+    parser.add_argument("-f", "--file", help="File with one collection address per line")
+    parser.add_argument("--in-flight", type=int, default=BULK_MAX_IN_FLIGHT,
+                        help="Collections to work on at the same time")
+    parser.add_argument("--override", action="store_true", help="Skip the NFT and owner count checks")
+    args = parser.parse_args()
+
+    addresses = list(args.addresses)
+    if args.file:
+        with open(args.file) as f:
+            addresses += [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    if not addresses:
+        parser.error("No collection addresses given")
+
+    nft_bridge = NFTBridge(
+        env_vars.DEPLOYER_NAME,
+        env_vars.DEPLOYER_PASSWORD,
+        env_vars.SOURCE_ENDPOINT_ADDRESS,
+        env_vars.TARGET_ENDPOINT_ADDRESS,
+        int(env_vars.EXPECTED_EID),
+        env_vars.FACTORY_ADDRESS,
+        env_vars.BRIDGE_CONTROL_ADDRESS,
+        env_vars.AUTHORIZER_ADDRESS,
+        env_vars.FLASK_ENV,
+        skip_authorizer=True,
+        persistent_sessions=True,
+        holder_source=env_vars.HOLDER_SOURCE or "api"
+    )
+    results = BulkBridge(nft_bridge, args.in_flight, args.override).run(addresses)
+    for address, result in results.items():
+        print(f"{address}: {result}")
+
+
+if __name__ == "__main__":
+    main()
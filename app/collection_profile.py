@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+
+from dataclasses import dataclass
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from .db import connect
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS collection_profiles (
+    address TEXT PRIMARY KEY COLLATE NOCASE,
+    name TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    is_erc1155 INTEGER NOT NULL,
+    is_enumerable INTEGER NOT NULL,
+    probed_at REAL NOT NULL
+);
+"""
+
+
+@dataclass(frozen=True)
+class CollectionProfile:
+    """Everything the bridge reads from a source collection before deploying it."""
+    address: str
+    name: str
+    symbol: str
+    base_uri: str
+    extension: str
+    owner: str
+    royalty_recipient: str
+    royalty_fee: int
+    is_erc1155: bool
+    is_enumerable: bool
+
+    @property
+    def royalty_data(self) -> Dict[str, Any]:
+        return {"recipient": self.royalty_recipient, "fee": self.royalty_fee}
+
+
+class ProfileStore:
+    """Persistent cache of the parts of a CollectionProfile that do not change.
+
+    Interface support, name and symbol are fixed once a collection is
+    deployed; owner, royalties and token URIs are always read fresh.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self._conn = connect(path)
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def get(self, address: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM collection_profiles WHERE address = ?", (address,)).fetchone()
+        if row is None:
+            return None
+        return {**dict(row), "is_erc1155": bool(row["is_erc1155"]), "is_enumerable": bool(row["is_enumerable"])}
+
+    def put(self, profile: CollectionProfile):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO collection_profiles (address, name, symbol, is_erc1155, is_enumerable, probed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (profile.address, profile.name, profile.symbol, int(profile.is_erc1155), int(profile.is_enumerable),
+                 time.time()),
+            )
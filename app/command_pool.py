@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from contextvars import copy_context
+from functools import partial
+import logging
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .constants import TG_COMMAND_WORKERS
+
+logger = logging.getLogger(__name__)
+
+
+class CommandPool:
+    """Run the blocking NFTBridge work of async chat commands off the event loop.
+
+    Blocking calls go to a bounded thread pool through ``run``. Commands that
+    work on collections hold a slot from ``acquire`` while they run: at most
+    ``workers`` of them run at once, the rest wait in arrival order, and a
+    lock per collection keeps two commands from working on the same
+    collection at the same time.
+    """
+
+    def __init__(self, workers: int = TG_COMMAND_WORKERS):
+        self.workers = max(1, workers)
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="tg-command")
+        # Created on first use, so it belongs to the bot's event loop
+        self._slots: Optional[asyncio.Semaphore] = None
+        # collection -> (lock, commands holding or waiting for it)
+        self._locks: Dict[str, Tuple[asyncio.Lock, int]] = {}
+        self._waiting: List[object] = []
+        self._running = 0
+
+    async def run(self, func: Callable, *args, **kwargs):
+        """Call ``func`` on the worker pool and wait for its result without blocking the event loop.
+
+        It runs in a copy of the caller's context, so an active RPC profile sees its requests.
+        """
+        return await asyncio.get_running_loop().run_in_executor(
+            self._pool, copy_context().run, partial(func, *args, **kwargs)
+        )
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiting)
+
+    @property
+    def running(self) -> int:
+        return self._running
+
+    @asynccontextmanager
+    async def acquire(self, addresses: Iterable[str], notify: Optional[Callable[[str], Awaitable]] = None):
+        """Wait for the collections' locks and a free slot.
+
+        If the command has to wait, ``notify`` is awaited once with a message
+        giving its position in the queue.
+        """
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.workers)
+        # One consistent order, so commands locking several collections cannot deadlock
+        keys = sorted({address.lower() for address in addresses})
+        for key in keys:
+            lock, users = self._locks.get(key) or (asyncio.Lock(), 0)
+            self._locks[key] = (lock, users + 1)
+        locks = [self._locks[key][0] for key in keys]
+        ticket = object()
+        self._waiting.append(ticket)
+        acquired = []
+        try:
+            busy = [key for key, lock in zip(keys, locks) if lock.locked()]
+            if notify is not None and (busy or self._slots.locked()):
+                position = self._waiting.index(ticket) + 1
+                msg = f"Queued at position {position}, {self._running} command(s) running."
+                if busy:
+                    msg += f"\nWaiting for another command to finish with {', '.join(busy)}."
+                await notify(msg)
+
+            for lock in locks:
+                await lock.acquire()
+                acquired.append(lock)
+            async with self._slots:
+                self._waiting.remove(ticket)
+                self._running += 1
+                try:
+                    yield
+                finally:
+                    self._running -= 1
+        finally:
+            for lock in acquired:
+                lock.release()
+            if ticket in self._waiting:
+                self._waiting.remove(ticket)
+            for key in keys:
+                lock, users = self._locks[key]
+                if users == 1:
+                    del self._locks[key]
+                else:
+                    self._locks[key] = (lock, users - 1)
+
+    def shutdown(self, wait: bool = True):
+        self._pool.shutdown(wait=wait)
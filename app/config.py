@@ -53,8 +53,9 @@ class EnvVars:
 
         # optional
         self.TG_BOT_TOKEN = os.environ.get('TG_BOT_TOKEN')
-        self.SOURCE_ENDPOINT_ADDRESS = endpoints[self.FLASK_ENV]["source"]
-        self.TARGET_ENDPOINT_ADDRESS = endpoints[self.FLASK_ENV]["target"]
+        # the endpoint env vars override the known deployments, e.g. with a MockEndpoint on a local chain
+        self.SOURCE_ENDPOINT_ADDRESS = os.environ.get('SOURCE_ENDPOINT_ADDRESS') or endpoints.get(self.FLASK_ENV, {}).get("source")
+        self.TARGET_ENDPOINT_ADDRESS = os.environ.get('TARGET_ENDPOINT_ADDRESS') or endpoints.get(self.FLASK_ENV, {}).get("target")
         self.FACTORY_ADDRESS = os.environ.get('FACTORY_ADDRESS')
         self.BRIDGE_CONTROL_ADDRESS = os.environ.get('BRIDGE_ADDRESS')
         self.AUTHORIZER_ADDRESS = os.environ.get('AUTHORIZER_ADDRESS')
@@ -4,3 +4,72 @@ ROYALTY_REGISTRY_ADDRESS = "0x809D88B727c4C7024462d7955777835938F02F3B"
 ZERO_ADDR = "0x0000000000000000000000000000000000000000"
 DATA_PREFIX: str = "data:application/json;base64,"
 ERC1155_INTERFACE_ID = "0xd9b67a26"
+
+PAINTSWAP_API_URL = "https://api.paintswap.finance"
+HOLDERS_PAGE_SIZE = 1000
+HOLDERS_FETCH_CONCURRENCY = 4
+# Sustained PaintSwap requests per second, with bursts of up to PAINTSWAP_BURST
+PAINTSWAP_RATE_LIMIT = 5
+PAINTSWAP_BURST = 10
+PAINTSWAP_MAX_RETRIES = 5
+# Seconds a PaintSwap response is served from memory before it is revalidated
+PAINTSWAP_CACHE_TTL = 300
+PAINTSWAP_CACHE_MAX_ENTRIES = 2_048
+
+TX_PIPELINE_DEPTH = 8
+TX_STUCK_TIMEOUT = 60
+TX_GAS_BUMP = 1.125
+# Seconds a tx's nonce must stay consumed without a receipt for any of its hashes before it is resent
+TX_REPLACED_TIMEOUT = 30
+
+AIRDROP_GAS_FRACTION = 0.5
+URI_GAS_CEILING = 10_000_000
+
+# Bridge jobs all send from the one deployer account, so they run one at a time by default
+BRIDGE_JOB_WORKERS = 1
+# Telegram commands doing bridge work at the same time, one by default for the same reason
+TG_COMMAND_WORKERS = 1
+# Seconds without progress after which a running job is taken to be abandoned and can be claimed again
+JOB_CLAIM_STALE_AFTER = 1800
+
+# Seconds a "not bridged"/"not approved" answer is trusted before asking the chain again
+ADDRESS_CACHE_NEGATIVE_TTL = 30
+# Seconds a bridged address or an approval is trusted, since it can be cleared from elsewhere
+ADDRESS_CACHE_POSITIVE_TTL = 600
+
+INDEXER_BLOCK_RANGE = 5_000
+INDEXER_POLL_INTERVAL = 10
+
+MULTICALL_WINDOW = 200
+MULTICALL_MIN_WINDOW = 10
+MULTICALL_MAX_WINDOW = 1_000
+MULTICALL_CONCURRENCY = 4
+# Consecutive missing token ids after which a URI scan with no known bound stops
+URI_GAP_TOLERANCE = 200
+
+# Token ids fetched and stored per URI cache checkpoint
+URI_CHECKPOINT_SIZE = 1_000
+# Seconds a cached source-chain token URI is reused before being read again
+URI_CACHE_MAX_AGE = 7 * 24 * 60 * 60
+# Seconds an id found missing is trusted, since the source can mint it at any time
+URI_CACHE_MISSING_MAX_AGE = 300
+
+RPC_POOL_SIZE = 8
+# Headroom added on top of eth_estimateGas for transactions built outside ape
+TX_GAS_LIMIT_MULTIPLIER = 1.2
+
+# Collections a bulk run deploys, airdrops and sets URIs for at the same time
+BULK_MAX_IN_FLIGHT = 3
+
+# (holder, id) pairs read per balanceOfBatch call when snapshotting bridged ERC1155 ownership
+BALANCE_BATCH_SIZE = 200
+
+# Blocks per parallel eth_getLogs shard when building holder snapshots from transfer logs;
+# shards the RPC refuses are split further on their own
+HOLDER_LOG_SHARD_BLOCKS = 1_000_000
+HOLDER_LOG_CONCURRENCY = 8
+# Attempts at a log query that fails for reasons other than its size, with backoff in between
+HOLDER_LOG_MAX_RETRIES = 4
+
+# Port the Telegram bot serves /metrics on (the Flask app serves it on its own port)
+METRICS_PORT = 9101
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+
+import logging
+import threading
+from typing import Any, Dict, Tuple
+
+from ape import networks, project
+
+logger = logging.getLogger(__name__)
+
+_handles: Dict[Tuple[str, str, str], Any] = {}
+_lock = threading.Lock()
+
+
+def _chain_key() -> str:
+    network = networks.provider.network
+    return f"{network.ecosystem.name}:{network.name}"
+
+
+def contract_at(contract_type: str, address: str):
+    """Handle for ``project.<contract_type>`` at ``address`` on the active chain.
+
+    Handles are built once per (chain, contract type, address) and reused,
+    so repeated calls skip rebuilding the instance and re-checking its code.
+    """
+    key = (_chain_key(), contract_type, address.lower())
+    handle = _handles.get(key)
+    if handle is None:
+        handle = getattr(project, contract_type).at(address)
+        with _lock:
+            _handles[key] = handle
+    return handle
+
+
+def warm_up(contracts: Dict[str, str]):
+    """Build handles for {contract_type: address} on the active chain ahead of use."""
+    for contract_type, address in contracts.items():
+        if address:
+            contract_at(contract_type, address)
+            logger.info(f"Loaded {contract_type} handle at {address} on {_chain_key()}")
+
+
+def clear():
+    with _lock:
+        _handles.clear()
@@ -0,0 +1,15 @@
+#!/usr/bin/env python3
+
+import os
+import sqlite3
+from typing import Optional
+
+DB_PATH = os.getenv("PAINTBRIDGE_DB", "paintbridge.db")
+
+
+def connect(path: Optional[str] = None) -> sqlite3.Connection:
+    """Open the local state database shared by the bridge's persistent stores."""
+    conn = sqlite3.connect(path or DB_PATH, check_same_thread=False, isolation_level=None, timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    return conn
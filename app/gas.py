@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+
+from dataclasses import dataclass, replace
+import logging
+from typing import List, Sequence
+
+from ape import networks
+
+from .constants import AIRDROP_GAS_FRACTION
+
+SSTORE_NEW_SLOT_GAS = 22_100
+URI_WRITE_OVERHEAD_GAS = 1_000
+URI_BATCH_BASE_GAS = 60_000
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class AirdropGasModel:
+    """Linear gas estimate for an airdrop721/airdrop1155 call."""
+    base_gas: int
+    per_unit_gas: int
+    per_token_gas: int
+
+    def estimate(self, units: Sequence) -> int:
+        num_tokens = sum(len(unit.token_ids) for unit in units)
+        return self.base_gas + self.per_unit_gas * len(units) + self.per_token_gas * num_tokens
+
+    def scaled(self, ratio: float) -> "AirdropGasModel":
+        return replace(
+            self,
+            base_gas=int(self.base_gas * ratio),
+            per_unit_gas=int(self.per_unit_gas * ratio),
+            per_token_gas=int(self.per_token_gas * ratio),
+        )
+
+
+# Conservative defaults used until a model is calibrated against the chain
+DEFAULT_AIRDROP_GAS_MODELS = {
+    True: AirdropGasModel(base_gas=60_000, per_unit_gas=8_000, per_token_gas=55_000),
+    False: AirdropGasModel(base_gas=60_000, per_unit_gas=15_000, per_token_gas=30_000),
+}
+
+
+def _split_unit(unit, start: int, stop: int):
+    return replace(
+        unit,
+        token_ids=unit.token_ids[start:stop],
+        amounts=unit.amounts[start:stop],
+    )
+
+
+def calibrate_airdrop_gas(method, collection: str, units: Sequence, sender) -> AirdropGasModel:
+    """Fit an AirdropGasModel from three eth_estimateGas calls on real holder data.
+
+    Estimates one token to one holder, k tokens to one holder and the same
+    k tokens split over two holders, which pins down the per-token,
+    per-holder and fixed costs. Falls back to the defaults on any failure.
+    """
+    is721 = units[0].is721
+    default = DEFAULT_AIRDROP_GAS_MODELS[is721]
+    token_ids = [token_id for unit in units for token_id in unit.token_ids]
+    amounts = [amount for unit in units for amount in unit.amounts]
+    k = min(len(token_ids), 10)
+    if k < 2:
+        return default
+
+    first = replace(units[0], token_ids=token_ids[:k], amounts=amounts[:k])
+    half = k // 2
+
+    def estimate(batch) -> int:
+        return method.estimate_gas_cost(collection, [unit.to_args() for unit in batch], sender=sender)
+
+    try:
+        one = estimate([_split_unit(first, 0, 1)])
+        many = estimate([first])
+        two_holders = estimate([_split_unit(first, 0, half), replace(_split_unit(first, half, k), address=sender.address)])
+    except Exception as e:
+        logger.warning(f"Gas calibration failed, using defaults: {str(e)}")
+        return default
+
+    per_token_gas = max(1, (many - one) // (k - 1))
+    per_unit_gas = max(0, two_holders - many)
+    base_gas = max(0, one - per_token_gas - per_unit_gas)
+    model = AirdropGasModel(base_gas=base_gas, per_unit_gas=per_unit_gas, per_token_gas=per_token_gas)
+    logger.info(f"Calibrated {'ERC721' if is721 else 'ERC1155'} airdrop gas model: {model}")
+    return model
+
+
+@dataclass(frozen=True)
+class BurnGasModel:
+    """Linear gas estimate for a burn721 call."""
+    base_gas: int
+    per_token_gas: int
+
+    def estimate(self, num_tokens: int) -> int:
+        return self.base_gas + self.per_token_gas * num_tokens
+
+
+DEFAULT_BURN_GAS_MODEL = BurnGasModel(base_gas=50_000, per_token_gas=20_000)
+
+
+def calibrate_burn_gas(method, collection: str, token_ids: Sequence[int], sender) -> BurnGasModel:
+    """Fit a BurnGasModel from burning one and k existing tokens. Falls back to the default on any failure."""
+    k = min(len(token_ids), 10)
+    if k < 2:
+        return DEFAULT_BURN_GAS_MODEL
+
+    try:
+        one = method.estimate_gas_cost(collection, list(token_ids[:1]), sender=sender)
+        many = method.estimate_gas_cost(collection, list(token_ids[:k]), sender=sender)
+    except Exception as e:
+        logger.warning(f"Burn gas calibration failed, using defaults: {str(e)}")
+        return DEFAULT_BURN_GAS_MODEL
+
+    per_token_gas = max(1, (many - one) // (k - 1))
+    model = BurnGasModel(base_gas=max(0, one - per_token_gas), per_token_gas=per_token_gas)
+    logger.info(f"Calibrated burn gas model: {model}")
+    return model
+
+
+def plan_burn_batches(token_ids: Sequence[int], model: BurnGasModel, gas_budget: int) -> List[List[int]]:
+    """Split token ids into burn721 calls that each fit within ``gas_budget``."""
+    per_batch = max(1, (gas_budget - model.base_gas) // model.per_token_gas)
+    return [list(token_ids[i:i + per_batch]) for i in range(0, len(token_ids), per_batch)]
+
+
+def block_gas_budget(fraction: float = AIRDROP_GAS_FRACTION) -> int:
+    """Gas budget for a single transaction as a fraction of the latest block gas limit."""
+    gas_limit = networks.provider.get_block("latest").gas_limit
+    return int(gas_limit * fraction)
+
+
+def plan_airdrop_batches(units: Sequence, model: AirdropGasModel, gas_budget: int) -> List[List]:
+    """Pack airdrop units into batches that each fit within ``gas_budget``.
+
+    Holders are kept whole where possible; a holder that does not fit even in
+    an empty batch is split across batches, filling each one up.
+    """
+    batches: List[List] = []
+    current: List = []
+
+    for unit in units:
+        if model.estimate(current + [unit]) <= gas_budget:
+            current.append(unit)
+            continue
+
+        if model.estimate([unit]) <= gas_budget:
+            batches.append(current)
+            current = [unit]
+            continue
+
+        # Oversized holder: spread its tokens over as many batches as needed
+        start = 0
+        while start < len(unit.token_ids):
+            room = gas_budget - model.estimate(current) - model.per_unit_gas
+            take = max(0, room // model.per_token_gas)
+            if take == 0:
+                if current:
+                    batches.append(current)
+                    current = []
+                    continue
+                # Budget too small for even one token, still make progress
+                take = 1
+            current.append(_split_unit(unit, start, start + take))
+            start += take
+
+    if current:
+        batches.append(current)
+    return [batch for batch in batches if batch]
+
+
+def estimate_uri_write_gas(uri: str) -> int:
+    """Gas to pass one URI in calldata and store it in a fresh string slot."""
+    data = uri.encode()
+    # Offset and length words in the string[] encoding, then the padded payload
+    calldata_gas = 2 * 32 * 4 + sum(16 if byte else 4 for byte in data) + (-len(data) % 32) * 4
+    # Short strings live in one slot, long ones use a length slot plus data slots
+    slots = 1 if len(data) < 32 else 1 + (len(data) + 31) // 32
+    return calldata_gas + slots * SSTORE_NEW_SLOT_GAS + URI_WRITE_OVERHEAD_GAS
+
+
+def plan_uri_batches(uris: Sequence[str], gas_ceiling: int) -> List[List[str]]:
+    """Split a contiguous run of URIs into batchSetTokenURIs calls under ``gas_ceiling``."""
+    batches: List[List[str]] = []
+    current: List[str] = []
+    current_gas = URI_BATCH_BASE_GAS
+
+    for uri in uris:
+        uri_gas = estimate_uri_write_gas(uri)
+        if current and current_gas + uri_gas > gas_ceiling:
+            batches.append(current)
+            current = []
+            current_gas = URI_BATCH_BASE_GAS
+        current.append(uri)
+        current_gas += uri_gas
+
+    if current:
+        batches.append(current)
+    return batches
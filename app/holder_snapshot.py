@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from dataclasses import dataclass, field
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+from eth_abi import decode
+from eth_utils import keccak, to_checksum_address, to_hex
+
+from .constants import ZERO_ADDR, HOLDER_LOG_SHARD_BLOCKS, HOLDER_LOG_CONCURRENCY, HOLDER_LOG_MAX_RETRIES
+
+logger = logging.getLogger(__name__)
+
+TRANSFER_TOPIC = to_hex(keccak(text="Transfer(address,address,uint256)"))
+TRANSFER_SINGLE_TOPIC = to_hex(keccak(text="TransferSingle(address,address,address,uint256,uint256)"))
+TRANSFER_BATCH_TOPIC = to_hex(keccak(text="TransferBatch(address,address,address,uint256[],uint256[])"))
+
+# Fragments of the errors RPCs give for a log query whose block range or result set is too large
+LOG_RANGE_ERRORS = (
+    "block range", "range too large", "range is too large", "exceed maximum block range", "limited to",
+    "more than", "too many", "result limit", "response size", "query returned", "limit exceeded",
+)
+
+
+@dataclass
+class HolderSnapshot:
+    """Ownership of a collection at ``block_number``, folded from its transfer logs."""
+    is721: Optional[bool]
+    block_number: int
+    # ERC721 token id -> owner
+    owners: Dict[int, str] = field(default_factory=dict)
+    # ERC1155 (holder, id) -> balance
+    balances: Dict[Tuple[str, int], int] = field(default_factory=dict)
+    num_logs: int = 0
+
+    def holdings(self) -> Dict[str, List[Tuple[int, int]]]:
+        """Holder -> [(token id, amount)] in token id order."""
+        holdings: Dict[str, List[Tuple[int, int]]] = {}
+        if self.is721:
+            for token_id, owner in sorted(self.owners.items()):
+                holdings.setdefault(owner, []).append((token_id, 1))
+        else:
+            for (holder, token_id), amount in sorted(self.balances.items(), key=lambda item: item[0][1]):
+                holdings.setdefault(holder, []).append((token_id, amount))
+        return holdings
+
+
+def _topic_address(topic) -> str:
+    return to_checksum_address(bytes(topic)[-20:])
+
+
+class LogHolderScanner:
+    """Build holder snapshots from a collection's Transfer/TransferSingle/TransferBatch logs.
+
+    The block range is cut into shards fetched in parallel over a pooled
+    web3 client. A shard the RPC refuses as too large (too many results,
+    range too wide) is split in half and retried until it goes through, so
+    no per-provider log limit has to be configured. Other errors are
+    retried with backoff, then raised.
+    """
+
+    def __init__(self, web3, shard_blocks: int = HOLDER_LOG_SHARD_BLOCKS,
+                 concurrency: int = HOLDER_LOG_CONCURRENCY):
+        self.web3 = web3
+        self.shard_blocks = max(1, shard_blocks)
+        self.concurrency = max(1, concurrency)
+
+    def find_deploy_block(self, address: str, block_number: int) -> int:
+        """First block with code at ``address``, by binary search. 0 if the node cannot tell."""
+        low, high = 0, block_number
+        try:
+            if not self.web3.eth.get_code(address, block_number):
+                return block_number
+            while low < high:
+                mid = (low + high) // 2
+                if self.web3.eth.get_code(address, mid):
+                    high = mid
+                else:
+                    low = mid + 1
+        except Exception as e:
+            logger.warning(f"Could not find the deploy block of {address}, scanning from genesis: {str(e)}")
+            return 0
+        return low
+
+    def _get_logs(self, address: str, from_block: int, to_block: int) -> List:
+        for attempt in range(HOLDER_LOG_MAX_RETRIES):
+            try:
+                return self.web3.eth.get_logs({
+                    "address": address,
+                    "fromBlock": from_block,
+                    "toBlock": to_block,
+                    "topics": [[TRANSFER_TOPIC, TRANSFER_SINGLE_TOPIC, TRANSFER_BATCH_TOPIC]],
+                })
+            except Exception as e:
+                too_large = any(error in str(e).lower() for error in LOG_RANGE_ERRORS)
+                if too_large and from_block < to_block:
+                    mid = (from_block + to_block) // 2
+                    logger.debug(f"Log query {from_block}-{to_block} too large, splitting it: {str(e)}")
+                    return self._get_logs(address, from_block, mid) + self._get_logs(address, mid + 1, to_block)
+                if too_large or attempt == HOLDER_LOG_MAX_RETRIES - 1:
+                    raise
+                delay = 0.5 * 2 ** attempt
+                logger.warning(f"Log query {from_block}-{to_block} failed ({str(e)}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+        raise AssertionError("unreachable")
+
+    def fetch_logs(self, address: str, from_block: int, to_block: int) -> List:
+        """Every transfer log of ``address`` in the inclusive block range, in chain order."""
+        shards = [
+            (start, min(to_block, start + self.shard_blocks - 1))
+            for start in range(from_block, to_block + 1, self.shard_blocks)
+        ]
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, max(1, len(shards))),
+                                thread_name_prefix="holder-logs") as pool:
+            futures = [pool.submit(copy_context().run, self._get_logs, address, *shard) for shard in shards]
+            logs = [log for future in futures for log in future.result()]
+        return sorted(logs, key=lambda log: (log["blockNumber"], log["logIndex"]))
+
+    @staticmethod
+    def fold(logs: List, block_number: int) -> HolderSnapshot:
+        """Replay transfer logs in chain order into an ownership table."""
+        snapshot = HolderSnapshot(is721=None, block_number=block_number, num_logs=len(logs))
+        for log in logs:
+            topics = log["topics"]
+            topic = to_hex(topics[0])
+            if topic == TRANSFER_TOPIC:
+                # ERC20 Transfers share the signature but do not index the value
+                if len(topics) != 4:
+                    continue
+                snapshot.is721 = True
+                to, token_id = _topic_address(topics[2]), int.from_bytes(bytes(topics[3]), "big")
+                if to == ZERO_ADDR:
+                    snapshot.owners.pop(token_id, None)
+                else:
+                    snapshot.owners[token_id] = to
+                continue
+
+            snapshot.is721 = False
+            sender, to = _topic_address(topics[2]), _topic_address(topics[3])
+            if topic == TRANSFER_SINGLE_TOPIC:
+                token_ids, amounts = decode(["uint256", "uint256"], bytes(log["data"]))
+                token_ids, amounts = [token_ids], [amounts]
+            else:
+                token_ids, amounts = decode(["uint256[]", "uint256[]"], bytes(log["data"]))
+
+            for token_id, amount in zip(token_ids, amounts):
+                for holder, delta in ((sender, -amount), (to, amount)):
+                    if holder == ZERO_ADDR:
+                        continue
+                    key = (holder, token_id)
+                    balance = snapshot.balances.get(key, 0) + delta
+                    if balance > 0:
+                        snapshot.balances[key] = balance
+                    else:
+                        snapshot.balances.pop(key, None)
+        return snapshot
+
+    def snapshot(self, address: str, block_number: Optional[int] = None,
+                 start_block: Optional[int] = None) -> HolderSnapshot:
+        """Ownership of ``address`` as of ``block_number`` (default: latest block)."""
+        if block_number is None:
+            block_number = self.web3.eth.block_number
+        if start_block is None:
+            start_block = self.find_deploy_block(address, block_number)
+
+        logs = self.fetch_logs(address, start_block, block_number)
+        snapshot = self.fold(logs, block_number)
+        logger.info(
+            f"Folded {len(logs)} transfer logs of {address} from blocks {start_block}-{block_number}: "
+            f"{len(snapshot.holdings())} holders"
+        )
+        return snapshot
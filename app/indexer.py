@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+
+import logging
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from ape import networks
+from ape_ethereum import multicall
+from eth_utils import keccak, to_checksum_address, to_hex
+
+from .constants import ZERO_ADDR, INDEXER_BLOCK_RANGE, INDEXER_POLL_INTERVAL
+from .contracts import contract_at
+from .db import connect
+from .utils import chunk, target_chain_context
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS bridge_collections (
+    original_address TEXT PRIMARY KEY COLLATE NOCASE,
+    bridged_address TEXT COLLATE NOCASE,
+    original_owner TEXT,
+    block_number_bridged INTEGER,
+    approved INTEGER NOT NULL DEFAULT 0,
+    updated_block INTEGER NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS bridge_collections_bridged ON bridge_collections (bridged_address);
+CREATE TABLE IF NOT EXISTS indexer_cursors (
+    contract TEXT PRIMARY KEY COLLATE NOCASE,
+    block INTEGER NOT NULL
+);
+"""
+
+# Every bridged collection grants the bridge mint rights in the deploy transaction
+MINT_RIGHTS_GRANTED_TOPIC = to_hex(keccak(text="MintRightsGranted(address)"))
+
+
+class BridgeIndexer:
+    """Local SQLite mirror of SCCNFTBridge's collection mappings.
+
+    ``sync`` tails the approval events and the MintRightsGranted events that
+    bridged collections emit when they are deployed, re-reads the mappings of
+    every collection they touch and advances a stored block cursor. Reads
+    only touch SQLite, so they are safe from any thread or process; the
+    tailing itself should run in one place, e.g. ``bridge-indexer``.
+    """
+
+    def __init__(self, bridge_control_address: str, path: Optional[str] = None, start_block: int = 0,
+                 block_range: int = INDEXER_BLOCK_RANGE):
+        self.bridge_control_address = bridge_control_address
+        self.start_block = start_block
+        self.block_range = block_range
+        self._conn = connect(path)
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def _query(self, sql: str, params: tuple = ()) -> List:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    @property
+    def cursor(self) -> int:
+        """Last block whose events are reflected in the mirror."""
+        rows = self._query("SELECT block FROM indexer_cursors WHERE contract = ?", (self.bridge_control_address,))
+        return rows[0]["block"] if rows else self.start_block - 1
+
+    def get(self, original_address: str) -> Optional[Dict[str, Any]]:
+        rows = self._query("SELECT * FROM bridge_collections WHERE original_address = ?", (original_address,))
+        return dict(rows[0]) if rows else None
+
+    def find_by_bridged(self, bridged_address: str) -> Optional[Dict[str, Any]]:
+        rows = self._query("SELECT * FROM bridge_collections WHERE bridged_address = ?", (bridged_address,))
+        return dict(rows[0]) if rows else None
+
+    def bridged_collections(self) -> List[Dict[str, Any]]:
+        rows = self._query(
+            "SELECT * FROM bridge_collections WHERE bridged_address IS NOT NULL ORDER BY block_number_bridged"
+        )
+        return [dict(row) for row in rows]
+
+    def _touched_collections(self, bridge_control, from_block: int, to_block: int) -> List[str]:
+        """Original addresses whose mappings may have changed in a block window."""
+        touched = {}
+        for event in (bridge_control.CollectionOwnerBridgingApproved, bridge_control.AdminBridgingApproved):
+            for log in event.range(from_block, to_block + 1):
+                touched[log.collectionAddress.lower()] = log.collectionAddress
+
+        minter_topic = "0x" + "0" * 24 + self.bridge_control_address[2:].lower()
+        mint_logs = networks.provider.web3.eth.get_logs({
+            "fromBlock": from_block,
+            "toBlock": to_block,
+            "topics": [MINT_RIGHTS_GRANTED_TOPIC, minter_topic],
+        })
+        candidates = list({to_checksum_address(log["address"]) for log in mint_logs})
+        for addresses in chunk(candidates, 100):
+            call = multicall.Call()
+            for address in addresses:
+                call.add(bridge_control.originalAddressForBridged, address)
+            for original_address in call():
+                # Anyone can emit MintRightsGranted for the bridge; only registered collections count
+                if original_address is not None and original_address != ZERO_ADDR:
+                    touched[original_address.lower()] = original_address
+        return list(touched.values())
+
+    @target_chain_context
+    def refresh(self, original_addresses: Iterable[str], block_number: Optional[int] = None):
+        """Re-read the bridge mappings for the given collections into the mirror."""
+        bridge_control = contract_at("SCCNFTBridge", self.bridge_control_address)
+        if block_number is None:
+            block_number = networks.provider.get_block("latest").number
+
+        rows = []
+        for addresses in chunk(list(original_addresses), 50):
+            call = multicall.Call()
+            for address in addresses:
+                call.add(bridge_control.bridgedAddressForOriginal, address)
+                call.add(bridge_control.bridgingApproved, address)
+                call.add(bridge_control.blockNumberBridged, address)
+            results = list(call())
+
+            bridged = {}
+            for i, address in enumerate(addresses):
+                bridged_address = results[3 * i]
+                if bridged_address is not None and bridged_address != ZERO_ADDR:
+                    bridged[address] = bridged_address
+            owners = {}
+            if bridged:
+                call = multicall.Call()
+                for bridged_address in bridged.values():
+                    call.add(bridge_control.originalOwnerForCollection, bridged_address)
+                owners = dict(zip(bridged, call()))
+
+            for i, address in enumerate(addresses):
+                rows.append((
+                    address,
+                    bridged.get(address),
+                    owners.get(address),
+                    results[3 * i + 2] if address in bridged else None,
+                    int(bool(results[3 * i + 1])),
+                    block_number,
+                    time.time(),
+                ))
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO bridge_collections (original_address, bridged_address, original_owner, "
+                "block_number_bridged, approved, updated_block, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    @target_chain_context
+    def sync(self) -> int:
+        """Index every block up to the chain head. Returns the new cursor."""
+        bridge_control = contract_at("SCCNFTBridge", self.bridge_control_address)
+        head = networks.provider.get_block("latest").number - networks.provider.network.required_confirmations
+        cursor = self.cursor
+
+        while cursor < head:
+            from_block = cursor + 1
+            to_block = min(head, cursor + self.block_range)
+            touched = self._touched_collections(bridge_control, from_block, to_block)
+            if touched:
+                logger.info(f"Indexing {len(touched)} collections touched in blocks {from_block}-{to_block}")
+                self.refresh(touched, to_block)
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO indexer_cursors (contract, block) VALUES (?, ?)",
+                    (self.bridge_control_address, to_block),
+                )
+            cursor = to_block
+        return cursor
+
+    def run_forever(self, poll_interval: float = INDEXER_POLL_INTERVAL):
+        while True:
+            try:
+                self.sync()
+            except Exception as e:
+                logger.error(f"Indexer sync failed: {str(e)}", exc_info=True)
+            time.sleep(poll_interval)
+
+
+def main():
+    from .config import env_vars
+
+    logging.basicConfig(
+        format='%(asctime)s - %(name)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s',
+        level=logging.INFO
+    )
+    start_block = int(env_vars.BRIDGE_START_BLOCK) if env_vars.BRIDGE_START_BLOCK else 0
+    indexer = BridgeIndexer(env_vars.BRIDGE_CONTROL_ADDRESS, start_block=start_block)
+    logger.info(f"Indexing {env_vars.BRIDGE_CONTROL_ADDRESS} from block {indexer.cursor + 1}")
+    indexer.run_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import threading
+from typing import Callable, Dict, Optional
+
+from .constants import BRIDGE_JOB_WORKERS
+from .job_store import JobAlreadyRunning, JobStore
+from .rpc_profiler import RpcProfile, profile_rpc
+
+logger = logging.getLogger(__name__)
+
+
+class JobQueue:
+    """Run bridge jobs on a dedicated worker pool instead of the request that asked for them.
+
+    Jobs are recorded in the JobStore before they are queued, so their
+    progress can be polled from any process sharing the database.
+    """
+
+    def __init__(self, job_store: JobStore, workers: int = BRIDGE_JOB_WORKERS):
+        self.job_store = job_store
+        self._pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="bridge-job")
+        # Ids of the jobs queued or running on the pool
+        self._active = set()
+        # RPC profiles of the jobs queued with profile=True, by job id
+        self._profiles: Dict[int, RpcProfile] = {}
+        self._lock = threading.Lock()
+
+    def enqueue(self, kind: str, original_address: str, run: Callable[[int], object],
+                original_owner: Optional[str] = None, profile: bool = False) -> int:
+        """Create a job and queue ``run(job_id)`` for it. Returns the job id."""
+        job_id = self.job_store.create_job(kind, original_address, original_owner)
+        self.submit(job_id, run, profile)
+        return job_id
+
+    def is_active(self, job_id: int) -> bool:
+        """Whether the job is queued or running on this queue."""
+        with self._lock:
+            return job_id in self._active
+
+    def profile(self, job_id: int) -> Optional[RpcProfile]:
+        """RPC profile of the job's latest profiled run in this process, if any."""
+        with self._lock:
+            return self._profiles.get(job_id)
+
+    def submit(self, job_id: int, run: Callable[[int], object], profile: bool = False):
+        """Queue ``run(job_id)`` for an existing job, e.g. to retry a failed one.
+
+        With ``profile`` the run's RPC requests are recorded, see ``profile``.
+        Raises if the job is already queued or running.
+        """
+        with self._lock:
+            if job_id in self._active:
+                raise RuntimeError(f"Job {job_id} is already queued or running")
+            self._active.add(job_id)
+        self.job_store.update_job(job_id, status="pending", error=None)
+        logger.info(f"Queued job {job_id}")
+        self._pool.submit(self._run, job_id, run, profile)
+
+    def _run(self, job_id: int, run: Callable[[int], object], profile: bool = False):
+        try:
+            if profile:
+                with profile_rpc(f"job {job_id}") as rpc_profile:
+                    with self._lock:
+                        self._profiles[job_id] = rpc_profile
+                    run(job_id)
+            else:
+                run(job_id)
+        except JobAlreadyRunning as e:
+            # The job's status belongs to whoever holds it
+            logger.warning(str(e))
+        except Exception as e:
+            logger.error(f"Job {job_id} failed: {str(e)}", exc_info=True)
+            self.job_store.update_job(job_id, status="failed", error=str(e))
+        finally:
+            with self._lock:
+                self._active.discard(job_id)
+
+    def shutdown(self, wait: bool = True):
+        self._pool.shutdown(wait=wait)
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+
+import json
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from .constants import JOB_CLAIM_STALE_AFTER
+from .db import connect
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    original_address TEXT NOT NULL,
+    original_owner TEXT,
+    bridged_address TEXT,
+    deployment_tx TEXT,
+    stage TEXT NOT NULL DEFAULT 'pending',
+    status TEXT NOT NULL DEFAULT 'pending',
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_original_address ON jobs (original_address);
+CREATE TABLE IF NOT EXISTS job_chunks (
+    job_id INTEGER NOT NULL,
+    stage TEXT NOT NULL,
+    chunk_index INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    tx_hashes TEXT NOT NULL DEFAULT '[]',
+    nonce INTEGER,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (job_id, stage, chunk_index)
+);
+"""
+
+JOB_FIELDS = {"original_owner", "bridged_address", "deployment_tx", "stage", "status", "error"}
+
+
+class JobAlreadyRunning(RuntimeError):
+    """Another worker, possibly in another process, holds the job."""
+
+
+class JobStore:
+    """SQLite record of bridge jobs, their stages and every transaction chunk they send.
+
+    A job's chunk plan is stored the first time a stage runs, so a resumed
+    job replays exactly the same chunks and can skip the confirmed ones.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self._conn = connect(path)
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def _execute(self, sql: str, params: tuple = ()) -> int:
+        with self._lock:
+            return self._conn.execute(sql, params).lastrowid
+
+    def _query(self, sql: str, params: tuple = ()) -> List:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def create_job(self, kind: str, original_address: str, original_owner: Optional[str] = None) -> int:
+        now = time.time()
+        return self._execute(
+            "INSERT INTO jobs (kind, original_address, original_owner, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+            (kind, original_address, original_owner, now, now),
+        )
+
+    def get_job(self, job_id: int) -> Optional[Dict[str, Any]]:
+        rows = self._query("SELECT * FROM jobs WHERE id = ?", (job_id,))
+        return dict(rows[0]) if rows else None
+
+    def latest_unfinished_job(self, original_address: str, kind: str = "bridge") -> Optional[Dict[str, Any]]:
+        rows = self._query(
+            "SELECT * FROM jobs WHERE original_address = ? COLLATE NOCASE AND kind = ? AND status != 'done' "
+            "ORDER BY id DESC LIMIT 1",
+            (original_address, kind),
+        )
+        return dict(rows[0]) if rows else None
+
+    def claim(self, job_id: int, stale_after: float = JOB_CLAIM_STALE_AFTER):
+        """Mark a job running for the caller, or raise JobAlreadyRunning if someone else runs it.
+
+        The claim is one conditional UPDATE, so the bot and the API worker
+        sharing this database cannot both resume a job. A running job that
+        has made no progress for ``stale_after`` seconds is taken as abandoned.
+        """
+        now = time.time()
+        with self._lock:
+            claimed = self._conn.execute(
+                "UPDATE jobs SET status = 'running', updated_at = ? "
+                "WHERE id = ? AND (status != 'running' OR updated_at < ?)",
+                (now, job_id, now - stale_after),
+            ).rowcount
+        if claimed != 1:
+            raise JobAlreadyRunning(f"Bridge job {job_id} is already running")
+
+    def update_job(self, job_id: int, **fields):
+        unknown = set(fields) - JOB_FIELDS
+        if unknown:
+            raise ValueError(f"Unknown job fields: {unknown}")
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        self._execute(
+            f"UPDATE jobs SET {assignments}, updated_at = ? WHERE id = ?",
+            (*fields.values(), time.time(), job_id),
+        )
+
+    def set_stage(self, job_id: int, stage: str, status: str = "running"):
+        self.update_job(job_id, stage=stage, status=status)
+
+    def plan_chunks(self, job_id: int, stage: str, payloads: List[Any]) -> List[Dict[str, Any]]:
+        """Store the chunk plan for a stage, or return the one stored by an earlier run."""
+        existing = self.chunks(job_id, stage)
+        if existing:
+            return existing
+
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO job_chunks (job_id, stage, chunk_index, payload, updated_at) VALUES (?, ?, ?, ?, ?)",
+                    [(job_id, stage, index, json.dumps(payload), now) for index, payload in enumerate(payloads)],
+                )
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+        return self.chunks(job_id, stage)
+
+    def chunks(self, job_id: int, stage: str) -> List[Dict[str, Any]]:
+        rows = self._query(
+            "SELECT * FROM job_chunks WHERE job_id = ? AND stage = ? ORDER BY chunk_index",
+            (job_id, stage),
+        )
+        return [
+            {**dict(row), "payload": json.loads(row["payload"]), "tx_hashes": json.loads(row["tx_hashes"])}
+            for row in rows
+        ]
+
+    def record_chunk(self, job_id: int, stage: str, chunk_index: int, status: str,
+                     tx_hashes: Optional[List[str]] = None, nonce: Optional[int] = None):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE job_chunks SET status = ?, tx_hashes = COALESCE(?, tx_hashes), nonce = COALESCE(?, nonce), "
+                "updated_at = ? WHERE job_id = ? AND stage = ? AND chunk_index = ?",
+                (status, json.dumps(tx_hashes) if tx_hashes is not None else None, nonce, now,
+                 job_id, stage, chunk_index),
+            )
+            # Progress keeps the job's claim from going stale
+            self._conn.execute("UPDATE jobs SET updated_at = ? WHERE id = ?", (now, job_id))
+
+    def tx_hashes(self, job_id: int) -> Dict[str, List[str]]:
+        """Every tx hash broadcast for a job, per stage in chunk order."""
+        rows = self._query(
+            "SELECT stage, tx_hashes FROM job_chunks WHERE job_id = ? ORDER BY stage, chunk_index",
+            (job_id,),
+        )
+        hashes: Dict[str, List[str]] = {}
+        for row in rows:
+            hashes.setdefault(row["stage"], []).extend(json.loads(row["tx_hashes"]))
+        return hashes
+
+    def progress(self, job_id: int) -> Dict[str, Dict[str, int]]:
+        """Chunk counts per stage and status."""
+        rows = self._query(
+            "SELECT stage, status, COUNT(*) AS n FROM job_chunks WHERE job_id = ? GROUP BY stage, status",
+            (job_id,),
+        )
+        progress: Dict[str, Dict[str, int]] = {}
+        for row in rows:
+            progress.setdefault(row["stage"], {})[row["status"]] = row["n"]
+        return progress
@@ -1,7 +1,10 @@
 from time import time
-from flask import Flask, jsonify
+from flask import Flask, Response, g, jsonify, request
 from .config import env_vars
 from .nft_bridge import NFTBridge
+from .job_queue import JobQueue
+from .metrics import render as render_metrics
+from . import rpc_profiler
 from .utils import has_too_many_nfts, has_too_many_owners, last_sale_within_six_months
 
 app = Flask(__name__)
@@ -16,93 +19,157 @@ nft_bridge = NFTBridge(
     env_vars.BRIDGE_CONTROL_ADDRESS,
     env_vars.AUTHORIZER_ADDRESS,
     env_vars.FLASK_ENV,
-    skip_authorizer=True
+    skip_authorizer=True,
+    warm_start_block=int(env_vars.BRIDGE_START_BLOCK) if env_vars.BRIDGE_START_BLOCK else None,
+    persistent_sessions=True,
+    holder_source=env_vars.HOLDER_SOURCE or "api"
 )
 
-@app.route("/api/bridge/<param>", methods=["GET"])
-def bridge(param):
-    if bridged_addr := nft_bridge.get_bridged_address(param):
-        return jsonify({
-            "error": "Already bridged",
-            "original_address": param,
-            "bridged_address": bridged_addr,
-        })
-
-    original_address = param
-    holders = nft_bridge.get_holders_via_api(original_address)
-    airdrop_units = list(holders.values())
-    is721 = airdrop_units[0].is721
-    base_uri = ""
-
-    try:
-        royalty_data = nft_bridge.get_nft_royalty_info(original_address)
-    except Exception:
-        royalty_data = nft_bridge.get_onchain_royalty_info(original_address)
-
-    recipient = royalty_data["recipient"]
-    fee = royalty_data["fee"]
-
-    collection_data = nft_bridge.get_collection_data_api(original_address)
+job_queue = JobQueue(nft_bridge.job_store)
+
+def validation_error(original_address, collection_data):
+    """Return an error response body if the collection cannot be bridged, else None."""
     # if not collection_data.get("verified"):
-    #     return jsonify({
+    #     return {
     #         "error": "Collection not verified",
     #         "original_address": original_address,
-    #     })
+    #     }
 
     if has_too_many_nfts(collection_data):
-        return jsonify({
+        return {
             "error": "Collection has too many NFTs",
             "original_address": original_address,
             "total_nfts": collection_data.get("stats", {}).get("totalNFTs")
-        })
+        }
 
     if has_too_many_owners(collection_data):
-        return jsonify({
+        return {
             "error": "Collection has too many owners",
             "original_address": original_address,
             "num_owners": collection_data.get("stats", {}).get("numOwners")
-        })
+        }
 
     # if not last_sale_within_six_months(collection_data):
-    #     return jsonify({
+    #     return {
     #         "error": "Collection has not been sold in 6 months",
     #         "original_address": original_address,
-    #     })
-
-    original_owner = nft_bridge.get_collection_owner(original_address)
-    if is721:
-        name, symbol, base_uri, _, extension = nft_bridge.get_collection_data(original_address)
-        deployment_tx = nft_bridge.deploy_721(
-            original_address, original_owner, name, symbol, base_uri, extension, recipient, fee
-        )
+    #     }
+    return None
+
+def run_bridge_job(job_id):
+    """Worker entry point: snapshot, validate and bridge the job's collection."""
+    job = nft_bridge.job_store.get_job(job_id)
+    if job["bridged_address"] or job["stage"] != "pending":
+        nft_bridge.resume_bridge(job["original_address"])
+        return
+
+    if bridged_addr := nft_bridge.get_bridged_address(job["original_address"], confirm=True):
+        raise ValueError(f"Already bridged to {bridged_addr}")
+    snapshot = nft_bridge.get_collection_snapshot(job["original_address"])
+    if error := validation_error(job["original_address"], snapshot.collection_data):
+        raise ValueError(error["error"])
+    nft_bridge.job_store.update_job(job_id, original_owner=snapshot.original_owner)
+    nft_bridge.bridge_collection(snapshot, job_id)
+
+@app.before_request
+def start_rpc_profile():
+    """``?profile=1`` on any endpoint records its RPC calls and adds the ranked report to the response.
+
+    On the endpoints that queue a bridge job, the job is profiled as well,
+    and GET /api/jobs/<id> reports it as ``job_rpc_profile``.
+    """
+    if request.args.get("profile"):
+        g.rpc_profile = rpc_profiler.start(f"{request.method} {request.path}")
+
+@app.after_request
+def attach_rpc_profile(response):
+    profile = g.pop("rpc_profile", None)
+    if profile is None:
+        return response
+    rpc_profiler.stop(profile)
+    app.logger.info(profile.report())
+    body = response.get_json(silent=True)
+    if isinstance(body, dict):
+        body["rpc_profile"] = profile.summary()
+        response.set_data(jsonify(body).get_data())
+    return response
+
+@app.teardown_request
+def stop_rpc_profile(exc):
+    # after_request does not run when a view raises
+    profile = g.pop("rpc_profile", None)
+    if profile is not None:
+        rpc_profiler.stop(profile)
+
+@app.route("/metrics", methods=["GET"])
+def metrics():
+    body, content_type = render_metrics()
+    return Response(body, content_type=content_type)
+
+@app.route("/api/bridge/<param>", methods=["GET", "POST"])
+def enqueue_bridge(param):
+    """Queue a bridge job; everything that talks to the chains runs on the job worker."""
+    job = nft_bridge.job_store.latest_unfinished_job(param)
+    if job is not None and job["status"] != "failed":
+        return jsonify({"job_id": job["id"], "status": job["status"], "original_address": param}), 202
+
+    # ?profile=1 profiles the job itself; its report is served with the job
+    profile = bool(request.args.get("profile"))
+    if job is not None:
+        job_id = job["id"]
+        job_queue.submit(job_id, run_bridge_job, profile)
     else:
-        name = nft_bridge.get_collection_name(original_address)
-        deployment_tx = nft_bridge.deploy_1155(
-            original_address, original_owner, recipient, fee, name
-        )
-
-    bridged_address = nft_bridge.get_bridged_address(original_address)
-    if not bridged_address:
+        job_id = job_queue.enqueue("bridge", param, run_bridge_job, profile=profile)
+    return jsonify({"job_id": job_id, "status": "pending", "original_address": param}), 202
+
+@app.route("/api/jobs/<int:job_id>", methods=["GET"])
+def get_job(job_id):
+    job = nft_bridge.job_store.get_job(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found", "job_id": job_id}), 404
+
+    body = {
+        **job,
+        "progress": nft_bridge.job_store.progress(job_id),
+        "tx_hashes": nft_bridge.job_store.tx_hashes(job_id),
+    }
+    if (profile := job_queue.profile(job_id)) is not None:
+        body["job_rpc_profile"] = profile.summary()
+    return jsonify(body)
+
+@app.route("/api/resume/<param>", methods=["GET", "POST"])
+def resume(param):
+    """Queue the collection's unfinished bridge job again."""
+    original_address = nft_bridge.known_original_address(param)
+    job = nft_bridge.job_store.latest_unfinished_job(original_address)
+    if job is None:
         return jsonify({
-            "error": "Failed to deploy contract to target chain",
+            "error": f"No unfinished bridge job for {original_address}",
             "original_address": original_address,
-        })
-
-    airdrop_txs = nft_bridge.airdrop_holders(bridged_address, airdrop_units)
-    airdrop_tx_hashes = [tx.txn_hash for tx in airdrop_txs]
-
-    response = {
-        "original_address": original_address,
-        "bridged_address": bridged_address,
-        "deployment_tx": deployment_tx.txn_hash,
-        "airdrop_txs": airdrop_tx_hashes,
-    }
-
-    if not is721 or base_uri == "":
-        uris = nft_bridge.get_token_uris(original_address, is721=is721)
-        uri_txs = nft_bridge.set_token_uris(bridged_address, uris)
-        response["uri_txs"] = [tx.txn_hash for tx in uri_txs]
-    return jsonify(response)
+        }), 404
+    if job_queue.is_active(job["id"]):
+        return jsonify({
+            "error": "Job is already queued or running",
+            "original_address": original_address,
+            "job_id": job["id"],
+        }), 409
+
+    job_queue.submit(job["id"], run_bridge_job, bool(request.args.get("profile")))
+    return jsonify({"job_id": job["id"], "status": "pending", "original_address": original_address}), 202
+
+@app.route("/api/collections", methods=["GET"])
+def list_collections():
+    return jsonify({
+        "indexed_block": nft_bridge.indexer.cursor,
+        "collections": nft_bridge.indexer.bridged_collections(),
+    })
+
+@app.route("/api/collections/<param>", methods=["GET"])
+def get_collection(param):
+    state = nft_bridge.get_collection_state(param)
+    if state is None:
+        return jsonify({"error": "Collection not indexed", "address": param}), 404
+    return jsonify(state)
 
 @app.route("/api/getBridgedAddress/<param>", methods=["GET"])
 def getBridgedAddress(param):
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+
+from contextlib import contextmanager
+from functools import wraps
+import logging
+import os
+import time
+from typing import Iterable, Tuple
+import weakref
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+    start_http_server,
+)
+from web3.middleware import Web3Middleware
+
+from . import rpc_profiler
+
+logger = logging.getLogger(__name__)
+
+STAGE_BUCKETS = (0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800, 3600)
+
+STAGE_SECONDS = Histogram(
+    "paintbridge_stage_seconds", "Wall time of a bridge stage", ["stage", "outcome"], buckets=STAGE_BUCKETS
+)
+RPC_CALLS = Counter("paintbridge_rpc_calls_total", "JSON-RPC requests sent", ["chain", "method"])
+RPC_SECONDS = Histogram("paintbridge_rpc_seconds", "JSON-RPC request latency", ["chain", "method"])
+PAINTSWAP_SECONDS = Histogram(
+    "paintbridge_paintswap_request_seconds", "PaintSwap API request latency", ["endpoint", "status"]
+)
+PAINTSWAP_CACHE = Counter(
+    "paintbridge_paintswap_cache_total", "PaintSwap responses by cache outcome", ["endpoint", "result"]
+)
+TXS_SENT = Counter("paintbridge_txs_total", "Transactions mined per collection and stage", ["collection", "stage"])
+GAS_USED = Counter("paintbridge_gas_used_total", "Gas used per collection and stage", ["collection", "stage"])
+
+
+@contextmanager
+def time_stage(stage: str):
+    """Record how long the enclosed bridge stage took and whether it raised.
+
+    Active RPC profiles attribute the stage's requests and wall time to it.
+    """
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        with rpc_profiler.stage(stage):
+            yield
+        outcome = "ok"
+    finally:
+        STAGE_SECONDS.labels(stage, outcome).observe(time.perf_counter() - start)
+
+
+def timed_stage(stage: str):
+    """Decorator form of time_stage."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with time_stage(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def record_receipts(collection: str, stage: str, receipts: Iterable):
+    """Count the mined transactions of a stage and the gas they used, labelled with the original collection address."""
+    for receipt in receipts:
+        TXS_SENT.labels(collection.lower(), stage).inc()
+        GAS_USED.labels(collection.lower(), stage).inc(receipt.gas_used or 0)
+
+
+class RpcMetricsMiddleware(Web3Middleware):
+    """Count and time every JSON-RPC request a Web3 instance makes, and feed any active RPC profile."""
+    chain = "unknown"
+
+    def wrap_make_request(self, make_request):
+        def middleware(method, params):
+            start = time.perf_counter()
+            try:
+                return make_request(method, params)
+            finally:
+                elapsed = time.perf_counter() - start
+                RPC_CALLS.labels(self.chain, method).inc()
+                RPC_SECONDS.labels(self.chain, method).observe(elapsed)
+                if rpc_profiler.is_active():
+                    rpc_profiler.record(self.chain, method, params, elapsed)
+        return middleware
+
+
+_instrumented = weakref.WeakSet()
+
+
+def instrument_web3(web3, chain: str):
+    """Add RPC metrics to a Web3 instance, once."""
+    if web3 in _instrumented:
+        return
+
+    def build(w3):
+        middleware = RpcMetricsMiddleware(w3)
+        middleware.chain = chain
+        return middleware
+
+    web3.middleware_onion.add(build, name="rpc_metrics")
+    _instrumented.add(web3)
+
+
+def instrument_provider(provider):
+    """Add RPC metrics to a connected ape provider's Web3 instance."""
+    try:
+        network = provider.network
+        instrument_web3(provider.web3, f"{network.ecosystem.name}:{network.name}")
+    except Exception as e:
+        logger.debug(f"Could not instrument provider {provider}: {str(e)}")
+
+
+def render() -> Tuple[bytes, str]:
+    """Current metrics in the Prometheus text format, with their content type.
+
+    Under gunicorn with PROMETHEUS_MULTIPROC_DIR set, the samples of all
+    worker processes are merged.
+    """
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+
+def serve(port: int):
+    """Expose the metrics over HTTP from a background thread, for processes without a web app."""
+    start_http_server(port)
+    logger.info(f"Serving metrics on :{port}/metrics")
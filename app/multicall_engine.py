@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextvars import copy_context
+import logging
+import threading
+from typing import Any, List, Optional, Sequence, Tuple
+
+from ape_ethereum import multicall
+
+from .constants import (
+    MULTICALL_WINDOW,
+    MULTICALL_MIN_WINDOW,
+    MULTICALL_MAX_WINDOW,
+    MULTICALL_CONCURRENCY,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class MulticallEngine:
+    """Run many read calls as concurrent multicall windows.
+
+    The window size adapts to the RPC: a window that errors out (response
+    too large, gas cap, timeout) is split in half and retried, and the size
+    used for new windows shrinks; successful windows grow it back towards
+    ``max_window``. Individual reverting calls come back as None. A call
+    that still errors out in a window of its own is a failure, not a revert:
+    it also comes back as None from ``call``, unless ``strict`` is set, and
+    ``call_with_failures`` reports it separately.
+
+    Worker threads use the provider that is active when ``call`` is entered,
+    so call it inside the relevant chain context and keep that thread
+    blocked until it returns.
+    """
+
+    def __init__(
+        self,
+        window: int = MULTICALL_WINDOW,
+        min_window: int = MULTICALL_MIN_WINDOW,
+        max_window: int = MULTICALL_MAX_WINDOW,
+        concurrency: int = MULTICALL_CONCURRENCY,
+    ):
+        self.window = window
+        self.min_window = min_window
+        self.max_window = max_window
+        self.concurrency = max(1, concurrency)
+        self._lock = threading.Lock()
+
+    def _shrink(self, failed_size: int):
+        with self._lock:
+            self.window = max(self.min_window, min(self.window, failed_size // 2))
+
+    def _grow(self):
+        with self._lock:
+            self.window = min(self.max_window, int(self.window * 1.5) + 1)
+
+    @staticmethod
+    def _run_window(method, args: Sequence[tuple]) -> List[Any]:
+        call = multicall.Call()
+        for call_args in args:
+            call.add(method, *call_args)
+        return list(call())
+
+    def call(self, method, args: Sequence, strict: bool = False) -> List[Optional[Any]]:
+        """Call ``method`` once per entry of ``args`` and return results in order.
+
+        Entries of ``args`` are argument tuples, or single values for
+        one-argument methods. With ``strict``, a failed call raises instead
+        of coming back as None.
+        """
+        results, failed = self.call_with_failures(method, args)
+        if strict and failed:
+            raise RuntimeError(f"{len(failed)} of {len(results)} calls failed, first at index {failed[0]}")
+        return results
+
+    def call_with_failures(self, method, args: Sequence) -> Tuple[List[Optional[Any]], List[int]]:
+        """Like ``call``, also returning the sorted indices of calls that failed rather than reverted."""
+        args = [a if isinstance(a, tuple) else (a,) for a in args]
+        results: List[Optional[Any]] = [None] * len(args)
+        failed: List[int] = []
+        retry = deque()
+        next_start = 0
+
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="multicall") as pool:
+            futures = {}
+
+            def schedule():
+                nonlocal next_start
+                while len(futures) < self.concurrency and (retry or next_start < len(args)):
+                    if retry:
+                        start, stop = retry.popleft()
+                    else:
+                        start, stop = next_start, min(len(args), next_start + self.window)
+                        next_start = stop
+                    futures[pool.submit(copy_context().run, self._run_window, method, args[start:stop])] = (start, stop)
+
+            schedule()
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    start, stop = futures.pop(future)
+                    try:
+                        results[start:stop] = future.result()
+                        self._grow()
+                    except Exception as e:
+                        if stop - start == 1:
+                            logger.warning(f"Call {start} failed on its own, leaving it empty: {str(e)}")
+                            failed.append(start)
+                            continue
+                        logger.debug(f"Multicall window {start}-{stop} failed, splitting it: {str(e)}")
+                        self._shrink(stop - start)
+                        mid = (start + stop) // 2
+                        retry.extend([(start, mid), (mid, stop)])
+                schedule()
+
+        return results, sorted(failed)
+
+    def scan(self, method, start: int = 0, stop: Optional[int] = None, gap_tolerance: int = 0,
+             strict: bool = False) -> List[Optional[Any]]:
+        """Call ``method(i)`` for every i from ``start``, returning results in order.
+
+        Every id below ``stop`` is read. Beyond it (or from ``start`` when
+        ``stop`` is unknown) the scan keeps going until ``gap_tolerance``
+        consecutive calls come back empty, so sparse ids are not cut off at
+        an arbitrary window boundary. Trailing empty results are dropped.
+        ``strict`` is passed on to ``call``.
+        """
+        results: List[Optional[Any]] = []
+        if stop is not None and stop > start:
+            results = self.call(method, range(start, stop), strict=strict)
+
+        while gap_tolerance > 0:
+            probe_start = start + len(results)
+            probe = self.call(method, range(probe_start, probe_start + max(gap_tolerance, self.window)), strict=strict)
+            results.extend(probe)
+            trailing_empty = 0
+            for result in reversed(results):
+                if result is not None:
+                    break
+                trailing_empty += 1
+            if trailing_empty >= gap_tolerance:
+                break
+
+        while results and results[-1] is None:
+            results.pop()
+        return results
@@ -1,6 +1,5 @@
 #!/usr/bin/env python3
 
-import requests
 import os
 from dataclasses import dataclass
 
@@ -8,11 +7,15 @@ from ape import Contract, accounts, project
 from ape_ethereum import multicall
 
 from .utils import chunk, source_chain_context, target_chain_context, parse_url
+from .multicall_engine import MulticallEngine
+from .contracts import contract_at
+from .paintswap import paintswap_client
 from .constants import (
     ROYALTY_REGISTRY_ADDRESS,
     ZERO_ADDR,
     DATA_PREFIX,
     ERC1155_INTERFACE_ID,
+    URI_GAP_TOLERANCE,
     )
 
 # load environment var FLASK_ENV to determine if we're in dev, test or prod
@@ -77,31 +80,15 @@ class AirdropUnit:
 
 @source_chain_context
 def get_token_uris(original_address, is721=False):
-    nft_contract = project.ERC1155.at(original_address)
+    nft_contract = contract_at("ERC1155", original_address)
     if is721:
-        nft_contract = project.ERC721.at(original_address)
-    token_uris = []
-    may_have_more = True
-    start = 0
-    while may_have_more:
-        call = multicall.Call()
-        for i in range(start, start + 100):
-            if is721:
-                call.add(nft_contract.tokenURI, i)
-            else:
-                call.add(nft_contract.uri, i)
-        results = list(call())
-        if results[-1] is None:
-            may_have_more = False
-        token_uris.extend(results)
-        start += 1000
-    while len(token_uris) > 0 and token_uris[-1] is None:
-        token_uris.pop()
-    return token_uris
+        nft_contract = contract_at("ERC721", original_address)
+    method = nft_contract.tokenURI if is721 else nft_contract.uri
+    return MulticallEngine().scan(method, 0, None, URI_GAP_TOLERANCE)
 
 @source_chain_context
 def is_enumerable(original_address):
-    nft_contract = project.ERC721.at(original_address)
+    nft_contract = contract_at("ERC721", original_address)
     try:
         nft_contract.totalSupply()
     except Exception:
@@ -111,14 +98,14 @@ def is_enumerable(original_address):
 
 @source_chain_context
 def get_onchain_royalty_info(original_address):
-    registry = project.RoyaltyRegistry.at(ROYALTY_REGISTRY_ADDRESS)
+    registry = contract_at("RoyaltyRegistry", ROYALTY_REGISTRY_ADDRESS)
     royalties = registry.collectionRoyalties(original_address)
     return royalties
 
 
 @source_chain_context
 def get_nft_royalty_info(original_address):
-    nft_contract = project.ERC721.at(original_address)
+    nft_contract = contract_at("ERC721", original_address)
     # return destination address and royalty percentage in bps
     ONE_ETH = 10**18
     (recipient, royaltyAmount) = nft_contract.royaltyInfo(1, ONE_ETH)
@@ -137,7 +124,7 @@ def is_erc1155(address):
 
 @source_chain_context
 def get_collection_data(original_address):
-    nft_contract = project.ERC721.at(original_address)
+    nft_contract = contract_at("ERC721", original_address)
     name = nft_contract.name()
     symbol = nft_contract.symbol()
 
@@ -151,15 +138,12 @@ def get_collection_data(original_address):
     return name, symbol, base_uri, has_extension, extension
 
 def get_collection_data_api(original_address):
-    endpoint = f"https://api.paintswap.finance/v2/collections/{original_address}"
-    response = requests.get(endpoint, timeout=60)
-    data = response.json()
-    return data["collection"]
+    return paintswap_client().collection(original_address)
 
 
 @target_chain_context
 def set_token_uris(target_address, token_uris):
-    BRIDGE_CONTROL = project.SCCNFTBridge.at(bridge_control_address)
+    BRIDGE_CONTROL = contract_at("SCCNFTBridge", bridge_control_address)
     start_from = 0
     txs = []
     if token_uris[0] is None:
@@ -178,7 +162,7 @@ def set_token_uris(target_address, token_uris):
 
 @target_chain_context
 def get_bridged_address(original_address) -> str | None:
-    BRIDGE_CONTROL = project.SCCNFTBridge.at(bridge_control_address)
+    BRIDGE_CONTROL = contract_at("SCCNFTBridge", bridge_control_address)
     bridged_address = BRIDGE_CONTROL.bridgedAddressForOriginal(original_address)
     if bridged_address == ZERO_ADDR:
         return None
@@ -187,7 +171,7 @@ def get_bridged_address(original_address) -> str | None:
 
 @target_chain_context
 def deploy_1155(original_address, original_owner, royaltyRecipient, royaltyBPS):
-    BRIDGE_CONTROL = project.SCCNFTBridge.at(bridge_control_address)
+    BRIDGE_CONTROL = contract_at("SCCNFTBridge", bridge_control_address)
     tx = BRIDGE_CONTROL.deployERC1155(
         original_address, original_owner, royaltyRecipient, royaltyBPS, sender=deployer
     )
@@ -196,7 +180,7 @@ def deploy_1155(original_address, original_owner, royaltyRecipient, royaltyBPS):
 
 @source_chain_context
 def get_collection_owner(original_address):
-    nft_contract = project.ERC721.at(original_address)
+    nft_contract = contract_at("ERC721", original_address)
     try:
         owner = nft_contract.owner()
         return owner
@@ -207,7 +191,7 @@ def get_collection_owner(original_address):
 def deploy_721(
         original_address, original_owner, name, symbol, base_uri, extension, recipient, bps
 ):
-    BRIDGE_CONTROL = project.SCCNFTBridge.at(bridge_control_address)
+    BRIDGE_CONTROL = contract_at("SCCNFTBridge", bridge_control_address)
     enumerable = is_enumerable(original_address)
     tx = BRIDGE_CONTROL.deployERC721(
         original_address,
@@ -245,14 +229,7 @@ def get_holders_via_api(original_address):
     done = False
     holders_dict = {}
     while not done:
-        URL = f"https://api.paintswap.finance/v2/userNFTs?requireUser=false&collections={original_address}&numToSkip={num_to_skip}&numToFetch=1000&orderBy=tokenId"
-        response = requests.get(URL, timeout=60)
-        data = response.json()
-        try:
-            data = data["nfts"]
-        except KeyError:
-            print(f"Error fetching data: {data}")
-            raise
+        data = paintswap_client().user_nfts_page(original_address, num_to_skip, 1000)
         if len(data) < 1000:
             done = True
         for nft_data in data:
@@ -273,12 +250,11 @@ def get_holders_via_api(original_address):
 
 @target_chain_context
 def airdrop_holders(bridged_address: str, holders: list[AirdropUnit]):
-    BRIDGE_CONTROL = project.SCCNFTBridge.at(bridge_control_address)
+    BRIDGE_CONTROL = contract_at("SCCNFTBridge", bridge_control_address)
     items = holders
     txs = []
     is721 = items[0].is721
-    contract = project.ERC721 if is721 else project.ERC1155
-    nft = contract.at(bridged_address)
+    nft = contract_at("ERC721" if is721 else "ERC1155", bridged_address)
     chunk_count = 0
     for item_chunk in chunk_airdrop_units(items, 200):
         airdrop_units = [holder.to_args() for holder in item_chunk]
@@ -303,7 +279,7 @@ def admin_set_bridging_approved(collection_address: str, approved: bool):
     Returns:
         Transaction receipt
     """
-    BRIDGE_CONTROL = project.SCCNFTBridge.at(bridge_control_address)
+    BRIDGE_CONTROL = contract_at("SCCNFTBridge", bridge_control_address)
     tx = BRIDGE_CONTROL.adminSetBridgingApproved(
         collection_address,
         approved,
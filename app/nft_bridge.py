@@ -1,20 +1,54 @@
 #!/usr/bin/env python3
 
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextvars import copy_context
+from dataclasses import dataclass, replace
+from types import MappingProxyType
 import os
-import requests
 import logging
-from typing import List, Dict, Tuple, Optional
+from typing import Iterable, List, Dict, Tuple, Optional, Mapping
 
-from ape import Contract, accounts, project
+from ape import Contract, accounts, networks, project
+from ape.exceptions import ContractLogicError
 from ape_ethereum import multicall
-
-from .utils import chunk, source_chain_context, target_chain_context, parse_url
+from web3.exceptions import TransactionNotFound
+
+from .utils import source_chain_context, target_chain_context, parse_url, chunk
+from .tx_pipeline import TxPipeline
+from .job_store import JobStore
+from .address_cache import AddressCache, APPROVED, BRIDGED, ORIGINAL
+from .indexer import BridgeIndexer
+from .multicall_engine import MulticallEngine
+from .contracts import contract_at, warm_up
+from .sessions import ChainSession, source_session, target_session
+from .uri_cache import UriCache
+from .paintswap import PaintSwapClient, paintswap_client
+from .metrics import record_receipts, timed_stage
+from .collection_profile import CollectionProfile, ProfileStore
+from .uri_plan import detect_uri_pattern, plan_uri_writes
+from .holder_snapshot import HolderSnapshot, LogHolderScanner
+from .reconcile import ReconcilePlan, Holdings1155, desired_721, desired_1155, diff_721, diff_1155
+from .gas import (
+    block_gas_budget,
+    calibrate_airdrop_gas,
+    calibrate_burn_gas,
+    plan_airdrop_batches,
+    plan_burn_batches,
+    plan_uri_batches,
+)
 from .constants import (
     ROYALTY_REGISTRY_ADDRESS,
     ZERO_ADDR,
-    DATA_PREFIX,
     ERC1155_INTERFACE_ID,
+    HOLDERS_PAGE_SIZE,
+    HOLDERS_FETCH_CONCURRENCY,
+    TX_PIPELINE_DEPTH,
+    AIRDROP_GAS_FRACTION,
+    URI_GAS_CEILING,
+    URI_GAP_TOLERANCE,
+    URI_CHECKPOINT_SIZE,
+    URI_CACHE_MAX_AGE,
+    BALANCE_BATCH_SIZE,
 )
 
 # Configure logging
@@ -51,6 +85,37 @@ class AirdropUnit:
         else:
             return (self.address, self.token_ids, self.amounts, self.data)
 
+@dataclass(frozen=True)
+class CollectionSnapshot:
+    """Everything fetched about a source collection before it is deployed."""
+    original_address: str
+    holders: Mapping[str, AirdropUnit]
+    collection_data: Mapping
+    royalty_data: Mapping
+    original_owner: str
+    name: str
+    symbol: str
+    base_uri: str
+    extension: str
+    # Interface support as probed on the source chain
+    is_erc1155: bool = False
+
+    @property
+    def airdrop_units(self) -> List[AirdropUnit]:
+        return list(self.holders.values())
+
+    @property
+    def max_token_id(self) -> Optional[int]:
+        """Highest token id held by anyone, None if there are no holders."""
+        return max((int(token_id) for unit in self.holders.values() for token_id in unit.token_ids), default=None)
+
+    @property
+    def is721(self) -> bool:
+        """Collection type as reported by the holder data, or by the interface probe if there are no holders."""
+        if not self.holders:
+            return not self.is_erc1155
+        return next(iter(self.holders.values())).is721
+
 class NFTBridge:
     def __init__(
         self,
@@ -63,7 +128,16 @@ class NFTBridge:
         bridge_control_address: Optional[str] = None,
         authorizer_address: Optional[str] = None,
         environment: str = "production",
-        skip_authorizer: bool = False
+        skip_authorizer: bool = False,
+        pipeline_depth: int = TX_PIPELINE_DEPTH,
+        airdrop_gas_fraction: float = AIRDROP_GAS_FRACTION,
+        uri_gas_ceiling: int = URI_GAS_CEILING,
+        job_store: Optional[JobStore] = None,
+        warm_start_block: Optional[int] = None,
+        indexer: Optional[BridgeIndexer] = None,
+        persistent_sessions: bool = False,
+        holder_source: str = "api",
+        paintswap: Optional[PaintSwapClient] = None
     ):
         """
         Initialize the NFT Bridge with required addresses and deployment parameters.
@@ -77,14 +151,41 @@ class NFTBridge:
             bridge_control_address: Optional bridge control contract address
             authorizer_address: Optional authorizer contract address
             environment: Environment type (development, production)
+            pipeline_depth: Max airdrop transactions in flight before waiting for receipts
+            airdrop_gas_fraction: Fraction of the block gas limit each airdrop tx may use
+            uri_gas_ceiling: Estimated gas limit for each batchSetTokenURIs tx
+            job_store: Store for resumable bridge jobs, defaults to the local SQLite database
+            warm_start_block: If set, preload the address cache from approval events since this block
+            indexer: Local mirror of the bridge mappings, defaults to one on the local SQLite database
+            persistent_sessions: Hold a pooled session per chain and send target txs through it,
+                so they are not affected by other threads switching ape's active provider
+            holder_source: Where snapshots take holders from: "api" (PaintSwap) or "chain" (transfer logs)
+            paintswap: PaintSwap API client, defaults to the process-wide shared one
         """
         self.environment = environment
+        self.pipeline_depth = pipeline_depth
+        self.airdrop_gas_fraction = airdrop_gas_fraction
+        self.uri_gas_ceiling = uri_gas_ceiling
+        if holder_source not in ("api", "chain"):
+            raise ValueError(f"Unknown holder source: {holder_source}")
+        self.holder_source = holder_source
+        self._airdrop_gas_models = {}
+        self._burn_gas_model = None
+        self.job_store = job_store or JobStore()
+        self.address_cache = AddressCache()
+        self.multicall_engine = MulticallEngine()
+        self.uri_cache = UriCache()
+        self.profile_store = ProfileStore()
+        self.paintswap: PaintSwapClient = paintswap or paintswap_client()
+        self.source_session: Optional[ChainSession] = source_session() if persistent_sessions else None
+        self.target_session: Optional[ChainSession] = target_session() if persistent_sessions else None
         self.deployer = accounts.load(deployer_account_id)
         self.deployer.set_autosign(True, deployer_password)
 
         self.source_endpoint = source_endpoint
         self.target_endpoint = target_endpoint
 
+
         # Initialize contracts
         if not factory_address:
             self.factory_address = self._deploy_factory()
@@ -100,6 +201,28 @@ class NFTBridge:
         else:
             self.authorizer_address = authorizer_address
 
+        self.indexer = indexer or BridgeIndexer(self.bridge_control_address)
+
+        try:
+            self._warm_up_target_contracts()
+            self._warm_up_source_contracts()
+        except Exception as e:
+            logger.warning(f"Contract handle warm-up failed: {str(e)}")
+
+        if warm_start_block is not None:
+            try:
+                self.warm_address_cache(warm_start_block)
+            except Exception as e:
+                logger.warning(f"Address cache warm start failed: {str(e)}")
+
+    @target_chain_context
+    def _warm_up_target_contracts(self):
+        warm_up({"SCCNFTBridge": self.bridge_control_address, "NFTFactory": self.factory_address})
+
+    @source_chain_context
+    def _warm_up_source_contracts(self):
+        warm_up({"RoyaltyRegistry": ROYALTY_REGISTRY_ADDRESS})
+
     @target_chain_context
     def _deploy_factory(self) -> str:
         factory = project.NFTFactory.deploy(sender=self.deployer)
@@ -125,69 +248,220 @@ class NFTBridge:
         )
         return authorizer.address
 
+    @timed_stage("uri_fetch")
     @source_chain_context
-    def get_token_uris(self, original_address: str, is721: bool = False) -> List[str]:
-        """Fetch token URIs for the given NFT contract."""
-        nft_contract = project.ERC1155.at(original_address)
+    def get_token_uris(self, original_address: str, is721: bool = False,
+                       max_token_id: Optional[int] = None, max_age: float = URI_CACHE_MAX_AGE) -> List[str]:
+        """Fetch token URIs for the given NFT contract, indexed by token id.
+
+        Ids are read in checkpoints of URI_CHECKPOINT_SIZE: each checkpoint
+        takes fresh entries from the URI cache, multicalls only the missing or
+        stale ids and stores them before moving on, so an interrupted fetch
+        resumes where it stopped. Every id up to the known upper bound is read,
+        then the scan continues until URI_GAP_TOLERANCE consecutive ids are
+        missing. The bound is ``max_token_id`` (e.g. from holder data) or, for
+        ERC721s that have it, totalSupply. Pass ``max_age=0`` to bypass the cache.
+        """
+        nft_contract = contract_at("ERC1155", original_address)
         if is721:
-            nft_contract = project.ERC721.at(original_address)
+            nft_contract = contract_at("ERC721", original_address)
 
+        stop = None
+        if max_token_id is not None:
+            stop = max_token_id + 1
+        elif is721:
+            try:
+                # Ids commonly start at 1, so the last id is at least totalSupply
+                stop = nft_contract.totalSupply() + 1
+            except Exception:
+                pass
+
+        method = nft_contract.tokenURI if is721 else nft_contract.uri
         token_uris = []
-        may_have_more = True
+        trailing_empty = 0
         start = 0
-
-        while may_have_more:
-            call = multicall.Call()
-            for i in range(start, start + 100):
-                if is721:
-                    call.add(nft_contract.tokenURI, i)
-                else:
-                    call.add(nft_contract.uri, i)
-            results = list(call())
-            if results[-1] is None:
-                may_have_more = False
-            token_uris.extend(results)
-            start += 100
+        num_fetched = 0
+        while (stop is not None and start < stop) or trailing_empty < URI_GAP_TOLERANCE:
+            end = start + URI_CHECKPOINT_SIZE
+            checkpoint = self.uri_cache.get_range(original_address, start, end, max_age)
+            missing = [token_id for token_id in range(start, end) if token_id not in checkpoint]
+            if missing:
+                results, failed = self.multicall_engine.call_with_failures(method, missing)
+                fetched = list(zip(missing, results))
+                # Only answers and reverts are cached; a failed read is tried again next time
+                failed = set(failed)
+                self.uri_cache.put_many(original_address, [entry for i, entry in enumerate(fetched) if i not in failed])
+                checkpoint.update(fetched)
+                num_fetched += len(missing)
+
+            for token_id in range(start, end):
+                uri = checkpoint[token_id]
+                token_uris.append(uri)
+                trailing_empty = trailing_empty + 1 if uri is None else 0
+            start = end
 
         while token_uris and token_uris[-1] is None:
             token_uris.pop()
+        logger.info(f"Token URIs for {original_address}: {len(token_uris)} ids, {num_fetched} read from chain")
         return token_uris
 
+    @timed_stage("uri_fetch")
+    @source_chain_context
+    def read_token_uris(self, original_address: str, token_ids: List[int],
+                        is721: bool = False) -> Dict[int, Optional[str]]:
+        """Read the URIs of just ``token_ids`` from the chain, bypassing the URI
+        cache but storing what was read in it. Ids whose read failed are left out."""
+        nft_contract = contract_at("ERC721", original_address) if is721 else contract_at("ERC1155", original_address)
+        method = nft_contract.tokenURI if is721 else nft_contract.uri
+        results, failed = self.multicall_engine.call_with_failures(method, token_ids)
+        failed = set(failed)
+        fetched = [entry for i, entry in enumerate(zip(token_ids, results)) if i not in failed]
+        self.uri_cache.put_many(original_address, fetched)
+        if failed:
+            logger.warning(f"Failed to read {len(failed)} of {len(token_ids)} token URIs of {original_address}")
+        return dict(fetched)
+
     @source_chain_context
     def is_enumerable(self, original_address: str) -> bool:
         """Check if the NFT contract supports enumeration."""
-        nft_contract = project.ERC721.at(original_address)
-        try:
-            nft_contract.totalSupply()
-            return True
-        except Exception:
-            return False
+        return self._interfaces(original_address)["is_enumerable"]
 
     @source_chain_context
     def get_onchain_royalty_info(self, original_address: str) -> Tuple:
         """Get royalty information from the registry."""
-        registry = project.RoyaltyRegistry.at(ROYALTY_REGISTRY_ADDRESS)
+        registry = contract_at("RoyaltyRegistry", ROYALTY_REGISTRY_ADDRESS)
         return registry.collectionRoyalties(original_address)
 
     @source_chain_context
     def get_nft_royalty_info(self, original_address: str) -> Dict:
         """Get NFT-specific royalty information."""
-        nft_contract = project.ERC721.at(original_address)
+        nft_contract = contract_at("ERC721", original_address)
         ONE_ETH = 10**18
         recipient, royalty_amount = nft_contract.royaltyInfo(1, ONE_ETH)
         bps = royalty_amount // 10**14
         return {"recipient": recipient, "fee": bps}
 
+    @source_chain_context
+    def get_royalty_info(self, original_address: str) -> Dict:
+        """Get royalty information, falling back to the registry if the NFT has none."""
+        try:
+            return self.get_nft_royalty_info(original_address)
+        except Exception as e:
+            logger.info(f"Getting on-chain royalty info for {original_address} due to: {str(e)}")
+            recipient, fee = self.get_onchain_royalty_info(original_address)
+            return {"recipient": recipient, "fee": fee}
+
     @source_chain_context
     def is_erc1155(self, address: str) -> bool:
         """Check if the contract implements ERC1155."""
-        nft_contract = project.ERC1155.at(address)
-        return nft_contract.supportsInterface(ERC1155_INTERFACE_ID)
+        return self._interfaces(address)["is_erc1155"]
+
+    def _interfaces(self, address: str) -> Dict:
+        """Cached interface flags for a source collection, probing it on first use."""
+        known = self.profile_store.get(address)
+        if known is None:
+            profile = self.probe_collection(address)
+            known = {"is_erc1155": profile.is_erc1155, "is_enumerable": profile.is_enumerable}
+        return known
+
+    @staticmethod
+    def _try_call(method, *args) -> Tuple[Optional[object], bool]:
+        """(result, answered): a revert is an answer with an empty result, any other error is not."""
+        try:
+            return method(*args), True
+        except ContractLogicError:
+            return None, True
+        except Exception as e:
+            logger.info(f"Call to {method} failed: {str(e)}")
+            return None, False
+
+    @source_chain_context
+    def probe_collection(self, original_address: str) -> CollectionProfile:
+        """Read a source collection's metadata, owner, royalties and interfaces in one multicall.
+
+        Calls that revert come back empty instead of raising. Name, symbol and
+        interface support are cached in the profile store, so later probes of
+        the same collection only read the fields that can change; they are
+        only cached when every one of them was answered or reverted.
+        """
+        erc721 = contract_at("ERC721", original_address)
+        erc1155 = contract_at("ERC1155", original_address)
+        registry = contract_at("RoyaltyRegistry", ROYALTY_REGISTRY_ADDRESS)
+        known = self.profile_store.get(original_address)
+
+        calls = [
+            (erc721.owner, ()),
+            (erc721.tokenURI, (1,)),
+            (erc721.royaltyInfo, (1, 10**18)),
+            (registry.collectionRoyalties, (original_address,)),
+        ]
+        if known is None:
+            calls += [
+                (erc721.name, ()),
+                (erc721.symbol, ()),
+                (erc721.totalSupply, ()),
+                (erc1155.supportsInterface, (ERC1155_INTERFACE_ID,)),
+            ]
+
+        try:
+            call = multicall.Call()
+            for method, args in calls:
+                call.add(method, *args)
+            results = list(call())
+            answered = [True] * len(calls)
+        except Exception as e:
+            # e.g. a contract whose fallback returns undecodable data for a missing function
+            logger.info(f"Multicall probe of {original_address} failed, probing call by call: {str(e)}")
+            results, answered = map(list, zip(*(self._try_call(method, *args) for method, args in calls)))
+
+        owner, token_uri, nft_royalty, registry_royalty = results[:4]
+        cacheable = True
+        if known is None:
+            name, symbol, total_supply, supports_erc1155 = results[4:]
+            cacheable = all(answered[4:])
+            known = {
+                "name": name or "",
+                "symbol": symbol or "",
+                "is_enumerable": total_supply is not None,
+                "is_erc1155": bool(supports_erc1155),
+            }
+
+        if nft_royalty is not None:
+            recipient, royalty_amount = nft_royalty
+            royalty_recipient, royalty_fee = recipient, royalty_amount // 10**14
+        elif registry_royalty is not None:
+            logger.info(f"Using registry royalty info for {original_address}")
+            royalty_recipient, royalty_fee = registry_royalty
+        else:
+            raise ValueError(f"Could not read royalty info for {original_address}")
+
+        base_uri, extension = "", ""
+        url_data = parse_url(token_uri) if token_uri else None
+        if url_data is not None:
+            base_uri, _, extension = url_data
+
+        profile = CollectionProfile(
+            address=original_address,
+            name=known["name"],
+            symbol=known["symbol"],
+            base_uri=base_uri,
+            extension=extension,
+            owner=owner or ZERO_ADDR,
+            royalty_recipient=royalty_recipient,
+            royalty_fee=royalty_fee,
+            is_erc1155=known["is_erc1155"],
+            is_enumerable=known["is_enumerable"],
+        )
+        if cacheable:
+            self.profile_store.put(profile)
+        else:
+            logger.warning(f"Probe of {original_address} had failed calls, not caching its profile")
+        return profile
 
     @source_chain_context
     def get_collection_data(self, original_address: str) -> Tuple[str, str, str, bool, str]:
         """Get collection metadata from the contract."""
-        nft_contract = project.ERC721.at(original_address)
+        nft_contract = contract_at("ERC721", original_address)
         name = nft_contract.name()
         symbol = nft_contract.symbol()
 
@@ -206,7 +480,7 @@ class NFTBridge:
     @source_chain_context
     def get_collection_name(self, original_address: str) -> str:
         """Get the name of the collection."""
-        nft_contract = project.ERC721.at(original_address)
+        nft_contract = contract_at("ERC721", original_address)
         try:
             return nft_contract.name()
         except Exception:
@@ -221,17 +495,17 @@ class NFTBridge:
         original_address = self.get_original_address(address)
         if original_address:
             address = original_address
-            
-        endpoint = f"https://api.paintswap.finance/v2/collections/{address}"
-        logger.info(f"Fetching collection data from {endpoint}")
-        response = requests.get(endpoint, timeout=60)
-        data = response.json()
-        return data["collection"]
+
+        return self._fetch_collection_data_api(address)
+
+    def _fetch_collection_data_api(self, address: str) -> Dict:
+        logger.info(f"Fetching collection data for {address}")
+        return self.paintswap.collection(address)
 
     @source_chain_context
     def get_total_supply(self, original_address: str) -> int:
         """Get the total supply of the collection."""
-        nft_contract = project.ERC721.at(original_address)
+        nft_contract = contract_at("ERC721", original_address)
         try:
             return nft_contract.totalSupply()
         except Exception:
@@ -239,25 +513,38 @@ class NFTBridge:
 
     @source_chain_context
     def get_token_uris_via_erc721enumerable(self, original_address: str) -> List[tuple[int, str]]:
-        """Fetch token URIs for the given NFT contract."""
-        nft_contract = project.ERC721Enumerable.at(original_address)
-        tokenIds = []
-        token_uris = []
-        total_supply = nft_contract.totalSupply()
+        """Fetch (token id, URI) pairs for an ERC721Enumerable contract.
 
-        for i in range(total_supply):
-            tokenId = nft_contract.tokenByIndex(i)
-            tokenIds.append(tokenId)
-
-        for tokenId in tokenIds:
-            token_uris.append(nft_contract.tokenURI(tokenId))
+        Ids come from batched tokenByIndex calls and URIs from batched
+        tokenURI calls. Calls that fail are retried once; tokens that still
+        fail are logged and left out.
+        """
+        nft_contract = contract_at("ERC721Enumerable", original_address)
+        total_supply = nft_contract.totalSupply()
 
-        return list(zip(tokenIds, token_uris))
+        token_ids = self._call_with_retry(nft_contract.tokenByIndex, list(range(total_supply)))
+        token_ids = [token_id for token_id in token_ids if token_id is not None]
+
+        token_uris = self._call_with_retry(nft_contract.tokenURI, token_ids)
+        pairs = [(token_id, uri) for token_id, uri in zip(token_ids, token_uris) if uri is not None]
+        if len(pairs) < total_supply:
+            logger.warning(f"Fetched {len(pairs)} of {total_supply} enumerable token URIs for {original_address}")
+        return pairs
+
+    def _call_with_retry(self, method, args: List) -> List:
+        """Multicall ``method`` over ``args``, retrying the calls that came back empty once."""
+        results = self.multicall_engine.call(method, args)
+        missing = [i for i, result in enumerate(results) if result is None]
+        if missing:
+            logger.info(f"Retrying {len(missing)} failed calls")
+            for i, result in zip(missing, self.multicall_engine.call(method, [args[i] for i in missing])):
+                results[i] = result
+        return results
 
     @target_chain_context
     def set_token_uris_from_tuples(self, target_address: str, token_uris: List[tuple[int, str]]):
         logger.info(f"Setting token URIs for {target_address}")
-        bridge_control = project.SCCNFTBridge.at(self.bridge_control_address)
+        bridge_control = contract_at("SCCNFTBridge", self.bridge_control_address)
         txs = []
 
         if len(token_uris) == 0:
@@ -279,20 +566,15 @@ class NFTBridge:
     @target_chain_context
     def clear_bridged_storage(self, original_address: str):
         """Clear bridged storage for a collection."""
-        bridge_control = project.SCCNFTBridge.at(self.bridge_control_address)
-        return bridge_control.clearBridgedStorage(original_address, sender=self.deployer)
-
-    @target_chain_context
-    def set_token_uris(self, target_address: str, token_uris: List[str], start_from: Optional[int] = None) -> List:
-        """Set token URIs for the bridged contract with optional start index."""
-        logger.info(f"Setting token URIs for {target_address}")
-        bridge_control = project.SCCNFTBridge.at(self.bridge_control_address)
-        txs = []
-
-        if len(token_uris) == 0:
-            print(f"Token URIs list is empty for {target_address}")
-            return txs
+        bridge_control = contract_at("SCCNFTBridge", self.bridge_control_address)
+        bridged_address = bridge_control.bridgedAddressForOriginal(original_address)
+        try:
+            return bridge_control.clearBridgedStorage(original_address, sender=self.deployer)
+        finally:
+            self.collection_changed(original_address, bridged_address)
 
+    def _plan_token_uri_batches(self, target_address: str, token_uris: List[str], start_from: Optional[int] = None) -> List[Tuple[int, List[str]]]:
+        """Split a URI list into (start_id, uris) batches, skipping None entries."""
         # Let caller override start_from logic
         if start_from is None:
             start_from = 0
@@ -300,50 +582,151 @@ class NFTBridge:
                 start_from = 1
                 token_uris = token_uris[1:]
 
-        # Build batches handling None values
+        batches = []
         current_batch = []
         current_start = start_from
 
-        for i, uri in enumerate(token_uris):
-            logger.debug(f"Processing URI: {uri}")
-            if uri is None:
-                # Send current batch if we have one
-                if current_batch:
-                    chunk_size = 5 if len(current_batch[0]) > 50 or current_batch[0].startswith(DATA_PREFIX) else 100
-                    for ch in chunk(current_batch, chunk_size):
-                        logger.debug(f"Setting token URIs for {target_address} from {current_start} to {current_start + len(ch) - 1}")
-                        logger.info(f"Setting token URIs for {target_address} from {current_start} to {current_start + len(ch) - 1}")
-                        print(f"Setting token URIs for {target_address} from {current_start} to {current_start + len(ch) - 1}")
-                        tx = bridge_control.batchSetTokenURIs(
-                            target_address,
-                            current_start,
-                            ch,
-                            sender=self.deployer
-                        )
-                        txs.append(tx)
-                        current_start += len(ch)
-                    current_batch = []
-                current_start = start_from + i + 1
-                logger.info(f"Set current_start to {current_start}")
-            else:
+        for i, uri in enumerate(token_uris + [None]):
+            if uri is not None:
                 current_batch.append(uri)
-
-        # Send final batch if exists
-        if current_batch:
-            chunk_size = 5 if len(current_batch[0]) > 50 or current_batch[0].startswith(DATA_PREFIX) else 100
-            for ch in chunk(current_batch, chunk_size):
-                logger.debug(f"Setting token URIs for {target_address} from {current_start} to {current_start + len(ch) - 1}")
-                tx = bridge_control.batchSetTokenURIs(
-                    target_address,
-                    current_start,
-                    ch,
-                    sender=self.deployer
-                )
-                txs.append(tx)
+                continue
+            # A gap (or the end of the list) closes the current run
+            for ch in plan_uri_batches(current_batch, self.uri_gas_ceiling):
+                logger.info(f"Setting token URIs for {target_address} from {current_start} to {current_start + len(ch) - 1}")
+                batches.append((current_start, ch))
                 current_start += len(ch)
+            current_batch = []
+            current_start = start_from + i + 1
+
+        return batches
+
+    @timed_stage("uris")
+    @target_chain_context
+    def set_token_uris(self, target_address: str, token_uris: List[str], start_from: Optional[int] = None,
+                       job_id: Optional[int] = None) -> List:
+        """Set token URIs for the bridged contract with optional start index."""
+        logger.info(f"Setting token URIs for {target_address}")
+
+        if len(token_uris) == 0:
+            print(f"Token URIs list is empty for {target_address}")
+            return []
+
+        return self._send_batches("uris", self._token_uri_calls(target_address, token_uris, start_from), job_id)
+
+    @timed_stage("uris")
+    @target_chain_context
+    def set_token_uris_for_ids(self, target_address: str, token_uris: Mapping[int, Optional[str]],
+                               job_id: Optional[int] = None) -> List:
+        """Set the URIs of just the given token ids, batching runs of consecutive ids."""
+        token_uris = {token_id: uri for token_id, uri in token_uris.items() if uri is not None}
+        if not token_uris:
+            return []
+        first, last = min(token_uris), max(token_uris)
+        uris = [token_uris.get(token_id) for token_id in range(first, last + 1)]
+        return self._send_batches("uris", self._token_uri_calls(target_address, uris, first), job_id)
+
+    def _token_uri_calls(self, target_address: str, token_uris: List[str],
+                         start_from: Optional[int] = None) -> List[Tuple[str, list]]:
+        return [
+            ("batchSetTokenURIs", [target_address, batch_start, batch])
+            for batch_start, batch in self._plan_token_uri_batches(target_address, token_uris, start_from)
+        ]
+
+    @timed_stage("uris")
+    @target_chain_context
+    def set_token_uris_compressed(self, target_address: str, token_uris: List[str], extension: str = "",
+                                  job_id: Optional[int] = None) -> List:
+        """Set token URIs for a bridged ERC721, using its base URI where the URIs follow a pattern.
+
+        The dominant ``base/<id><extension>`` pattern is set once via setBaseURI
+        and only the outliers are written per token. ``extension`` must be the
+        extension the bridged contract was deployed with.
+        """
+        return self._send_batches("uris", self._compressed_uri_calls(target_address, token_uris, extension), job_id)
+
+    def _compressed_uri_calls(self, target_address: str, token_uris: List[str],
+                              extension: str = "") -> List[Tuple[str, list]]:
+        plan = plan_uri_writes(token_uris, 0, extension)
+        calls = []
+
+        if plan.base_uri is not None:
+            logger.info(f"Setting base URI for {target_address} to {plan.base_uri}, covering {plan.num_covered} tokens")
+            calls.append(("setBaseURI", [target_address, plan.base_uri]))
+
+        for run_start, run in plan.explicit:
+            calls.extend(
+                ("batchSetTokenURIs", [target_address, batch_start, batch])
+                for batch_start, batch in self._plan_token_uri_batches(target_address, run, run_start)
+            )
+        return calls
+
+    def _chunk_status(self, chunk: Dict) -> Optional[int]:
+        """Receipt status of a stored chunk: 1 if any of its txs succeeded, 0 if
+        they were mined but reverted, None if none of them was mined yet."""
+        web3 = self.target_session.web3 if self.target_session else networks.provider.web3
+        status = None
+        for txn_hash in chunk["tx_hashes"]:
+            try:
+                status = web3.eth.get_transaction_receipt(txn_hash)["status"]
+            except TransactionNotFound:
+                continue
+            if status == 1:
+                return status
+        return status
+
+    def _send_batches(self, stage: str, calls: List[Tuple[str, list]], job_id: Optional[int] = None) -> List:
+        """Send SCCNFTBridge calls through the tx pipeline and return their receipts.
+
+        With a job_id the call plan is checkpointed in the job store: a resumed
+        job reuses the stored plan, skips chunks whose tx already landed and
+        records every broadcast hash and nonce as it goes. A chunk whose tx was
+        sent but not mined is picked up with its stored nonce, so it is only
+        sent again with a new nonce once that nonce went to another tx.
+        """
+        bridge_control = contract_at("SCCNFTBridge", self.bridge_control_address)
+
+        if job_id is None:
+            chunks = [{"chunk_index": i, "payload": {"method": m, "args": a}, "status": "pending", "tx_hashes": []}
+                      for i, (m, a) in enumerate(calls)]
+            on_broadcast = None
+        else:
+            chunks = self.job_store.plan_chunks(job_id, stage, [{"method": m, "args": a} for m, a in calls])
+
+            def on_broadcast(item):
+                self.job_store.record_chunk(job_id, stage, item.tag, "submitted", item.txn_hashes, item.nonce)
+
+        pipeline = TxPipeline(self.deployer, depth=self.pipeline_depth, on_broadcast=on_broadcast,
+                              session=self.target_session)
+        for chunk in chunks:
+            if chunk["status"] == "confirmed":
+                continue
+            payload = chunk["payload"]
+            method = getattr(bridge_control, payload["method"])
+            if chunk["status"] == "submitted":
+                status = self._chunk_status(chunk)
+                if status == 1:
+                    logger.info(f"Chunk {chunk['chunk_index']} of {stage} already landed, skipping")
+                    self.job_store.record_chunk(job_id, stage, chunk["chunk_index"], "confirmed")
+                    continue
+                if status is None and chunk.get("nonce") is not None:
+                    logger.info(f"Chunk {chunk['chunk_index']} of {stage} was sent with nonce {chunk['nonce']}, "
+                                f"waiting for it")
+                    pipeline.adopt(method, *payload["args"], nonce=chunk["nonce"], txn_hashes=chunk["tx_hashes"],
+                                   tag=chunk["chunk_index"])
+                    continue
+            pipeline.submit(method, *payload["args"], tag=chunk["chunk_index"])
+
+        sent = list(pipeline.pending)
+        receipts = pipeline.collect()
+        if calls:
+            # Every stage is labelled with the original address, like the deploy
+            bridged_address = calls[0][1][0]
+            record_receipts(self.get_original_address(bridged_address) or bridged_address, stage, receipts)
+        if job_id is not None:
+            for item in sent:
+                self.job_store.record_chunk(job_id, stage, item.tag, "confirmed")
+        return receipts
 
-        return txs
-    
     @target_chain_context
     def set_token_uris_direct(self, target_address: str, token_uris: List[str], start_from: int = 0) -> List:
         """Set token URIs directly on the NFT contract, bypassing the bridge control."""
@@ -357,11 +740,11 @@ class NFTBridge:
         # Determine if this is ERC721 or ERC1155
         try:
             # Try to load as ERC721 first
-            nft_contract = project.ERC721.at(target_address)
+            nft_contract = contract_at("ERC721", target_address)
             is_721 = True
         except Exception:
             # If that fails, assume it's ERC1155
-            nft_contract = project.ERC1155.at(target_address)
+            nft_contract = contract_at("ERC1155", target_address)
             is_721 = False
         
         logger.info(f"Contract type: {'ERC721' if is_721 else 'ERC1155'}")
@@ -375,8 +758,7 @@ class NFTBridge:
             if uri is None:
                 # Send current batch if we have one
                 if current_batch:
-                    chunk_size = 5 if len(current_batch[0]) > 50 or current_batch[0].startswith(DATA_PREFIX) else 100
-                    for ch in chunk(current_batch, chunk_size):
+                    for ch in plan_uri_batches(current_batch, self.uri_gas_ceiling):
                         logger.debug(f"Setting token URIs directly for {target_address} from {current_start} to {current_start + len(ch) - 1}")
                         if is_721:
                             # For ERC721, set URIs one by one if needed or use batch function
@@ -403,8 +785,7 @@ class NFTBridge:
         
         # Send final batch if exists
         if current_batch:
-            chunk_size = 5 if len(current_batch[0]) > 50 or current_batch[0].startswith(DATA_PREFIX) else 100
-            for ch in chunk(current_batch, chunk_size):
+            for ch in plan_uri_batches(current_batch, self.uri_gas_ceiling):
                 logger.debug(f"Setting token URIs directly for {target_address} from {current_start} to {current_start + len(ch) - 1}")
                 if is_721:
                     # For ERC721, set URIs one by one if needed or use batch function
@@ -426,20 +807,113 @@ class NFTBridge:
         
         return txs
 
+    def get_bridged_address(self, original_address: str, confirm: bool = False) -> Optional[str]:
+        """Get the bridged contract address for an original contract.
+
+        clearBridgedStorage emits no event, so the mirror and the cache can
+        keep a bridged address that was cleared from elsewhere. Callers about
+        to deploy or rebridge pass ``confirm`` to read a known bridged address
+        from the chain again; a cleared one is then dropped from both.
+        """
+        hit, bridged_address = self.address_cache.get(BRIDGED, original_address)
+        if hit and not (confirm and bridged_address):
+            return bridged_address
+        known_address = bridged_address
+
+        # The mirror may lag behind the chain, so only trust the collections it has seen bridged
+        row = self.indexer.get(original_address)
+        if row and row["bridged_address"]:
+            if not confirm:
+                self.address_cache.link(original_address, row["bridged_address"])
+                return row["bridged_address"]
+            known_address = known_address or row["bridged_address"]
+
+        bridged_address = self._read_bridged_address(original_address)
+        if known_address and (bridged_address or "").lower() != known_address.lower():
+            logger.info(f"Bridged address {known_address} of {original_address} was cleared, now {bridged_address}")
+            self.collection_changed(original_address, known_address)
+        if bridged_address:
+            self.address_cache.link(original_address, bridged_address)
+        else:
+            self.address_cache.put(BRIDGED, original_address, None)
+        return bridged_address
+
     @target_chain_context
-    def get_bridged_address(self, original_address: str) -> Optional[str]:
-        """Get the bridged contract address for an original contract."""
-        bridge_control = project.SCCNFTBridge.at(self.bridge_control_address)
+    def _read_bridged_address(self, original_address: str) -> Optional[str]:
+        bridge_control = contract_at("SCCNFTBridge", self.bridge_control_address)
         bridged_address = bridge_control.bridgedAddressForOriginal(original_address)
         return None if bridged_address == ZERO_ADDR else bridged_address
-        
-    @target_chain_context
+
     def get_original_address(self, bridged_address: str) -> Optional[str]:
         """Get the original contract address for a bridged contract."""
-        bridge_control = project.SCCNFTBridge.at(self.bridge_control_address)
+        hit, original_address = self.address_cache.get(ORIGINAL, bridged_address)
+        if hit:
+            return original_address
+
+        row = self.indexer.find_by_bridged(bridged_address)
+        if row:
+            self.address_cache.link(row["original_address"], bridged_address)
+            return row["original_address"]
+
+        original_address = self._read_original_address(bridged_address)
+        if original_address:
+            self.address_cache.link(original_address, bridged_address)
+        else:
+            self.address_cache.put(ORIGINAL, bridged_address, None)
+        return original_address
+
+    @target_chain_context
+    def _read_original_address(self, bridged_address: str) -> Optional[str]:
+        bridge_control = contract_at("SCCNFTBridge", self.bridge_control_address)
         original_address = bridge_control.originalAddressForBridged(bridged_address)
         return None if original_address == ZERO_ADDR else original_address
 
+    def collection_changed(self, original_address: str, *addresses: Optional[str]):
+        """Drop cached lookups and refresh the mirror after this process changed a collection."""
+        self.address_cache.invalidate(original_address, *addresses)
+        try:
+            self.indexer.refresh([original_address])
+        except Exception as e:
+            logger.warning(f"Failed to refresh indexed state for {original_address}: {str(e)}")
+
+    def get_collection_state(self, address: str) -> Optional[Dict]:
+        """Indexed bridge state for a collection. Works with either original or bridged address."""
+        return self.indexer.get(address) or self.indexer.find_by_bridged(address)
+
+    @target_chain_context
+    def warm_address_cache(self, start_block: int = 0) -> int:
+        """Bulk-load address mappings for every collection ever approved for bridging.
+
+        Deploying requires approval, so the approval events name every
+        collection that can have been bridged; their mappings are then read
+        with one multicall per batch. Returns the number of bridged
+        collections cached.
+        """
+        bridge_control = contract_at("SCCNFTBridge", self.bridge_control_address)
+        stop_block = networks.provider.get_block("latest").number + 1
+        candidates = {}
+        for event in (bridge_control.CollectionOwnerBridgingApproved, bridge_control.AdminBridgingApproved):
+            for log in event.range(start_block, stop_block):
+                candidates[log.collectionAddress.lower()] = log.collectionAddress
+        logger.info(f"Warming address cache with {len(candidates)} approved collections")
+
+        num_bridged = 0
+        for addresses in chunk(list(candidates.values()), 100):
+            call = multicall.Call()
+            for address in addresses:
+                call.add(bridge_control.bridgedAddressForOriginal, address)
+                call.add(bridge_control.bridgingApproved, address)
+            results = list(call())
+            for i, address in enumerate(addresses):
+                bridged_address, approved = results[2 * i], results[2 * i + 1]
+                if bridged_address is not None and bridged_address != ZERO_ADDR:
+                    self.address_cache.link(address, bridged_address)
+                    num_bridged += 1
+                if approved:
+                    self.address_cache.put(APPROVED, address, True)
+        logger.info(f"Address cache warmed with {num_bridged} bridged collections")
+        return num_bridged
+
     def resolve_original_address(self, address: str) -> Optional[str]:
         """Resolve an address to its original address.
         
@@ -459,7 +933,18 @@ class NFTBridge:
         # Neither - could be an unbridged original address or an invalid address
         return None
         
-    @target_chain_context
+    def known_original_address(self, address: str) -> str:
+        """Original address of a collection from local state only, without any RPC.
+
+        Looks at the address cache and the indexer's mirror; an address they
+        do not know as bridged is returned unchanged.
+        """
+        hit, original_address = self.address_cache.get(ORIGINAL, address)
+        if hit:
+            return original_address or address
+        row = self.indexer.find_by_bridged(address)
+        return row["original_address"] if row else address
+
     def is_collection_approved(self, address: str) -> bool:
         """Check if the collection is approved for bridging.
         
@@ -468,10 +953,22 @@ class NFTBridge:
         original_address = self.get_original_address(address)
         if original_address:
             address = original_address
-            
-        bridge_control = project.SCCNFTBridge.at(self.bridge_control_address)
-        return bridge_control.bridgingApproved(address)
 
+        hit, approved = self.address_cache.get(APPROVED, address)
+        if not hit and (row := self.indexer.get(address)) and row["approved"]:
+            hit, approved = True, True
+            self.address_cache.put(APPROVED, address, True)
+        if not hit:
+            approved = self._read_bridging_approved(address)
+            self.address_cache.put(APPROVED, address, approved)
+        return approved
+
+    @target_chain_context
+    def _read_bridging_approved(self, original_address: str) -> bool:
+        bridge_control = contract_at("SCCNFTBridge", self.bridge_control_address)
+        return bridge_control.bridgingApproved(original_address)
+
+    @timed_stage("deploy")
     @target_chain_context
     def deploy_1155(
         self,
@@ -482,25 +979,85 @@ class NFTBridge:
         name: str
     ):
         """Deploy a bridged ERC1155 contract."""
-        bridge_control = project.SCCNFTBridge.at(self.bridge_control_address)
-        return bridge_control.deployERC1155(
-            original_address,
-            original_owner,
-            royalty_recipient,
-            royalty_bps,
-            name,
-            sender=self.deployer
-        )
+        bridge_control = contract_at("SCCNFTBridge", self.bridge_control_address)
+        try:
+            receipt = bridge_control.deployERC1155(
+                original_address,
+                original_owner,
+                royalty_recipient,
+                royalty_bps,
+                name,
+                sender=self.deployer
+            )
+            record_receipts(original_address, "deploy", [receipt])
+            return receipt
+        finally:
+            self.collection_changed(original_address)
 
     @source_chain_context
     def get_collection_owner(self, original_address: str) -> str:
         """Get the owner of the original collection."""
-        nft_contract = project.ERC721.at(original_address)
+        nft_contract = contract_at("ERC721", original_address)
         try:
             return nft_contract.owner()
         except Exception:
             return ZERO_ADDR
 
+    @source_chain_context
+    def _read_collection_onchain(self, original_address: str) -> Tuple[Dict, str, str, str, str, str, bool]:
+        """Read royalty, owner, metadata and interface support from the source chain with a single probe."""
+        profile = self.probe_collection(original_address)
+        return (profile.royalty_data, profile.owner, profile.name, profile.symbol,
+                profile.base_uri, profile.extension, profile.is_erc1155)
+
+    @timed_stage("snapshot")
+    def get_collection_snapshot(self, address: str) -> CollectionSnapshot:
+        """Fetch holders, royalty, owner and collection data for a collection concurrently.
+
+        The PaintSwap requests run on a thread pool while the source chain is
+        read, so the whole stage costs roughly the slowest single fetch.
+        Holders are always fetched fresh since they are what gets minted;
+        collection data may come from the cache. Works with either original
+        or bridged address.
+        """
+        original_address = self.get_original_address(address) or address
+        logger.info(f"Taking collection snapshot of {original_address}")
+
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="snapshot") as pool:
+            collection_future = pool.submit(self._fetch_collection_data_api, original_address)
+            if self.holder_source == "chain":
+                # A copy of the context keeps the log scan's RPC requests in any active profile
+                holders_future = pool.submit(copy_context().run, self._scan_holder_logs, original_address)
+            else:
+                holders_future = pool.submit(
+                    lambda: self._fetch_holders_via_api(
+                        original_address,
+                        int((collection_future.result().get("stats") or {}).get("totalNFTs") or 0),
+                        max_age=0,
+                    )
+                )
+            royalty_data, original_owner, name, symbol, base_uri, extension, is_erc1155 = \
+                self._read_collection_onchain(original_address)
+            holders = holders_future.result()
+            collection_data = collection_future.result()
+
+        if self.holder_source == "chain":
+            holders = self._holders_from_logs(original_address, holders)
+
+        return CollectionSnapshot(
+            original_address=original_address,
+            holders=MappingProxyType(holders),
+            collection_data=MappingProxyType(collection_data),
+            royalty_data=MappingProxyType(royalty_data),
+            original_owner=original_owner,
+            name=name,
+            symbol=symbol,
+            base_uri=base_uri,
+            extension=extension,
+            is_erc1155=is_erc1155,
+        )
+
+    @timed_stage("deploy")
     @target_chain_context
     def deploy_721(
         self,
@@ -514,7 +1071,7 @@ class NFTBridge:
         bps: int
     ):
         """Deploy a bridged ERC721 contract."""
-        bridge_control = project.SCCNFTBridge.at(self.bridge_control_address)
+        bridge_control = contract_at("SCCNFTBridge", self.bridge_control_address)
         logger.debug(f"bridge_control_address: {self.bridge_control_address}")
         enumerable = self.is_enumerable(original_address)
         # log all arguments
@@ -532,20 +1089,35 @@ class NFTBridge:
         approved = bridge_control.bridgingApproved(original_address)
         logger.debug(f"approved: {approved}")
 
-        return bridge_control.deployERC721(
-            original_address,
-            original_owner,
-            name,
-            symbol,
-            base_uri,
-            extension,
-            recipient,
-            bps,
-            enumerable,
-            sender=self.deployer
-        )
+        try:
+            receipt = bridge_control.deployERC721(
+                original_address,
+                original_owner,
+                name,
+                symbol,
+                base_uri,
+                extension,
+                recipient,
+                bps,
+                enumerable,
+                sender=self.deployer
+            )
+            record_receipts(original_address, "deploy", [receipt])
+            return receipt
+        finally:
+            self.collection_changed(original_address)
+
+    def get_holders(self, address: str, max_age: Optional[float] = None) -> Dict[str, AirdropUnit]:
+        """Get token holders from the configured holder source.
 
-    def get_holders_via_api(self, address: str) -> Dict[str, AirdropUnit]:
+        ``max_age`` bounds the age of cached PaintSwap pages; pass 0 when the
+        holders are about to be minted.
+        """
+        if self.holder_source == "chain":
+            return self.get_holders_onchain(address)
+        return self.get_holders_via_api(address, max_age)
+
+    def get_holders_via_api(self, address: str, max_age: Optional[float] = None) -> Dict[str, AirdropUnit]:
         """Get token holders from PaintSwap API.
         
         Works with either original or bridged address.
@@ -554,103 +1126,489 @@ class NFTBridge:
         original_address = self.get_original_address(address)
         if original_address:
             address = original_address
-            
-        num_to_skip = 0
-        done = False
-        holders_dict = {}
 
-        while not done:
-            url = f"https://api.paintswap.finance/v2/userNFTs?requireUser=false&collections={address}&numToSkip={num_to_skip}&numToFetch=1000&orderBy=tokenId"
-            response = requests.get(url, timeout=60)
-            data = response.json()
+        return self._fetch_holders_via_api(address, max_age=max_age)
 
-            try:
-                nfts = data["nfts"]
-            except KeyError:
-                print(f"Error fetching data: {data}")
-                raise
-
-            if len(nfts) < 1000:
-                done = True
-
-            for nft_data in nfts:
-                holder = nft_data["user"]
-                token_id = nft_data["tokenId"]
-                amount = nft_data["amount"]
-                is_erc721 = nft_data["isERC721"]
-
-                if holder not in holders_dict:
-                    holders_dict[holder] = AirdropUnit(
-                        holder,
-                        [token_id],
-                        [amount],
-                        is_erc721,
-                        data="",
-                    )
-                else:
-                    holders_dict[holder].token_ids.append(token_id)
-                    holders_dict[holder].amounts.append(amount)
+    def get_holders_onchain(self, address: str, block_number: Optional[int] = None) -> Dict[str, AirdropUnit]:
+        """Get token holders at a block from the source collection's transfer logs.
+
+        Same result shape as get_holders_via_api, without depending on the
+        PaintSwap API. Works with either original or bridged address.
+        """
+        original_address = self.get_original_address(address) or address
+        return self._holders_from_logs(original_address, self._scan_holder_logs(original_address, block_number))
+
+    def _scan_holder_logs(self, original_address: str, block_number: Optional[int] = None) -> HolderSnapshot:
+        """Fold the source collection's transfer logs. Only uses the pooled source web3, so any thread may call it."""
+        session = self.source_session or source_session()
+        return LogHolderScanner(session.web3).snapshot(original_address, block_number)
+
+    def _holders_from_logs(self, original_address: str, snapshot: HolderSnapshot) -> Dict[str, AirdropUnit]:
+        """Airdrop units from a log snapshot, sweeping ownerOf instead for an ERC721 that emitted no logs."""
+        if snapshot.num_logs == 0 and not self.is_erc1155(original_address):
+            logger.warning(f"No transfer logs found for {original_address}, sweeping ownerOf instead")
+            snapshot = self._sweep_owners(original_address)
+
+        is721 = snapshot.is721 if snapshot.is721 is not None else not self.is_erc1155(original_address)
+        return {
+            holder: AirdropUnit(
+                holder,
+                [token_id for token_id, _ in tokens],
+                [amount for _, amount in tokens],
+                is721,
+                data="",
+            )
+            for holder, tokens in snapshot.holdings().items()
+        }
 
-            num_to_skip += 1000
+    @source_chain_context
+    def _sweep_owners(self, original_address: str) -> HolderSnapshot:
+        """ERC721 ownership read token by token with batched ownerOf multicalls; a failed read raises."""
+        block_number = networks.provider.get_block("latest").number
+        nft_contract = contract_at("ERC721", original_address)
+        total_supply = self.get_total_supply(original_address)
+        owners = self.multicall_engine.scan(nft_contract.ownerOf, 0, total_supply + 1, URI_GAP_TOLERANCE, strict=True)
+        return HolderSnapshot(
+            is721=True,
+            block_number=block_number,
+            owners={token_id: owner for token_id, owner in enumerate(owners) if owner not in (None, ZERO_ADDR)},
+        )
 
-        return holders_dict
+    def _fetch_holders_page(self, address: str, num_to_skip: int, max_age: Optional[float] = None) -> List[Dict]:
+        return self.paintswap.user_nfts_page(address, num_to_skip, max_age=max_age)
 
     @staticmethod
-    def _chunk_airdrop_units(airdrop_units: List[AirdropUnit], n: int):
-        """Chunk airdrop units based on token IDs."""
-        num_consumed = 0
-        while num_consumed < len(airdrop_units):
-            total_this_chunk = 0
-            to_return = []
-
-            for i in range(num_consumed, len(airdrop_units)):
-                current_length = len(airdrop_units[i].token_ids)
-                if total_this_chunk + current_length > n:
-                    # If we can't add even one item, add it anyway to avoid infinite loop
-                    if len(to_return) == 0:
-                        to_return.append(airdrop_units[i])
-                    break
-                total_this_chunk += current_length
-                to_return.append(airdrop_units[i])
-
-            if not to_return:  # Additional safety check
-                break
-
-            num_consumed += len(to_return)
-            yield to_return
+    def _aggregate_holders(holders_dict: Dict[str, AirdropUnit], nfts: List[Dict]):
+        """Fold one page of PaintSwap NFT entries into per-holder airdrop units.
 
-    @target_chain_context
-    def airdrop_holders(self, bridged_address: str, holders: List[AirdropUnit]) -> List:
-        """Airdrop tokens to holders."""
-        bridge_control = project.SCCNFTBridge.at(self.bridge_control_address)
-        is721 = holders[0].is721
-        txs = []
+        The API serves token ids and amounts as decimal strings; they are stored as ints.
+        """
+        for nft_data in nfts:
+            holder = nft_data["user"]
+            token_id = int(nft_data["tokenId"])
+            amount = int(nft_data["amount"])
+            is_erc721 = nft_data["isERC721"]
+
+            if holder not in holders_dict:
+                holders_dict[holder] = AirdropUnit(
+                    holder,
+                    [token_id],
+                    [amount],
+                    is_erc721,
+                    data="",
+                )
+            else:
+                holders_dict[holder].token_ids.append(token_id)
+                holders_dict[holder].amounts.append(amount)
+
+    def _fetch_holders_via_api(self, address: str, total_nfts: Optional[int] = None,
+                               max_age: Optional[float] = None) -> Dict[str, AirdropUnit]:
+        """Fetch all holder pages, requesting the expected pages in parallel.
+
+        The page count comes from the collection's ``stats.totalNFTs``; pages
+        are folded into the result as they arrive. If the stats lag behind and
+        the last expected page is full, the remaining pages are walked serially.
+        Pages are taken from the PaintSwap cache if younger than ``max_age``.
+        """
+        if total_nfts is None:
+            stats = self._fetch_collection_data_api(address).get("stats") or {}
+            total_nfts = int(stats.get("totalNFTs") or 0)
+
+        num_pages = max(1, -(-total_nfts // HOLDERS_PAGE_SIZE))
+        holders_dict = {}
 
-        for item_chunk in self._chunk_airdrop_units(holders, 50):
+        with ThreadPoolExecutor(max_workers=min(HOLDERS_FETCH_CONCURRENCY, num_pages), thread_name_prefix="holders") as pool:
+            futures = [
+                pool.submit(self._fetch_holders_page, address, page * HOLDERS_PAGE_SIZE, max_age)
+                for page in range(num_pages)
+            ]
+            for future in as_completed(futures):
+                self._aggregate_holders(holders_dict, future.result())
+            done = len(futures[-1].result()) < HOLDERS_PAGE_SIZE
+
+        num_to_skip = num_pages * HOLDERS_PAGE_SIZE
+        while not done:
+            nfts = self._fetch_holders_page(address, num_to_skip, max_age)
+            self._aggregate_holders(holders_dict, nfts)
+            done = len(nfts) < HOLDERS_PAGE_SIZE
+            num_to_skip += HOLDERS_PAGE_SIZE
+
+        # Pages complete out of order, restore tokenId order within each holder
+        for unit in holders_dict.values():
+            pairs = sorted(zip(unit.token_ids, unit.amounts), key=lambda pair: int(pair[0]))
+            unit.token_ids = [token_id for token_id, _ in pairs]
+            unit.amounts = [amount for _, amount in pairs]
+
+        logger.info(f"Fetched {len(holders_dict)} holders for {address} over {num_to_skip // HOLDERS_PAGE_SIZE} pages")
+        return holders_dict
+
+    @timed_stage("airdrop")
+    @target_chain_context
+    def airdrop_holders(self, bridged_address: str, holders: List[AirdropUnit], job_id: Optional[int] = None) -> List:
+        """Airdrop tokens to holders, checkpointing each chunk when a job_id is given."""
+        if not holders:
+            return []
+        calls, batches = self.airdrop_calls(bridged_address, holders)
+        receipts = self._send_batches("airdrop", calls, job_id)
+        if len(receipts) == len(batches):
+            self._observe_airdrop_gas(holders[0].is721, batches, receipts)
+        return receipts
+
+    def airdrop_calls(self, bridged_address: str,
+                      holders: List[AirdropUnit]) -> Tuple[List[Tuple[str, list]], List[List[AirdropUnit]]]:
+        """SCCNFTBridge airdrop calls for the holders, with the batches they were built from."""
+        if not holders:
+            return [], []
+        bridge_control = contract_at("SCCNFTBridge", self.bridge_control_address)
+        method_name = "airdrop721" if holders[0].is721 else "airdrop1155"
+        calls = []
+
+        batches = self._plan_airdrop_batches(getattr(bridge_control, method_name), bridged_address, holders)
+        for item_chunk in batches:
             airdrop_units: List[AirdropUnit] = [holder.to_args() for holder in item_chunk]
             logger.info(f"Airdropping {len(airdrop_units)} units to {bridged_address}")
             logger.info(f"Units: {airdrop_units}")
-            if is721:
-                tx = bridge_control.airdrop721(
-                    bridged_address,
-                    airdrop_units,
-                    sender=self.deployer
-                )
+            calls.append((method_name, [bridged_address, airdrop_units]))
+        return calls, batches
+
+    def deploy_call(self, snapshot: CollectionSnapshot, original_owner: Optional[str] = None) -> Tuple[str, list]:
+        """SCCNFTBridge deploy call for a snapshotted collection."""
+        original_owner = original_owner or snapshot.original_owner
+        recipient = snapshot.royalty_data["recipient"]
+        fee = snapshot.royalty_data["fee"]
+        if snapshot.is721:
+            return ("deployERC721", [
+                snapshot.original_address, original_owner, snapshot.name, snapshot.symbol, snapshot.base_uri,
+                snapshot.extension, recipient, fee, self.is_enumerable(snapshot.original_address),
+            ])
+        return ("deployERC1155", [snapshot.original_address, original_owner, recipient, fee, snapshot.name])
+
+    def snapshot_uris(self, snapshot: CollectionSnapshot) -> List[str]:
+        """Source token URIs a copy of the snapshotted collection needs set; none if it has a base URI."""
+        if snapshot.is721 and snapshot.base_uri != "":
+            return []
+        return self.get_token_uris(snapshot.original_address, is721=snapshot.is721,
+                                   max_token_id=snapshot.max_token_id)
+
+    def with_uri_pattern(self, snapshot: CollectionSnapshot, uris: List[Optional[str]]) -> CollectionSnapshot:
+        """The snapshot with the extension of the dominant pattern of its fetched URIs.
+
+        An ERC721 without a base URI from token 1 would otherwise be deployed
+        without an extension, and none of its URIs could be compressed into
+        setBaseURI. Call this before deploying.
+        """
+        if not snapshot.is721 or snapshot.base_uri != "":
+            return snapshot
+        pattern = detect_uri_pattern(uris)
+        if pattern is None:
+            return snapshot
+        base_uri, extension = pattern
+        logger.info(f"URIs of {snapshot.original_address} follow {base_uri}<id>{extension}")
+        return replace(snapshot, extension=extension)
+
+    def snapshot_uri_calls(self, snapshot: CollectionSnapshot, bridged_address: str,
+                           uris: List[str]) -> List[Tuple[str, list]]:
+        """URI calls setting ``uris``, from snapshot_uris, on a freshly deployed copy of the collection."""
+        if not uris:
+            return []
+        if snapshot.is721:
+            return self._compressed_uri_calls(bridged_address, uris, snapshot.extension)
+        return self._token_uri_calls(bridged_address, uris)
+
+    def _plan_airdrop_batches(self, method, bridged_address: str, holders: List[AirdropUnit]) -> List[List[AirdropUnit]]:
+        """Pack holders into batches sized to a fraction of the block gas limit."""
+        is721 = holders[0].is721
+        if is721 not in self._airdrop_gas_models:
+            self._airdrop_gas_models[is721] = calibrate_airdrop_gas(method, bridged_address, holders, self.deployer)
+        model = self._airdrop_gas_models[is721]
+        gas_budget = block_gas_budget(self.airdrop_gas_fraction)
+        batches = plan_airdrop_batches(holders, model, gas_budget)
+        logger.info(f"Planned {len(batches)} airdrop batches for {len(holders)} holders with a {gas_budget} gas budget")
+        return batches
+
+    def _observe_airdrop_gas(self, is721: bool, batches: List[List[AirdropUnit]], receipts: List):
+        """Rescale the gas model by how far its estimates were from the gas actually used."""
+        model = self._airdrop_gas_models.get(is721)
+        if model is None or not receipts:
+            return
+        estimated = sum(model.estimate(batch) for batch in batches)
+        used = sum(receipt.gas_used for receipt in receipts)
+        if estimated > 0 and used > 0:
+            self._airdrop_gas_models[is721] = model.scaled(used / estimated)
+
+    def _bridged_transfer_logs(self, original_address: str, bridged_address: str, is721: bool) -> List:
+        """Every transfer log of a bridged collection since it was bridged."""
+        bridge_control = contract_at("SCCNFTBridge", self.bridge_control_address)
+        start_block = bridge_control.blockNumberBridged(original_address)
+        stop_block = networks.provider.get_block("latest").number + 1
+        if is721:
+            return list(contract_at("ERC721", bridged_address).Transfer.range(start_block, stop_block))
+        nft_contract = contract_at("ERC1155", bridged_address)
+        return (list(nft_contract.TransferSingle.range(start_block, stop_block))
+                + list(nft_contract.TransferBatch.range(start_block, stop_block)))
+
+    @target_chain_context
+    def get_bridged_owners_721(self, original_address: str, bridged_address: str,
+                               token_ids: Iterable[int] = ()) -> Dict[int, str]:
+        """Owner of every existing bridged ERC721 token.
+
+        Candidate ids are ``token_ids`` plus every id seen in the bridged
+        contract's Transfer logs; their owners are read with batched ownerOf
+        multicalls and ids that do not exist (anymore), i.e. whose ownerOf
+        reverts, are left out. Any other failed read raises.
+        """
+        token_ids = {int(token_id) for token_id in token_ids}
+        token_ids.update(int(log.id) for log in self._bridged_transfer_logs(original_address, bridged_address, True))
+        token_ids = sorted(token_ids)
+
+        nft_contract = contract_at("ERC721", bridged_address)
+        owners = self.multicall_engine.call(nft_contract.ownerOf, token_ids, strict=True)
+        return {
+            token_id: owner
+            for token_id, owner in zip(token_ids, owners)
+            if owner is not None and owner != ZERO_ADDR
+        }
+
+    @target_chain_context
+    def get_bridged_balances_1155(self, original_address: str, bridged_address: str,
+                                  holdings: Iterable[Tuple[str, int]] = ()) -> Tuple[Holdings1155, Dict[str, str]]:
+        """Non-zero balances of a bridged ERC1155 collection.
+
+        Candidate (holder, id) pairs are ``holdings`` plus every recipient and
+        id in the bridged contract's transfer logs, read with balanceOfBatch
+        multicalls. Returns the balances keyed by (lowercased holder, id) and
+        a map from lowercased to checksummed holder addresses.
+        """
+        addresses = {}
+        keys = set()
+        for holder, token_id in holdings:
+            addresses.setdefault(holder.lower(), holder)
+            keys.add((holder.lower(), int(token_id)))
+        for log in self._bridged_transfer_logs(original_address, bridged_address, False):
+            token_ids = [log.id] if log.event_name == "TransferSingle" else log.ids
+            addresses.setdefault(log.to.lower(), log.to)
+            keys.update((log.to.lower(), int(token_id)) for token_id in token_ids)
+        batches = list(chunk(sorted(key for key in keys if key[0] != ZERO_ADDR.lower()), BALANCE_BATCH_SIZE))
+
+        nft_contract = contract_at("ERC1155", bridged_address)
+        results = self.multicall_engine.call(
+            nft_contract.balanceOfBatch,
+            [([addresses[holder] for holder, _ in batch], [token_id for _, token_id in batch]) for batch in batches],
+        )
+        balances: Holdings1155 = {}
+        for batch, amounts in zip(batches, results):
+            if amounts is None:
+                raise RuntimeError(f"Failed to read balances of {bridged_address}")
+            balances.update((key, int(amount)) for key, amount in zip(batch, amounts) if amount)
+        return balances, addresses
+
+    def plan_reconcile(self, original_address: str, bridged_address: str,
+                       holders: Mapping[str, AirdropUnit]) -> ReconcilePlan:
+        """Diff the source holders against the bridged collection's current ownership.
+
+        ERC1155 burns are moved to ``skipped_burns1155`` if the bridged
+        contract has burning disabled, since they would revert.
+        """
+        if not self.is_erc1155(original_address):
+            desired = desired_721(holders)
+            current = self.get_bridged_owners_721(original_address, bridged_address, desired)
+            return diff_721(desired, current)
+
+        desired = desired_1155(holders)
+        current, addresses = self.get_bridged_balances_1155(
+            original_address, bridged_address, [(unit.address, token_id) for unit in holders.values()
+                                                for token_id in unit.token_ids]
+        )
+        plan = diff_1155(desired, current, addresses)
+        if plan.burns1155 and not contract_at("ERC1155", bridged_address).burningEnabled():
+            logger.warning(f"Burning is disabled on {bridged_address}, skipping {len(plan.burns1155)} burns")
+            plan.skipped_burns1155, plan.burns1155 = plan.burns1155, []
+        return plan
+
+    def _reconcile_calls(self, bridged_address: str, plan: ReconcilePlan) -> List[Tuple[str, list]]:
+        """Minimal SCCNFTBridge calls for a reconcile plan, burns first.
+
+        A lone token goes out as mint721/mint1155; more than one is packed
+        into gas-sized airdrop batches, which mint the same way (an ERC721
+        airdrop of an existing id reassigns it) in far fewer transactions.
+        """
+        calls = [("burn721", [bridged_address, batch]) for batch in self._plan_burn_batches(bridged_address, plan.burns721)]
+        calls += [("burn1155", [bridged_address, holder, token_id, amount])
+                  for holder, token_id, amount in plan.burns1155]
+
+        if plan.num_mints == 1:
+            (to, [(token_id, amount)]), = plan.mints.items()
+            if plan.is721:
+                calls.append(("mint721", [bridged_address, to, token_id]))
             else:
-                tx = bridge_control.airdrop1155(
-                    bridged_address,
-                    airdrop_units,
-                    sender=self.deployer
-                )
-            txs.append(tx)
+                calls.append(("mint1155", [bridged_address, to, token_id, amount, ""]))
+        elif plan.mints:
+            units = [
+                AirdropUnit(to, [token_id for token_id, _ in tokens], [amount for _, amount in tokens], plan.is721)
+                for to, tokens in plan.mints.items()
+            ]
+            calls += self.airdrop_calls(bridged_address, units)[0]
+        return calls
+
+    def _plan_burn_batches(self, bridged_address: str, token_ids: List[int]) -> List[List[int]]:
+        """Split ERC721 ids into burn721 batches sized to a fraction of the block gas limit."""
+        if not token_ids:
+            return []
+        if self._burn_gas_model is None:
+            bridge_control = contract_at("SCCNFTBridge", self.bridge_control_address)
+            self._burn_gas_model = calibrate_burn_gas(bridge_control.burn721, bridged_address, token_ids,
+                                                      self.deployer)
+        gas_budget = block_gas_budget(self.airdrop_gas_fraction)
+        batches = plan_burn_batches(token_ids, self._burn_gas_model, gas_budget)
+        logger.info(f"Planned {len(batches)} burn batches for {len(token_ids)} tokens with a {gas_budget} gas budget")
+        return batches
+
+    @timed_stage("remint")
+    @target_chain_context
+    def reconcile_holders(self, original_address: str, bridged_address: str, holders: Mapping[str, AirdropUnit],
+                          job_id: Optional[int] = None) -> Tuple[ReconcilePlan, List]:
+        """Bring the bridged collection's ownership in line with ``holders``.
 
-        return txs
+        Only tokens that are missing, owned by someone else or no longer held
+        on the source chain are touched. Returns the plan and the receipts of
+        the transactions it took.
+        """
+        plan = self.plan_reconcile(original_address, bridged_address, holders)
+        if plan.is_empty:
+            logger.info(f"{bridged_address} already matches the holders of {original_address}")
+            return plan, []
+        calls = self._reconcile_calls(bridged_address, plan)
+        logger.info(f"Reconciling {bridged_address} with {len(calls)} txs")
+        return plan, self._send_batches("remint", calls, job_id)
+
+    def _reclaim_calls(self, original_address: str, bridged_address: str, is721: bool) -> List[Tuple[str, list]]:
+        """Burn calls for every token the bridged collection currently has."""
+        if is721:
+            token_ids = sorted(self.get_bridged_owners_721(original_address, bridged_address))
+            return [("burn721", [bridged_address, batch]) for batch in self._plan_burn_batches(bridged_address, token_ids)]
+
+        if not contract_at("ERC1155", bridged_address).burningEnabled():
+            raise RuntimeError(f"Burning is disabled on {bridged_address}, its tokens cannot be reclaimed")
+        balances, addresses = self.get_bridged_balances_1155(original_address, bridged_address)
+        return [("burn1155", [bridged_address, addresses[holder], token_id, amount])
+                for (holder, token_id), amount in sorted(balances.items())]
+
+    def _count_bridged_tokens(self, original_address: str, bridged_address: str, is721: bool) -> int:
+        """Tokens (ERC721) or non-zero balances (ERC1155) left on a bridged collection; raises if they cannot be read."""
+        if is721:
+            return len(self.get_bridged_owners_721(original_address, bridged_address))
+        return len(self.get_bridged_balances_1155(original_address, bridged_address)[0])
+
+    @timed_stage("reclaim")
+    @target_chain_context
+    def reclaim_collection(self, original_address: str, bridged_address: str,
+                           job_id: Optional[int] = None) -> List:
+        """Burn every token of a bridged collection and check that none are left.
+
+        Ownership is read from the bridged contract itself, not the PaintSwap
+        API, so tokens minted there by any earlier airdrop are found. ERC721
+        ids are burned in gas-sized burn721 batches; ERC1155 balances with one
+        burn1155 each, pipelined. Failing to read the ownership raises rather
+        than counting as nothing left. Returns the burn receipts.
+        """
+        is721 = not self.is_erc1155(original_address)
+        calls = self._reclaim_calls(original_address, bridged_address, is721)
+        logger.info(f"Reclaiming {bridged_address} with {len(calls)} burn txs")
+        receipts = self._send_batches("reclaim", calls, job_id) if calls else []
+
+        remaining = self._count_bridged_tokens(original_address, bridged_address, is721)
+        if remaining:
+            raise RuntimeError(f"{remaining} tokens are still held on {bridged_address} after reclaiming")
+        logger.info(f"Reclaimed every token of {bridged_address}")
+        return receipts
+
+    def bridge_collection(self, snapshot: CollectionSnapshot, job_id: Optional[int] = None) -> Dict:
+        """Deploy, airdrop and set URIs for a snapshotted collection as a checkpointed job.
+
+        Passing the id of an interrupted job resumes it: the deployment is
+        reused if it exists and only unconfirmed chunks are sent again.
+        """
+        original_address = snapshot.original_address
+        if job_id is None:
+            job_id = self.job_store.create_job("bridge", original_address, snapshot.original_owner)
+        job = self.job_store.get_job(job_id)
+        is721 = snapshot.is721
+        result = {"job_id": job_id, "original_address": original_address}
+
+        # Claimed in the database, which the bot and the API worker share
+        self.job_store.claim(job_id)
+        try:
+            # Read before deploying, so the ERC721 is deployed with the extension its URIs use
+            uris = None
+            if not is721 or snapshot.base_uri == "":
+                uris = self.get_token_uris(original_address, is721=is721, max_token_id=snapshot.max_token_id)
+                snapshot = self.with_uri_pattern(snapshot, uris)
+
+            bridged_address = job["bridged_address"] or self.get_bridged_address(original_address, confirm=True)
+            if not bridged_address:
+                self.job_store.set_stage(job_id, "deploy")
+                recipient = snapshot.royalty_data["recipient"]
+                fee = snapshot.royalty_data["fee"]
+                if is721:
+                    deployment_tx = self.deploy_721(
+                        original_address, snapshot.original_owner, snapshot.name, snapshot.symbol,
+                        snapshot.base_uri, snapshot.extension, recipient, fee
+                    )
+                else:
+                    deployment_tx = self.deploy_1155(
+                        original_address, snapshot.original_owner, recipient, fee, snapshot.name
+                    )
+                self.job_store.update_job(job_id, deployment_tx=deployment_tx.txn_hash)
+                bridged_address = self.get_bridged_address(original_address)
+                if not bridged_address:
+                    raise RuntimeError("Failed to deploy contract to target chain")
+            self.job_store.update_job(job_id, bridged_address=bridged_address)
+            result["bridged_address"] = bridged_address
+            result["deployment_tx"] = self.job_store.get_job(job_id)["deployment_tx"]
+
+            self.job_store.set_stage(job_id, "airdrop")
+            airdrop_units = snapshot.airdrop_units
+            airdrop_txs = self.airdrop_holders(bridged_address, airdrop_units, job_id) if airdrop_units else []
+            result["airdrop_txs"] = [tx.txn_hash for tx in airdrop_txs]
+
+            if uris is not None:
+                self.job_store.set_stage(job_id, "uris")
+                if is721:
+                    uri_txs = self.set_token_uris_compressed(bridged_address, uris, snapshot.extension, job_id=job_id)
+                else:
+                    uri_txs = self.set_token_uris(bridged_address, uris, job_id=job_id)
+                result["uri_txs"] = [tx.txn_hash for tx in uri_txs]
+
+            self.job_store.set_stage(job_id, "done", status="done")
+        except Exception as e:
+            logger.error(f"Bridge job {job_id} for {original_address} failed: {str(e)}", exc_info=True)
+            self.job_store.update_job(job_id, status="failed", error=str(e))
+            raise
+
+        return result
+
+    def resume_bridge(self, address: str) -> Dict:
+        """Resume the latest unfinished bridge job for a collection.
+
+        Works with either original or bridged address.
+        """
+        original_address = self.get_original_address(address) or address
+        job = self.job_store.latest_unfinished_job(original_address)
+        if job is None:
+            raise ValueError(f"No unfinished bridge job for {original_address}")
+
+        logger.info(f"Resuming bridge job {job['id']} for {original_address} from stage {job['stage']}")
+        snapshot = self.get_collection_snapshot(job["original_address"])
+        return self.bridge_collection(snapshot, job["id"])
 
     @target_chain_context
     def admin_set_bridging_approved(self, collection_address: str, approved: bool):
         """Approve or disapprove bridging for a collection."""
-        bridge_control = project.SCCNFTBridge.at(self.bridge_control_address)
-        return bridge_control.adminSetBridgingApproved(collection_address, approved, sender=self.deployer)
+        bridge_control = contract_at("SCCNFTBridge", self.bridge_control_address)
+        try:
+            return bridge_control.adminSetBridgingApproved(collection_address, approved, sender=self.deployer)
+        finally:
+            self.collection_changed(collection_address)
         
     @target_chain_context
     def transfer_ownership(self, collection_address: str, new_owner: str):
@@ -672,7 +1630,7 @@ class NFTBridge:
         # Load the contract using its Ownable interface
         try:
             # Any contract with Ownable functionality will work here
-            ownable_contract = project.ERC721.at(collection_address)
+            ownable_contract = contract_at("ERC721", collection_address)
             
             # Verify that we are the current owner
             current_owner = ownable_contract.owner()
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+import logging
+import random
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .constants import (
+    PAINTSWAP_API_URL,
+    HOLDERS_PAGE_SIZE,
+    HOLDERS_FETCH_CONCURRENCY,
+    PAINTSWAP_RATE_LIMIT,
+    PAINTSWAP_BURST,
+    PAINTSWAP_MAX_RETRIES,
+    PAINTSWAP_CACHE_TTL,
+    PAINTSWAP_CACHE_MAX_ENTRIES,
+)
+from .metrics import PAINTSWAP_CACHE, PAINTSWAP_SECONDS
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Thread-safe token bucket: ``rate`` requests per second with bursts of up to ``burst``."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+@dataclass
+class CachedResponse:
+    data: Any
+    etag: Optional[str]
+    fetched_at: float
+
+
+class PaintSwapClient:
+    """PaintSwap API client shared by everything that talks to the API.
+
+    Requests go over one keep-alive session with gzip negotiated, pass a
+    token-bucket rate limiter, and are retried with jittered exponential
+    backoff on connection errors, 429s (honouring Retry-After) and 5xx.
+    Successful JSON responses are cached per URL for ``cache_ttl`` seconds;
+    once stale they are revalidated with If-None-Match when the API sent an
+    ETag. Returned data is shared with the cache and must not be mutated.
+    """
+
+    def __init__(
+        self,
+        base_url: str = PAINTSWAP_API_URL,
+        rate: float = PAINTSWAP_RATE_LIMIT,
+        burst: int = PAINTSWAP_BURST,
+        max_retries: int = PAINTSWAP_MAX_RETRIES,
+        cache_ttl: float = PAINTSWAP_CACHE_TTL,
+        max_cache_entries: int = PAINTSWAP_CACHE_MAX_ENTRIES,
+        pool_size: int = HOLDERS_FETCH_CONCURRENCY,
+        timeout: float = 60,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.max_retries = max_retries
+        self.cache_ttl = cache_ttl
+        self.max_cache_entries = max_cache_entries
+        self.timeout = timeout
+        self.limiter = TokenBucket(rate, burst)
+        self.http = requests.Session()
+        self.http.headers.update({"Accept": "application/json", "Accept-Encoding": "gzip, deflate"})
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.http.mount("https://", adapter)
+        self.http.mount("http://", adapter)
+        self._cache: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _cached(self, url: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._cache.get(url)
+            if entry is not None:
+                self._cache.move_to_end(url)
+            return entry
+
+    def _store(self, url: str, entry: CachedResponse):
+        with self._lock:
+            self._cache[url] = entry
+            self._cache.move_to_end(url)
+            while len(self._cache) > self.max_cache_entries:
+                self._cache.popitem(last=False)
+
+    def _backoff(self, attempt: int, response: Optional[requests.Response] = None) -> float:
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+        return min(30.0, 0.5 * 2 ** attempt) * random.uniform(0.5, 1.5)
+
+    def _request(self, url: str, endpoint: str, headers: Dict[str, str]) -> requests.Response:
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire()
+            start = time.perf_counter()
+            try:
+                response = self.http.get(url, headers=headers, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                PAINTSWAP_SECONDS.labels(endpoint, "error").observe(time.perf_counter() - start)
+                if attempt == self.max_retries:
+                    raise
+                delay = self._backoff(attempt)
+                logger.warning(f"PaintSwap request {url} failed ({str(e)}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+                continue
+
+            PAINTSWAP_SECONDS.labels(endpoint, str(response.status_code)).observe(time.perf_counter() - start)
+            if response.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                return response
+            delay = self._backoff(attempt, response)
+            logger.warning(f"PaintSwap returned {response.status_code} for {url}, retrying in {delay:.1f}s")
+            time.sleep(delay)
+        raise AssertionError("unreachable")
+
+    def get_json(self, path: str, max_age: Optional[float] = None) -> Any:
+        """GET ``base_url + path`` as JSON, served from the cache when younger than ``max_age`` seconds."""
+        url = f"{self.base_url}{path}"
+        # "/v2/collections/0x.." -> "collections", "/v2/userNFTs?.." -> "userNFTs"
+        endpoint = path.split("?")[0].strip("/").split("/")[1]
+        max_age = self.cache_ttl if max_age is None else max_age
+        entry = self._cached(url)
+        if entry is not None and time.time() - entry.fetched_at < max_age:
+            PAINTSWAP_CACHE.labels(endpoint, "hit").inc()
+            return entry.data
+
+        headers = {"If-None-Match": entry.etag} if entry is not None and entry.etag else {}
+        response = self._request(url, endpoint, headers)
+        if response.status_code == 304 and entry is not None:
+            PAINTSWAP_CACHE.labels(endpoint, "revalidated").inc()
+            self._store(url, CachedResponse(entry.data, entry.etag, time.time()))
+            return entry.data
+
+        PAINTSWAP_CACHE.labels(endpoint, "miss").inc()
+        response.raise_for_status()
+        data = response.json()
+        self._store(url, CachedResponse(data, response.headers.get("ETag"), time.time()))
+        return data
+
+    def invalidate(self, address: Optional[str] = None):
+        """Drop cached responses mentioning ``address``, or everything."""
+        with self._lock:
+            if address is None:
+                self._cache.clear()
+                return
+            address = address.lower()
+            for url in [url for url in self._cache if address in url.lower()]:
+                del self._cache[url]
+
+    def collection(self, address: str, max_age: Optional[float] = None) -> Dict:
+        """Collection metadata and stats."""
+        return self.get_json(f"/v2/collections/{address}", max_age)["collection"]
+
+    def user_nfts_page(self, address: str, num_to_skip: int, num_to_fetch: int = HOLDERS_PAGE_SIZE,
+                       max_age: Optional[float] = None) -> List[Dict]:
+        """One page of a collection's NFTs with their holders, in tokenId order."""
+        data = self.get_json(
+            f"/v2/userNFTs?requireUser=false&collections={address}&numToSkip={num_to_skip}"
+            f"&numToFetch={num_to_fetch}&orderBy=tokenId",
+            max_age,
+        )
+        try:
+            return data["nfts"]
+        except KeyError:
+            logger.error(f"Error fetching NFTs of {address}: {data}")
+            raise
+
+
+@lru_cache(maxsize=None)
+def paintswap_client() -> PaintSwapClient:
+    """Process-wide PaintSwap client, so every caller shares its connections, rate limit and cache."""
+    return PaintSwapClient()
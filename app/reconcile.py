@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+
+from dataclasses import dataclass, field
+import logging
+from typing import Dict, List, Mapping, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (holder address lowercased, token id) -> amount
+Holdings1155 = Dict[Tuple[str, int], int]
+
+
+@dataclass
+class ReconcilePlan:
+    """Changes that bring a bridged collection's ownership in line with the source."""
+    is721: bool
+    # recipient -> [(token id, amount)] to mint; for ERC721 minting an existing id reassigns it
+    mints: Dict[str, List[Tuple[int, int]]] = field(default_factory=dict)
+    # ERC721 ids to burn
+    burns721: List[int] = field(default_factory=list)
+    # ERC1155 (holder, id, amount) to burn
+    burns1155: List[Tuple[str, int, int]] = field(default_factory=list)
+    # ERC1155 burns left out because burning is disabled on the bridged contract
+    skipped_burns1155: List[Tuple[str, int, int]] = field(default_factory=list)
+    # Ids that do not exist on the bridged contract yet and so have no URI there
+    new_token_ids: List[int] = field(default_factory=list)
+    unchanged: int = 0
+
+    @property
+    def num_mints(self) -> int:
+        return sum(len(tokens) for tokens in self.mints.values())
+
+    @property
+    def num_burns(self) -> int:
+        return len(self.burns721) + len(self.burns1155)
+
+    @property
+    def is_empty(self) -> bool:
+        return self.num_mints == 0 and self.num_burns == 0
+
+
+def desired_721(holders: Mapping) -> Dict[int, str]:
+    """Token id -> owner from a get_holders_via_api result."""
+    return {int(token_id): unit.address for unit in holders.values() for token_id in unit.token_ids}
+
+
+def desired_1155(holders: Mapping) -> Holdings1155:
+    """(holder, id) -> amount from a get_holders_via_api result."""
+    desired: Holdings1155 = {}
+    for unit in holders.values():
+        for token_id, amount in zip(unit.token_ids, unit.amounts):
+            key = (unit.address.lower(), int(token_id))
+            desired[key] = desired.get(key, 0) + int(amount)
+    return desired
+
+
+def diff_721(desired: Mapping[int, str], current: Mapping[int, str]) -> ReconcilePlan:
+    """Plan mints for missing or misowned ids and burns for ids the source no longer has.
+
+    ``current`` maps every existing bridged token id to its owner.
+    """
+    plan = ReconcilePlan(is721=True)
+    for token_id in sorted(desired):
+        owner = desired[token_id]
+        current_owner = current.get(token_id)
+        if current_owner is not None and current_owner.lower() == owner.lower():
+            plan.unchanged += 1
+            continue
+        plan.mints.setdefault(owner, []).append((token_id, 1))
+        if current_owner is None:
+            plan.new_token_ids.append(token_id)
+
+    plan.burns721 = sorted(token_id for token_id in current if token_id not in desired)
+    logger.info(f"ERC721 diff: {plan.unchanged} unchanged, {plan.num_mints} to mint, {plan.num_burns} to burn")
+    return plan
+
+
+def diff_1155(desired: Holdings1155, current: Holdings1155, holders: Mapping[str, str]) -> ReconcilePlan:
+    """Plan the per-holder balance changes between two ERC1155 holding maps.
+
+    Keys are (lowercased holder, id); ``holders`` maps lowercased addresses
+    back to the checksummed ones the calls are made with.
+    """
+    plan = ReconcilePlan(is721=False)
+    existing_ids = {token_id for (_, token_id), amount in current.items() if amount > 0}
+    for key in sorted(set(desired) | set(current)):
+        holder, token_id = key
+        delta = desired.get(key, 0) - current.get(key, 0)
+        if delta == 0:
+            if desired.get(key, 0) > 0:
+                plan.unchanged += 1
+        elif delta > 0:
+            plan.mints.setdefault(holders[holder], []).append((token_id, delta))
+        else:
+            plan.burns1155.append((holders[holder], token_id, -delta))
+
+    plan.new_token_ids = sorted({token_id for _, token_id in desired} - existing_ids)
+    logger.info(f"ERC1155 diff: {plan.unchanged} unchanged, {plan.num_mints} to mint, {plan.num_burns} to burn")
+    return plan
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_APP_DIR = os.path.dirname(os.path.abspath(__file__))
+# Plumbing every RPC passes through; the caller is the first app frame outside these
+_SKIP_FILES = {
+    os.path.join(_APP_DIR, name)
+    for name in ("rpc_profiler.py", "metrics.py", "utils.py", "contracts.py", "sessions.py")
+}
+
+# Profiles recording the current context's requests. Work handed to other threads
+# is attributed to them only when it runs in a copy of the context (copy_context().run).
+_active: ContextVar[Tuple["RpcProfile", ...]] = ContextVar("rpc_profiles", default=())
+# Bridge stage (metrics.time_stage) the current context is in, if any
+_stage: ContextVar[Optional[str]] = ContextVar("rpc_stage", default=None)
+
+
+@dataclass
+class RpcCall:
+    chain: str
+    method: str
+    target: Optional[str]
+    caller: str
+    seconds: float
+    stage: Optional[str] = None
+
+
+def _target(method: str, params: Any) -> Optional[str]:
+    """Contract or account a request is about, where the params name one."""
+    if not params:
+        return None
+    first = params[0] if isinstance(params, (list, tuple)) else params
+    if isinstance(first, dict):
+        return first.get("to") or first.get("address")
+    if method in ("eth_getCode", "eth_getBalance", "eth_getTransactionCount") and isinstance(first, str):
+        return first
+    return None
+
+
+def _caller() -> str:
+    """Innermost NFTBridge frame on the stack, else the innermost app frame outside the RPC plumbing."""
+    frame = sys._getframe(2)
+    fallback = None
+    while frame is not None:
+        filename = os.path.abspath(frame.f_code.co_filename)
+        if filename.startswith(_APP_DIR) and filename not in _SKIP_FILES:
+            name = f"{os.path.basename(filename)[:-3]}.{frame.f_code.co_name}:{frame.f_lineno}"
+            if filename.endswith("nft_bridge.py"):
+                return name
+            fallback = fallback or name
+        frame = frame.f_back
+    return fallback or "<external>"
+
+
+@dataclass(eq=False)
+class RpcProfile:
+    """Every JSON-RPC request made while the profile was active."""
+    name: str
+    started_at: float = field(default_factory=time.perf_counter)
+    finished_at: Optional[float] = None
+    calls: List[RpcCall] = field(default_factory=list)
+    stage_seconds: Dict[str, float] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def add(self, call: RpcCall):
+        with self._lock:
+            self.calls.append(call)
+
+    def add_stage_time(self, stage: str, seconds: float):
+        with self._lock:
+            self.stage_seconds[stage] = self.stage_seconds.get(stage, 0.0) + seconds
+
+    @property
+    def wall_seconds(self) -> float:
+        finished_at = time.perf_counter() if self.finished_at is None else self.finished_at
+        return finished_at - self.started_at
+
+    def for_stage(self, stage: str) -> "RpcProfile":
+        """The requests made in one stage, as a profile whose wall time is the stage's."""
+        with self._lock:
+            calls = [call for call in self.calls if call.stage == stage]
+            seconds = self.stage_seconds.get(stage, 0.0)
+        return RpcProfile(f"{self.name} [{stage}]", started_at=0.0, finished_at=seconds, calls=calls)
+
+    def _ranked(self, key) -> List[Tuple[Any, int, float]]:
+        totals: Dict[Any, List] = defaultdict(lambda: [0, 0.0])
+        with self._lock:
+            for call in self.calls:
+                entry = totals[key(call)]
+                entry[0] += 1
+                entry[1] += call.seconds
+        return sorted(((k, n, s) for k, (n, s) in totals.items()), key=lambda row: (-row[2], -row[1]))
+
+    def summary(self, limit: int = 20) -> Dict:
+        """Counts and time per RPC method, and the costliest (method, caller, target) sites."""
+        return {
+            "name": self.name,
+            "wall_seconds": round(self.wall_seconds, 3),
+            "rpc_calls": len(self.calls),
+            "rpc_seconds": round(sum(call.seconds for call in self.calls), 3),
+            "by_method": [
+                {"method": method, "calls": n, "seconds": round(s, 3)}
+                for method, n, s in self._ranked(lambda call: call.method)
+            ],
+            "by_stage": [
+                {"stage": stage, "calls": n, "seconds": round(s, 3),
+                 "wall_seconds": round(self.stage_seconds.get(stage, 0.0), 3)}
+                for stage, n, s in self._ranked(lambda call: call.stage) if stage is not None
+            ],
+            "top_callers": [
+                {"method": method, "caller": caller, "target": target, "calls": n, "seconds": round(s, 3)}
+                for (method, caller, target), n, s in
+                self._ranked(lambda call: (call.method, call.caller, call.target))[:limit]
+            ],
+        }
+
+    def report(self, limit: int = 20) -> str:
+        """Plain-text ranking of where the RPC time went."""
+        summary = self.summary(limit)
+        lines = [
+            f"RPC profile for {summary['name']}: {summary['rpc_calls']} calls, "
+            f"{summary['rpc_seconds']}s in RPC, {summary['wall_seconds']}s wall",
+            "By method:",
+        ]
+        lines += [f"  {row['calls']:>6}  {row['seconds']:>8.3f}s  {row['method']}" for row in summary["by_method"]]
+        if summary["by_stage"]:
+            lines.append("By stage:")
+            lines += [
+                f"  {row['calls']:>6}  {row['seconds']:>8.3f}s  {row['stage']} ({row['wall_seconds']}s wall)"
+                for row in summary["by_stage"]
+            ]
+        lines.append("Top callers:")
+        lines += [
+            f"  {row['calls']:>6}  {row['seconds']:>8.3f}s  {row['method']} {row['caller']}"
+            + (f" -> {row['target']}" if row["target"] else "")
+            for row in summary["top_callers"]
+        ]
+        return "\n".join(lines)
+
+
+def is_active() -> bool:
+    return bool(_active.get())
+
+
+def record(chain: str, method: str, params: Any, seconds: float):
+    """Attribute one finished RPC request to the profiles active in the current context."""
+    profiles = _active.get()
+    if not profiles:
+        return
+    call = RpcCall(chain=chain, method=method, target=_target(method, params), caller=_caller(), seconds=seconds,
+                   stage=_stage.get())
+    for profile in profiles:
+        profile.add(call)
+
+
+def start(name: str) -> RpcProfile:
+    """Start recording the requests of the current context, and of work run in copies of it."""
+    profile = RpcProfile(name)
+    _active.set(_active.get() + (profile,))
+    return profile
+
+
+def stop(profile: RpcProfile) -> RpcProfile:
+    profile.finished_at = time.perf_counter()
+    _active.set(tuple(active for active in _active.get() if active is not profile))
+    return profile
+
+
+@contextmanager
+def stage(name: str):
+    """Attribute the enclosed requests to bridge stage ``name`` and add its wall time to the active profiles.
+
+    Requests of a nested stage count towards the innermost one only.
+    """
+    token = _stage.set(name)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _stage.reset(token)
+        seconds = time.perf_counter() - start
+        for profile in _active.get():
+            profile.add_stage_time(name, seconds)
+
+
+@contextmanager
+def profile_rpc(name: str):
+    """Record the RPC requests made by the enclosed code until the block exits.
+
+    Requests of unrelated concurrent work are not attributed to the profile;
+    those of helper threads are, if they run in a copy of the caller's context.
+    """
+    profile = start(name)
+    try:
+        yield profile
+    finally:
+        stop(profile)
+        logger.info(profile.report())
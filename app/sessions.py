@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+
+from contextlib import contextmanager
+from functools import lru_cache
+import logging
+import threading
+from typing import Optional
+
+from ape import networks
+import requests
+from requests.adapters import HTTPAdapter
+from web3 import Web3
+
+from .constants import RPC_POOL_SIZE
+from .metrics import instrument_provider, instrument_web3
+from .utils import SOURCE_CHAIN, TARGET_CHAINS, chain_lock, flask_env, use_chain
+
+logger = logging.getLogger(__name__)
+
+
+class ChainSession:
+    """Long-lived, connection-pooled access to one chain.
+
+    The session connects the chain's ape provider once and keeps it, and
+    exposes a Web3 client over a pooled HTTP session for the same endpoint.
+    Code that goes through ``session.web3`` talks to this chain regardless
+    of which provider ape currently has active, so it can run on one thread
+    while another thread works on the other chain. Anything that goes
+    through ape (contracts, receipts, multicall) still needs the chain
+    context and its lock, see ``use``.
+    """
+
+    def __init__(self, ecosystem: str, network: str, provider_name: str, pool_size: int = RPC_POOL_SIZE):
+        self.ecosystem = ecosystem
+        self.network = network
+        self.provider_name = provider_name
+        self.pool_size = pool_size
+        self._provider = None
+        self._web3: Optional[Web3] = None
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"<ChainSession {self.ecosystem}:{self.network}:{self.provider_name}>"
+
+    def _connect(self):
+        with chain_lock, use_chain(self.ecosystem, self.network, self.provider_name):
+            provider = networks.provider
+        uri = getattr(provider, "http_uri", None) or provider.uri
+        http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+        http.mount("https://", adapter)
+        http.mount("http://", adapter)
+        self._web3 = Web3(Web3.HTTPProvider(uri, session=http))
+        instrument_web3(self._web3, f"{self.ecosystem}:{self.network}")
+        instrument_provider(provider)
+        self._provider = provider
+        logger.info(f"Opened {self}")
+
+    @property
+    def provider(self):
+        """The connected ape provider for this chain."""
+        with self._lock:
+            if self._provider is None:
+                self._connect()
+        return self._provider
+
+    @property
+    def web3(self) -> Web3:
+        with self._lock:
+            if self._web3 is None:
+                self._connect()
+        return self._web3
+
+    @contextmanager
+    def use(self):
+        """Make this chain ape's active provider, for code that goes through ape contracts.
+
+        Holds ``chain_lock`` meanwhile, like the chain context decorators, so
+        keep it to the ape calls themselves and do long waits through ``web3``
+        under ``chain_released``.
+        """
+        with chain_lock, use_chain(self.ecosystem, self.network, self.provider_name):
+            yield
+
+
+@lru_cache(maxsize=None)
+def source_session() -> ChainSession:
+    return ChainSession(*SOURCE_CHAIN)
+
+
+@lru_cache(maxsize=None)
+def target_session() -> ChainSession:
+    return ChainSession(*TARGET_CHAINS[flask_env])
@@ -1,11 +1,17 @@
 import dotenv
 dotenv.load_dotenv()
+import asyncio
 import logging
 from telegram import Update
 from telegram.ext import ApplicationBuilder, ContextTypes, CommandHandler
 from ape.logging import logger as ape_logger, LogLevel
 from .config import env_vars
-from .nft_bridge import NFTBridge, AirdropUnit
+from .nft_bridge import NFTBridge
+from .bulk import BulkBridge
+from .command_pool import CommandPool
+from .constants import BULK_MAX_IN_FLIGHT, METRICS_PORT, TG_COMMAND_WORKERS
+from .metrics import serve as serve_metrics
+from .rpc_profiler import profile_rpc
 from .utils import has_too_many_nfts, has_too_many_owners, last_sale_within_six_months
 
 # Configure logging with more detailed format
@@ -37,10 +43,15 @@ nft_bridge = NFTBridge(
     env_vars.BRIDGE_CONTROL_ADDRESS,
     env_vars.AUTHORIZER_ADDRESS,
     env_vars.FLASK_ENV,
-    skip_authorizer=False
+    skip_authorizer=False,
+    warm_start_block=int(env_vars.BRIDGE_START_BLOCK) if env_vars.BRIDGE_START_BLOCK else None,
+    holder_source=env_vars.HOLDER_SOURCE or "api"
 )
 logger.info("NFT Bridge initialized successfully")
 
+# NFTBridge calls block for up to minutes, so handlers run them on this pool to keep the bot responsive
+command_pool = CommandPool(int(env_vars.TG_COMMAND_WORKERS or TG_COMMAND_WORKERS))
+
 def tx_hash_to_link(tx_hash: str) -> str:
     env = env_vars.FLASK_ENV
     logger.debug(f"Generating transaction link for hash {tx_hash} in {env} environment")
@@ -62,22 +73,70 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
 Available commands:
 /approve <address> - Approve a collection for bridging
 /bridge <address> - Bridge a collection
-/remint <address> - Remint tokens for existing holders
-/reclaim <address> - Reclaim all tokens to admin wallet
+/remint <address> - Sync bridged tokens with current holders, minting or burning only what changed
+/reclaim <address> - Burn all bridged tokens, leaving the collection empty
 /seturis <address> <start_index> - Set URIs for tokens
+/resume <address> - Resume an interrupted bridge, skipping confirmed txs
+/bulkbridge <address> <address> ... - Bridge several collections at once, smallest first
 /clear <address> - Clear bridged storage (admin only)
 /rebridge <address> - Completely rebridge a collection (reclaim, clear, and bridge again)
 /xferownership <address> <new_owner> - Transfer ownership of a collection directly
 
 Optional parameters:
 - owner:<address> - Override the owner address (with /bridge, /rebridge)
-- override - Skip requirement checks (with /bridge, /remint, /reclaim, /rebridge)
+- override - Skip requirement checks (with /bridge, /remint, /reclaim, /rebridge, /bulkbridge)
+- inflight:<n> - Collections to work on at the same time (with /bulkbridge)
 - direct! - Bypass bridge contract to interact directly with NFT contracts (with /seturis)
+- refresh - Re-read token URIs from the source chain instead of the local cache (with /seturis)
+- profile - Reply with a ranked report of the RPC calls the command made (with any command)
 
-You can use either the original or bridged address with all commands!"""
+You can use either the original or bridged address with all commands!
+Commands on the same collection run one after another; if yours has to wait, I'll tell you its place in the queue."""
     await context.bot.send_message(chat_id=update.effective_chat.id, text=msg_str)
     logger.debug("Start message sent successfully")
 
+def profiled(command, handler):
+    """Wrap a command handler so a ``profile`` argument replies with a ranked RPC report afterwards."""
+    async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE):
+        if not context.args or "profile" not in context.args:
+            return await handler(update, context)
+
+        context.args.remove("profile")
+        with profile_rpc(f"/{command} {' '.join(context.args)}".strip()) as profile:
+            try:
+                return await handler(update, context)
+            finally:
+                # Telegram caps messages at 4096 characters
+                await context.bot.send_message(chat_id=update.effective_chat.id,
+                                               text=profile.report(limit=15)[:4000])
+
+    return wrapper
+
+def exclusive(handler, all_addresses=False):
+    """Wrap a command handler so it runs in a command pool slot, holding the lock of its collection.
+
+    The collection is the first address argument, or every address argument
+    with ``all_addresses``; flags such as ``profile`` are not collections.
+    Bridged addresses lock their original collection when the address cache
+    or the indexer know it; nothing here touches the chain, so the queue
+    notice is never held up by another command's transactions. If the
+    command has to wait, the chat is told its position in the queue.
+    """
+    async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE):
+        addresses = [arg for arg in context.args or [] if arg.startswith("0x")]
+        if not all_addresses:
+            addresses = addresses[:1]
+        # Resolved outside the command pool, whose workers may all be busy with other commands
+        originals = [await asyncio.to_thread(nft_bridge.known_original_address, address) for address in addresses]
+
+        async def notify(msg):
+            await context.bot.send_message(chat_id=update.effective_chat.id, text=msg)
+
+        async with command_pool.acquire(originals, notify):
+            return await handler(update, context)
+
+    return wrapper
+
 async def validate_collection(update, context, addr, collection_data):
     logger.info(f"Validating collection {addr}")
 
@@ -108,28 +167,17 @@ async def validate_collection(update, context, addr, collection_data):
     logger.info(f"Collection {addr} passed all validation checks")
     return True
 
-async def get_royalty_info(addr):
-    logger.info(f"Fetching royalty info for {addr}")
-    try:
-        royalty_data = nft_bridge.get_nft_royalty_info(addr)
-        if royalty_data is None:
-            logger.warning(f"No royalty data found for {addr}, falling back to on-chain data")
-            raise Exception("No royalty data found")
-        logger.debug(f"Royalty data retrieved: {royalty_data}")
-    except Exception as e:
-        logger.info(f"Getting on-chain royalty info for {addr} due to: {str(e)}")
-        royalty_data = nft_bridge.get_onchain_royalty_info(addr)
-    return royalty_data
-
 async def send_royalty_info(update, context, royalty_data):
     logger.debug(f"Sending royalty info: {royalty_data}")
     msg = f"*Royalty Info*\nRecipient: {royalty_data['recipient']}\nFee: {royalty_data['fee']}\n"
     await context.bot.send_message(chat_id=update.effective_chat.id, text=msg)
 
-async def handle_deployment(update, context, addr, is721, original_owner, royalty_data):
+async def handle_deployment(update, context, snapshot, is721, original_owner):
+    addr = snapshot.original_address
+    royalty_data = snapshot.royalty_data
     logger.info(f"Handling deployment for {addr} (is721: {is721})")
     if is721:
-        name, symbol, base_uri, _, extension = nft_bridge.get_collection_data(addr)
+        name, symbol, base_uri, extension = snapshot.name, snapshot.symbol, snapshot.base_uri, snapshot.extension
         logger.debug(f"ERC721 collection data: name={name}, symbol={symbol}, base_uri={base_uri}")
 
         msg = f"*Collection Info*\nName: {name}\nSymbol: {symbol}\nBase URI: {base_uri}\n" \
@@ -138,37 +186,80 @@ async def handle_deployment(update, context, addr, is721, original_owner, royalt
 
         logger.info("Deploying ERC721 contract")
         logger.debug(f"ERC721 Params: {addr}, {original_owner}, {name}, {symbol}, {base_uri}, {extension}, {royalty_data['recipient']}, {royalty_data['fee']}")
-        deployment_tx = nft_bridge.deploy_721(
-            addr, original_owner, name, symbol, base_uri, extension,
+        deployment_tx = await command_pool.run(
+            nft_bridge.deploy_721, addr, original_owner, name, symbol, base_uri, extension,
             royalty_data["recipient"], royalty_data["fee"]
         )
         logger.info(f"ERC721 deployment transaction: {deployment_tx.txn_hash}")
         return deployment_tx, base_uri
     else:
         logger.info("Deploying ERC1155 contract")
-        name = nft_bridge.get_collection_name(addr)
-        deployment_tx = nft_bridge.deploy_1155(
-            addr, original_owner, royalty_data["recipient"], royalty_data["fee"], name
+        deployment_tx = await command_pool.run(
+            nft_bridge.deploy_1155, addr, original_owner, royalty_data["recipient"], royalty_data["fee"], snapshot.name
         )
         logger.info(f"ERC1155 deployment transaction: {deployment_tx.txn_hash}")
         return deployment_tx, ""
 
-async def handle_airdrop(update, context, bridged_address, airdrop_units):
+async def handle_airdrop(update, context, bridged_address, airdrop_units, job_id=None):
     num_holders = len(airdrop_units)
     logger.info(f"Starting airdrop to {num_holders} holders for {bridged_address}")
     msg = f"Airdropping tokens to {num_holders} holders\n"
     await context.bot.send_message(chat_id=update.effective_chat.id, text=msg)
-    airdrop_txs = nft_bridge.airdrop_holders(bridged_address, airdrop_units)
+    if job_id is not None:
+        await command_pool.run(nft_bridge.job_store.set_stage, job_id, "airdrop")
+    airdrop_txs = await command_pool.run(nft_bridge.airdrop_holders, bridged_address, airdrop_units, job_id=job_id)
     logger.info(f"Completed airdrop with {len(airdrop_txs)} transactions")
     return airdrop_txs
 
-async def handle_uris(update, context, addr, bridged_address, is721, base_uri):
+async def handle_reclaim(update, context, addr, bridged_address):
+    """Burn every token of a bridged collection, recorded as a reclaim job."""
+    logger.info(f"Reclaiming all tokens of {bridged_address}")
+    job_id = await command_pool.run(nft_bridge.job_store.create_job, "reclaim", addr)
+    await command_pool.run(nft_bridge.job_store.update_job, job_id, bridged_address=bridged_address)
+    await command_pool.run(nft_bridge.job_store.set_stage, job_id, "reclaim")
+    try:
+        reclaim_txs = await command_pool.run(nft_bridge.reclaim_collection, addr, bridged_address, job_id=job_id)
+    except Exception as e:
+        await command_pool.run(nft_bridge.job_store.update_job, job_id, status="failed", error=str(e))
+        raise
+    await command_pool.run(nft_bridge.job_store.set_stage, job_id, "done", status="done")
+    logger.info(f"Completed reclaim with {len(reclaim_txs)} transactions")
+    return reclaim_txs
+
+async def fetch_deployment_uris(snapshot):
+    """Read the token URIs a snapshot needs copied, before deploying.
+
+    Returns the snapshot with the extension its URIs use, so the ERC721 is
+    deployed with it, and the URIs (None if the collection has a base URI).
+    """
+    if snapshot.is721 and snapshot.base_uri != "":
+        return snapshot, None
+    uris = await command_pool.run(nft_bridge.get_token_uris, snapshot.original_address, is721=snapshot.is721,
+                                  max_token_id=snapshot.max_token_id)
+    return nft_bridge.with_uri_pattern(snapshot, uris), uris
+
+async def handle_uris(update, context, addr, bridged_address, is721, base_uri, extension=None, job_id=None,
+                      max_token_id=None, uris=None):
+    """Copy token URIs to the bridged contract.
+
+    ``extension`` is the extension the bridged ERC721 was deployed with; when it
+    is known, URIs that follow a base URI pattern are compressed into setBaseURI.
+    With a ``job_id`` every URI tx is checkpointed so the job can be resumed.
+    ``max_token_id`` (from holder data) bounds the URI scan when known, and
+    ``uris`` already read by fetch_deployment_uris are not read again.
+    """
     logger.info(f"Handling URIs for {addr} (is721: {is721}, base_uri: {base_uri})")
     if not is721 or base_uri == "":
-        logger.debug("Fetching token URIs")
-        uris = nft_bridge.get_token_uris(addr, is721=is721)
+        if job_id is not None:
+            await command_pool.run(nft_bridge.job_store.set_stage, job_id, "uris")
+        if uris is None:
+            logger.debug("Fetching token URIs")
+            uris = await command_pool.run(nft_bridge.get_token_uris, addr, is721=is721, max_token_id=max_token_id)
         logger.debug(f"Setting {len(uris)} URIs")
-        uri_txs = nft_bridge.set_token_uris(bridged_address, uris)
+        if is721 and extension is not None:
+            uri_txs = await command_pool.run(nft_bridge.set_token_uris_compressed, bridged_address, uris, extension, job_id=job_id)
+        else:
+            uri_txs = await command_pool.run(nft_bridge.set_token_uris, bridged_address, uris, job_id=job_id)
         uri_tx_links = [tx_hash_to_link(tx.txn_hash) for tx in uri_txs]
         response_msg = f"URI txs: {'\n'.join(uri_tx_links)}"
         await context.bot.send_message(chat_id=update.effective_chat.id, text=response_msg)
@@ -208,7 +299,7 @@ async def bridge(update: Update, context: ContextTypes.DEFAULT_TYPE):
             logger.info(f"Owner override provided: {owner_override}")
 
     # Check if this is a bridged address
-    original_from_bridged = nft_bridge.get_original_address(input_addr)
+    original_from_bridged = await command_pool.run(nft_bridge.get_original_address, input_addr)
     if original_from_bridged:
         # This is a bridged address, so let's use the original address instead
         logger.info(f"Input address {input_addr} is a bridged address, using original address {original_from_bridged}")
@@ -220,20 +311,20 @@ async def bridge(update: Update, context: ContextTypes.DEFAULT_TYPE):
     else:
         addr = input_addr
     
-    if bridged_addr := nft_bridge.get_bridged_address(addr):
+    if bridged_addr := await command_pool.run(nft_bridge.get_bridged_address, addr, confirm=True):
         logger.info(f"Collection {addr} already bridged to {bridged_addr}")
         await context.bot.send_message(chat_id=update.effective_chat.id,
                                     text=f"Already bridged to {bridged_addr}. Use /remint {addr} to remint tokens to current holders.")
         return
 
-    if not nft_bridge.is_collection_approved(addr):
+    if not await command_pool.run(nft_bridge.is_collection_approved, addr):
         logger.warning(f"Collection {addr} not approved for bridging")
         await context.bot.send_message(chat_id=update.effective_chat.id,
                                     text=f"Collection not approved for bridging: {addr}")
         return
 
-    collection_data = nft_bridge.get_collection_data_api(addr)
-    if not override_requirements and not await validate_collection(update, context, addr, collection_data):
+    snapshot = await command_pool.run(nft_bridge.get_collection_snapshot, addr)
+    if not override_requirements and not await validate_collection(update, context, addr, snapshot.collection_data):
         logger.warning(f"Collection validation failed for {addr}")
         return
 
@@ -244,41 +335,58 @@ async def bridge(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await context.bot.send_message(chat_id=update.effective_chat.id,
                                  text=msg)
 
-    holders = nft_bridge.get_holders_via_api(addr)
-    airdrop_units = list(holders.values())
-    is721 = airdrop_units[0].is721
+    holders = snapshot.holders
+    airdrop_units = snapshot.airdrop_units
+    is721 = snapshot.is721
     logger.info(f"Collection type: {'ERC721' if is721 else 'ERC1155'}, holders: {len(holders)}")
 
-    royalty_data = await get_royalty_info(addr)
+    royalty_data = snapshot.royalty_data
     await send_royalty_info(update, context, royalty_data)
 
-    original_owner = nft_bridge.get_collection_owner(addr)
-    logger.info(f"Original collection owner: {original_owner}")
+    logger.info(f"Original collection owner: {snapshot.original_owner}")
 
-    original_owner = owner_override or nft_bridge.get_collection_owner(addr)
+    original_owner = owner_override or snapshot.original_owner
     logger.info(f"Using owner address: {original_owner} {'(override)' if owner_override else '(original)'}")
 
-    deployment_tx, base_uri = await handle_deployment(update, context, addr, is721,
-                                                    original_owner, royalty_data)
-    await send_tx_status(update, context, deployment_tx, "Deployment tx")
+    job_id = await command_pool.run(nft_bridge.job_store.create_job, "bridge", addr, original_owner)
+    await command_pool.run(nft_bridge.job_store.set_stage, job_id, "deploy")
+    try:
+        snapshot, uris = await fetch_deployment_uris(snapshot)
+        deployment_tx, base_uri = await handle_deployment(update, context, snapshot, is721, original_owner)
+        await command_pool.run(nft_bridge.job_store.update_job, job_id, deployment_tx=deployment_tx.txn_hash)
+        await send_tx_status(update, context, deployment_tx, "Deployment tx")
 
-    bridged_address = nft_bridge.get_bridged_address(addr)
-    if not bridged_address:
-        logger.error(f"Failed to deploy contract for {addr}")
-        await context.bot.send_message(chat_id=update.effective_chat.id,
-                                     text=f"Failed to deploy contract to target chain: {addr}")
-        return
+        bridged_address = await command_pool.run(nft_bridge.get_bridged_address, addr)
+        if not bridged_address:
+            logger.error(f"Failed to deploy contract for {addr}")
+            await command_pool.run(nft_bridge.job_store.update_job, job_id, status="failed", error="Failed to deploy contract to target chain")
+            await context.bot.send_message(chat_id=update.effective_chat.id,
+                                         text=f"Failed to deploy contract to target chain: {addr}")
+            return
 
-    logger.info(f"Successfully deployed contract: {bridged_address}")
-    await context.bot.send_message(chat_id=update.effective_chat.id,
-                                 text=f"Original address: {addr}\nBridged address: {bridged_address}")
+        logger.info(f"Successfully deployed contract: {bridged_address}")
+        await command_pool.run(nft_bridge.job_store.update_job, job_id, bridged_address=bridged_address)
+        await context.bot.send_message(chat_id=update.effective_chat.id,
+                                     text=f"Original address: {addr}\nBridged address: {bridged_address}")
 
-    airdrop_txs = await handle_airdrop(update, context, bridged_address, airdrop_units)
-    airdrop_tx_links = [tx_hash_to_link(tx.txn_hash) for tx in airdrop_txs]
-    await context.bot.send_message(chat_id=update.effective_chat.id,
-                                 text=f"\nAirdrop txs:\n{'\n'.join(airdrop_tx_links)}")
+        if not airdrop_units:
+            await context.bot.send_message(chat_id=update.effective_chat.id,
+                                         text=f"No current holders found for {addr}. Skipping airdrop.")
+        else:
+            airdrop_txs = await handle_airdrop(update, context, bridged_address, airdrop_units, job_id)
+            airdrop_tx_links = [tx_hash_to_link(tx.txn_hash) for tx in airdrop_txs]
+            await context.bot.send_message(chat_id=update.effective_chat.id,
+                                         text=f"\nAirdrop txs:\n{'\n'.join(airdrop_tx_links)}")
 
-    await handle_uris(update, context, addr, bridged_address, is721, base_uri)
+        await handle_uris(update, context, addr, bridged_address, is721, base_uri, snapshot.extension, job_id,
+                              snapshot.max_token_id, uris)
+    except Exception as e:
+        logger.error(f"Bridge job {job_id} for {addr} failed: {str(e)}", exc_info=True)
+        await command_pool.run(nft_bridge.job_store.update_job, job_id, status="failed", error=str(e))
+        await context.bot.send_message(chat_id=update.effective_chat.id,
+                                     text=f"Bridging failed: {str(e)}\nUse /resume {addr} to continue where it stopped.")
+        return
+    await command_pool.run(nft_bridge.job_store.set_stage, job_id, "done", status="done")
     logger.info(f"Bridge process completed successfully for {addr}")
 
     summary_msg = f"Collection bridged successfully: {addr}\n" \
@@ -293,6 +401,82 @@ async def bridge(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await context.bot.send_message(chat_id=update.effective_chat.id, text=summary_msg)
 
 
+async def resume(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    logger.info(f"Resume command received from user {update.effective_user.id}")
+    assert update.effective_chat is not None
+
+    if not context.args:
+        logger.warning("No address provided for resume command")
+        await context.bot.send_message(chat_id=update.effective_chat.id,
+                                     text="Please provide an address to resume.")
+        return
+
+    addr = context.args[0]
+    original_addr = await command_pool.run(nft_bridge.get_original_address, addr) or addr
+    job = await command_pool.run(nft_bridge.job_store.latest_unfinished_job, original_addr)
+    if job is None:
+        await context.bot.send_message(chat_id=update.effective_chat.id,
+                                     text=f"No unfinished bridge job for {original_addr}")
+        return
+
+    progress = await command_pool.run(nft_bridge.job_store.progress, job["id"])
+    progress_lines = [f"{stage}: {counts}" for stage, counts in progress.items()]
+    await context.bot.send_message(chat_id=update.effective_chat.id,
+                                 text=f"Resuming job {job['id']} for {original_addr} from stage {job['stage']}\n"
+                                      f"{'\n'.join(progress_lines)}")
+
+    try:
+        result = await command_pool.run(nft_bridge.resume_bridge, original_addr)
+    except Exception as e:
+        logger.error(f"Failed to resume bridge for {original_addr}: {str(e)}", exc_info=True)
+        await context.bot.send_message(chat_id=update.effective_chat.id,
+                                     text=f"Resume failed: {str(e)}")
+        return
+
+    tx_links = [tx_hash_to_link(tx_hash) for tx_hash in result.get("airdrop_txs", []) + result.get("uri_txs", [])]
+    summary_msg = f"Bridge job {result['job_id']} completed\n" \
+                  f"Original address: {original_addr}\n" \
+                  f"Bridged address: {result['bridged_address']}\n" \
+                  f"New txs:\n{'\n'.join(tx_links)}"
+    await context.bot.send_message(chat_id=update.effective_chat.id, text=summary_msg)
+
+async def bulkbridge(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    logger.info(f"Bulk bridge command received from user {update.effective_user.id}")
+    assert update.effective_chat is not None
+
+    addresses = []
+    override_requirements = False
+    max_in_flight = BULK_MAX_IN_FLIGHT
+    for arg in context.args or []:
+        if arg == "override":
+            override_requirements = True
+        elif arg.startswith("inflight:"):
+            max_in_flight = int(arg.split(":")[1])
+        else:
+            addresses.append(arg)
+
+    if not addresses:
+        logger.warning("No addresses provided for bulkbridge command")
+        await context.bot.send_message(chat_id=update.effective_chat.id,
+                                     text="Usage: /bulkbridge <address> <address> ... [override] [inflight:<n>]")
+        return
+
+    await context.bot.send_message(chat_id=update.effective_chat.id,
+                                 text=f"Bulk bridging {len(addresses)} collections, {max_in_flight} at a time")
+    bulk = BulkBridge(nft_bridge, max_in_flight, override_requirements)
+    results = await command_pool.run(bulk.run, addresses)
+
+    lines = []
+    for address, result in results.items():
+        if result["status"] == "done":
+            lines.append(f"{address}: bridged to {result['bridged_address']}")
+        elif result["status"] == "skipped":
+            lines.append(f"{address}: skipped, {result['reason']}")
+        else:
+            lines.append(f"{address}: failed, {result['error']} (use /resume {address})")
+    await context.bot.send_message(chat_id=update.effective_chat.id,
+                                 text=f"Bulk bridge finished:\n{'\n'.join(lines)}")
+
 async def remint(update: Update, context: ContextTypes.DEFAULT_TYPE):
     logger.info(f"Remint command received from user {update.effective_user.id}")
     assert update.effective_chat is not None
@@ -308,7 +492,7 @@ async def remint(update: Update, context: ContextTypes.DEFAULT_TYPE):
     logger.info(f"Starting remint process for input address: {input_addr}")
     
     # Resolve to original address - works with either original or bridged address
-    original_addr = nft_bridge.resolve_original_address(input_addr)
+    original_addr = await command_pool.run(nft_bridge.resolve_original_address, input_addr)
     if not original_addr:
         logger.warning(f"Could not resolve to a valid original address: {input_addr}")
         await context.bot.send_message(chat_id=update.effective_chat.id,
@@ -316,7 +500,7 @@ async def remint(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
         
     # Get the bridged address from the resolved original address
-    bridged_addr = nft_bridge.get_bridged_address(original_addr)
+    bridged_addr = await command_pool.run(nft_bridge.get_bridged_address, original_addr)
     if not bridged_addr:
         logger.warning(f"Collection {original_addr} not yet bridged")
         await context.bot.send_message(chat_id=update.effective_chat.id,
@@ -325,22 +509,51 @@ async def remint(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     override_requirements = len(context.args) > 1 and context.args[1] == "override"
 
-    collection_data = nft_bridge.get_collection_data_api(original_addr)
+    collection_data = await command_pool.run(nft_bridge.get_collection_data_api, original_addr)
     if not override_requirements and not await validate_collection(update, context, original_addr, collection_data):
         logger.warning(f"Collection validation failed for remint of {original_addr}")
         return
 
-    holders = nft_bridge.get_holders_via_api(original_addr)
-    airdrop_units = list(holders.values())
-    is721 = airdrop_units[0].is721
-    logger.info(f"Reminting for {len(holders)} holders")
+    holders = await command_pool.run(nft_bridge.get_holders, original_addr, max_age=0)
+    logger.info(f"Reconciling {bridged_addr} with {len(holders)} holders")
 
-    airdrop_txs = await handle_airdrop(update, context, bridged_addr, airdrop_units)
-    airdrop_tx_links = [tx_hash_to_link(tx.txn_hash) for tx in airdrop_txs]
-    await context.bot.send_message(chat_id=update.effective_chat.id,
-                                 text=f"Remint txs:\n{'\n'.join(airdrop_tx_links)}")
+    job_id = await command_pool.run(nft_bridge.job_store.create_job, "remint", original_addr)
+    await command_pool.run(nft_bridge.job_store.update_job, job_id, bridged_address=bridged_addr)
+    await command_pool.run(nft_bridge.job_store.set_stage, job_id, "remint")
+    try:
+        plan, remint_txs = await command_pool.run(nft_bridge.reconcile_holders, original_addr, bridged_addr, holders, job_id=job_id)
+    except Exception as e:
+        await command_pool.run(nft_bridge.job_store.update_job, job_id, status="failed", error=str(e))
+        raise
+
+    if plan.skipped_burns1155:
+        await context.bot.send_message(chat_id=update.effective_chat.id,
+                                     text=f"Burning is disabled on {bridged_addr}, "
+                                          f"{len(plan.skipped_burns1155)} balances that should be burned are left as they are.")
 
-    await handle_uris(update, context, original_addr, bridged_addr, is721, "")
+    if plan.is_empty:
+        await command_pool.run(nft_bridge.job_store.set_stage, job_id, "done", status="done")
+        await context.bot.send_message(chat_id=update.effective_chat.id,
+                                     text=f"All {plan.unchanged} holdings already match, nothing to remint.")
+        return
+
+    remint_tx_links = [tx_hash_to_link(tx.txn_hash) for tx in remint_txs]
+    await context.bot.send_message(chat_id=update.effective_chat.id,
+                                 text=f"{plan.unchanged} holdings unchanged, minted {plan.num_mints} and burned "
+                                      f"{plan.num_burns}.\nRemint txs:\n{'\n'.join(remint_tx_links)}")
+
+    # Only tokens that did not exist on the bridged contract before are missing their URIs,
+    # read fresh since the cached ones may predate their mint on the source chain
+    if plan.new_token_ids:
+        await command_pool.run(nft_bridge.job_store.set_stage, job_id, "uris")
+        uris = await command_pool.run(nft_bridge.read_token_uris, original_addr, plan.new_token_ids, is721=plan.is721)
+        uri_txs = await command_pool.run(nft_bridge.set_token_uris_for_ids, bridged_addr, uris, job_id=job_id)
+        missing = [token_id for token_id in plan.new_token_ids if uris.get(token_id) is None]
+        response_msg = f"URI txs: {'\n'.join(tx_hash_to_link(tx.txn_hash) for tx in uri_txs)}"
+        if missing:
+            response_msg += f"\nNo URI could be read for {len(missing)} new tokens: {missing[:20]}"
+        await context.bot.send_message(chat_id=update.effective_chat.id, text=response_msg)
+    await command_pool.run(nft_bridge.job_store.set_stage, job_id, "done", status="done")
     logger.info(f"Remint process completed successfully for {original_addr}")
 
 async def reclaim(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -358,7 +571,7 @@ async def reclaim(update: Update, context: ContextTypes.DEFAULT_TYPE):
     logger.info(f"Starting reclaim process for input address: {input_addr}")
     
     # Resolve to original address - works with either original or bridged address
-    original_addr = nft_bridge.resolve_original_address(input_addr)
+    original_addr = await command_pool.run(nft_bridge.resolve_original_address, input_addr)
     if not original_addr:
         logger.warning(f"Could not resolve to a valid original address: {input_addr}")
         await context.bot.send_message(chat_id=update.effective_chat.id,
@@ -366,7 +579,7 @@ async def reclaim(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
         
     # Get the bridged address from the resolved original address
-    bridged_addr = nft_bridge.get_bridged_address(original_addr)
+    bridged_addr = await command_pool.run(nft_bridge.get_bridged_address, original_addr)
     if not bridged_addr:
         logger.warning(f"Collection {original_addr} not yet bridged")
         await context.bot.send_message(chat_id=update.effective_chat.id,
@@ -374,40 +587,17 @@ async def reclaim(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
 
     override_requirements = len(context.args) > 1 and context.args[1] == "override"
-    collection_data = nft_bridge.get_collection_data_api(original_addr)
+    collection_data = await command_pool.run(nft_bridge.get_collection_data_api, original_addr)
     if not override_requirements and not await validate_collection(update, context, original_addr, collection_data):
         logger.warning(f"Collection validation failed for reclaim of {original_addr}")
         return
 
-    holders = nft_bridge.get_holders_via_api(original_addr)
-    if not holders:
-        logger.warning(f"No holders found for {original_addr}")
-        await context.bot.send_message(chat_id=update.effective_chat.id,
-                                     text=f"No holders found for {original_addr}.")
-        return
-
-    is721 = list(holders.values())[0].is721
-    admin_address = nft_bridge.deployer.address
-
-    admin_airdrop_units = []
-
-    if is721:
-        current_token_ids = []
-        for unit in holders.values():
-            if len(current_token_ids) < 25:
-                admin_airdrop_units.append(AirdropUnit(admin_address, current_token_ids.copy(), [], is721=True))
-                current_token_ids = []
-            current_token_ids.extend(unit.token_ids)
-        if len(current_token_ids) > 0:
-            admin_airdrop_units.append(AirdropUnit(admin_address, current_token_ids.copy(), [], is721=True))
-    else:
-        for unit in holders.values():
-            admin_airdrop_units.append(AirdropUnit(admin_address, unit.token_ids, unit.amounts, is721=False))
-
-    airdrop_txs = await handle_airdrop(update, context, bridged_addr, admin_airdrop_units)
-    airdrop_links = [tx_hash_to_link(tx.txn_hash) for tx in airdrop_txs]
     await context.bot.send_message(chat_id=update.effective_chat.id,
-                                 text=f"Reclaim txs:\n{'\n'.join(airdrop_links)}")
+                                 text=f"Burning every token of {bridged_addr}")
+    reclaim_txs = await handle_reclaim(update, context, original_addr, bridged_addr)
+    reclaim_links = [tx_hash_to_link(tx.txn_hash) for tx in reclaim_txs]
+    await context.bot.send_message(chat_id=update.effective_chat.id,
+                                 text=f"Reclaim txs:\n{'\n'.join(reclaim_links)}\nCollection is empty.")
 
     logger.info(f"Reclaim completed for {original_addr}")
 
@@ -421,7 +611,7 @@ async def approve(update: Update, context: ContextTypes.DEFAULT_TYPE):
     address = ''.join(context.args)
     logger.info(f"Attempting to approve address: {address}")
     try:
-        tx = nft_bridge.admin_set_bridging_approved(address, True)
+        tx = await command_pool.run(nft_bridge.admin_set_bridging_approved, address, True)
         logger.info(f"Successfully approved {address}, tx: {tx.txn_hash}")
         await context.bot.send_message(
             chat_id=update.effective_chat.id,
@@ -442,7 +632,7 @@ async def seturis(update: Update, context: ContextTypes.DEFAULT_TYPE):
         logger.warning("Invalid arguments for seturis command")
         await context.bot.send_message(
             chat_id=update.effective_chat.id,
-            text="Usage: /seturis <address> <start_index> [direct!]"
+            text="Usage: /seturis <address> <start_index> [direct!] [refresh]"
         )
         return
 
@@ -463,10 +653,13 @@ async def seturis(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if direct_override:
         logger.info("Direct override option specified - will bypass bridge contract")
 
+    # Re-read every URI from the source chain instead of using cached ones
+    refresh = "refresh" in context.args[2:]
+
     logger.info(f"Starting URI set process for input address: {input_addr} from index {start_index} (direct mode: {direct_override})")
     
     # Resolve to original address - works with either original or bridged address
-    original_addr = nft_bridge.resolve_original_address(input_addr)
+    original_addr = await command_pool.run(nft_bridge.resolve_original_address, input_addr)
     if not original_addr:
         logger.warning(f"Could not resolve to a valid original address: {input_addr}")
         await context.bot.send_message(
@@ -476,7 +669,7 @@ async def seturis(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
         
     # Get the bridged address from the resolved original address
-    bridged_address = nft_bridge.get_bridged_address(original_addr)
+    bridged_address = await command_pool.run(nft_bridge.get_bridged_address, original_addr)
     if not bridged_address:
         logger.warning(f"Collection {original_addr} not yet bridged")
         await context.bot.send_message(
@@ -486,19 +679,22 @@ async def seturis(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
 
     try:
-        is721 = not nft_bridge.is_erc1155(original_addr)  # Check if ERC1155
+        is721 = not await command_pool.run(nft_bridge.is_erc1155, original_addr)  # Check if ERC1155
 
-        uris = nft_bridge.get_token_uris(original_addr, is721=is721)
+        if refresh:
+            uris = await command_pool.run(nft_bridge.get_token_uris, original_addr, is721=is721, max_age=0)
+        else:
+            uris = await command_pool.run(nft_bridge.get_token_uris, original_addr, is721=is721)
         logger.info(f"Total URIs: {len(uris)}")
         uris = uris[start_index:]
         
         # Choose method based on direct override flag
         if direct_override:
             logger.info(f"Using direct URI setting for {bridged_address}")
-            uri_txs = nft_bridge.set_token_uris_direct(bridged_address, uris, start_from=start_index)
+            uri_txs = await command_pool.run(nft_bridge.set_token_uris_direct, bridged_address, uris, start_from=start_index)
         else:
             logger.info(f"Using bridge contract for URI setting")
-            uri_txs = nft_bridge.set_token_uris(bridged_address, uris, start_from=start_index)
+            uri_txs = await command_pool.run(nft_bridge.set_token_uris, bridged_address, uris, start_from=start_index)
 
         if not uri_txs:
             logger.info("No URIs to set")
@@ -540,7 +736,7 @@ async def clear(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     try:
         # Resolve to original address - works with either original or bridged address
-        original_addr = nft_bridge.resolve_original_address(input_addr)
+        original_addr = await command_pool.run(nft_bridge.resolve_original_address, input_addr)
         if not original_addr:
             logger.warning(f"Could not resolve to a valid original address: {input_addr}")
             await context.bot.send_message(chat_id=update.effective_chat.id,
@@ -548,14 +744,14 @@ async def clear(update: Update, context: ContextTypes.DEFAULT_TYPE):
             return
             
         # Get the bridged address from the resolved original address
-        bridged_addr = nft_bridge.get_bridged_address(original_addr)
+        bridged_addr = await command_pool.run(nft_bridge.get_bridged_address, original_addr)
         if not bridged_addr:
             logger.warning(f"Collection {original_addr} not bridged")
             await context.bot.send_message(chat_id=update.effective_chat.id,
                                          text=f"Collection not bridged: {input_addr}")
             return
 
-        tx = nft_bridge.clear_bridged_storage(original_addr)
+        tx = await command_pool.run(nft_bridge.clear_bridged_storage, original_addr)
         logger.info(f"Successfully cleared bridged storage for {original_addr}")
         await context.bot.send_message(
             chat_id=update.effective_chat.id,
@@ -597,7 +793,7 @@ async def rebridge(update: Update, context: ContextTypes.DEFAULT_TYPE):
             logger.info(f"Owner override provided: {owner_override}")
     
     # Resolve to original address - works with either original or bridged address
-    original_addr = nft_bridge.resolve_original_address(input_addr)
+    original_addr = await command_pool.run(nft_bridge.resolve_original_address, input_addr)
     if not original_addr:
         logger.warning(f"Could not resolve to a valid original address: {input_addr}")
         await context.bot.send_message(chat_id=update.effective_chat.id,
@@ -605,7 +801,7 @@ async def rebridge(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
     
     # Get the bridged address from the resolved original address
-    bridged_addr = nft_bridge.get_bridged_address(original_addr)
+    bridged_addr = await command_pool.run(nft_bridge.get_bridged_address, original_addr, confirm=True)
     if not bridged_addr:
         logger.warning(f"Collection {original_addr} not yet bridged")
         await context.bot.send_message(chat_id=update.effective_chat.id,
@@ -613,7 +809,7 @@ async def rebridge(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
 
     # Validate the collection if override isn't set
-    collection_data = nft_bridge.get_collection_data_api(original_addr)
+    collection_data = await command_pool.run(nft_bridge.get_collection_data_api, original_addr)
     if not override_requirements and not await validate_collection(update, context, original_addr, collection_data):
         logger.warning(f"Collection validation failed for {original_addr}")
         return
@@ -623,44 +819,17 @@ async def rebridge(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await context.bot.send_message(chat_id=update.effective_chat.id,
                                     text=f"Step 1/4: Reclaiming all tokens from collection {original_addr}...")
         
-        # Get holders data for reclaim
-        holders = nft_bridge.get_holders_via_api(original_addr)
-        if not holders:
-            await context.bot.send_message(chat_id=update.effective_chat.id,
-                                        text=f"No holders found for {original_addr}.")
-            # Continue anyway since the collection might exist but have no tokens
-        else:
-            # Prepare admin reclaim units
-            is721 = list(holders.values())[0].is721
-            admin_address = nft_bridge.deployer.address
-            admin_airdrop_units = []
-
-            if is721:
-                current_token_ids = []
-                for unit in holders.values():
-                    if len(current_token_ids) < 25:
-                        admin_airdrop_units.append(AirdropUnit(admin_address, current_token_ids.copy(), [], is721=True))
-                        current_token_ids = []
-                    current_token_ids.extend(unit.token_ids)
-                if len(current_token_ids) > 0:
-                    admin_airdrop_units.append(AirdropUnit(admin_address, current_token_ids.copy(), [], is721=True))
-            else:
-                for unit in holders.values():
-                    admin_airdrop_units.append(AirdropUnit(admin_address, unit.token_ids, unit.amounts, is721=False))
-
-            # Execute reclaim if we have tokens to reclaim
-            if admin_airdrop_units:
-                airdrop_txs = await handle_airdrop(update, context, bridged_addr, admin_airdrop_units)
-                airdrop_tx_links = [tx_hash_to_link(tx.txn_hash) for tx in airdrop_txs]
-                await context.bot.send_message(chat_id=update.effective_chat.id,
-                                            text=f"Reclaim transactions:\n{'\n'.join(airdrop_tx_links[:5])}" +
-                                            (f"\n...and {len(airdrop_tx_links) - 5} more" if len(airdrop_tx_links) > 5 else ""))
+        reclaim_txs = await handle_reclaim(update, context, original_addr, bridged_addr)
+        reclaim_tx_links = [tx_hash_to_link(tx.txn_hash) for tx in reclaim_txs]
+        await context.bot.send_message(chat_id=update.effective_chat.id,
+                                    text=f"Reclaim transactions:\n{'\n'.join(reclaim_tx_links[:5])}" +
+                                    (f"\n...and {len(reclaim_tx_links) - 5} more" if len(reclaim_tx_links) > 5 else ""))
         
         # STEP 2: CLEAR - Clear the bridged storage
         await context.bot.send_message(chat_id=update.effective_chat.id,
                                     text=f"Step 2/4: Clearing bridged storage for collection {original_addr}...")
         
-        clear_tx = nft_bridge.clear_bridged_storage(original_addr)
+        clear_tx = await command_pool.run(nft_bridge.clear_bridged_storage, original_addr)
         await context.bot.send_message(chat_id=update.effective_chat.id,
                                     text=f"Cleared bridged storage for {original_addr}\nTransaction: {tx_hash_to_link(clear_tx.txn_hash)}")
         
@@ -668,23 +837,23 @@ async def rebridge(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await context.bot.send_message(chat_id=update.effective_chat.id,
                                     text=f"Step 3/4: Deploying new bridged contract for {original_addr}...")
         
-        # Get royalty data and collection info (similar to bridge command)
-        royalty_data = await get_royalty_info(original_addr)
+        # Get current holders, royalty data and collection info in one snapshot
+        snapshot = await command_pool.run(nft_bridge.get_collection_snapshot, original_addr)
+        royalty_data = snapshot.royalty_data
         await send_royalty_info(update, context, royalty_data)
         
-        original_owner = owner_override or nft_bridge.get_collection_owner(original_addr)
+        original_owner = owner_override or snapshot.original_owner
         logger.info(f"Using owner address: {original_owner} {'(override)' if owner_override else '(original)'}")
         
-        # Get collection type from holders or directly from blockchain
-        is721 = is721 if 'is721' in locals() else not nft_bridge.is_erc1155(original_addr)
+        is721 = snapshot.is721
         
         # Deploy the new bridged contract
-        deployment_tx, base_uri = await handle_deployment(update, context, original_addr, is721,
-                                                        original_owner, royalty_data)
+        snapshot, uris = await fetch_deployment_uris(snapshot)
+        deployment_tx, base_uri = await handle_deployment(update, context, snapshot, is721, original_owner)
         await send_tx_status(update, context, deployment_tx, "Deployment tx")
         
         # Get the new bridged address
-        new_bridged_addr = nft_bridge.get_bridged_address(original_addr)
+        new_bridged_addr = await command_pool.run(nft_bridge.get_bridged_address, original_addr)
         if not new_bridged_addr:
             logger.error(f"Failed to deploy contract for {original_addr}")
             await context.bot.send_message(chat_id=update.effective_chat.id,
@@ -698,13 +867,12 @@ async def rebridge(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await context.bot.send_message(chat_id=update.effective_chat.id,
                                     text=f"Step 4/4: Airdropping tokens to holders for {original_addr}...")
         
-        # Get current holders (not admin-reclaimed ones)
-        current_holders = nft_bridge.get_holders_via_api(original_addr)
-        if not current_holders:
+        # Current holders (not admin-reclaimed ones) come from the snapshot
+        airdrop_units = snapshot.airdrop_units
+        if not airdrop_units:
             await context.bot.send_message(chat_id=update.effective_chat.id,
                                         text=f"No current holders found for {original_addr}. Skipping airdrop.")
         else:
-            airdrop_units = list(current_holders.values())
             airdrop_txs = await handle_airdrop(update, context, new_bridged_addr, airdrop_units)
             airdrop_tx_links = [tx_hash_to_link(tx.txn_hash) for tx in airdrop_txs]
             
@@ -713,7 +881,8 @@ async def rebridge(update: Update, context: ContextTypes.DEFAULT_TYPE):
                                         (f"\n...and {len(airdrop_tx_links) - 5} more" if len(airdrop_tx_links) > 5 else ""))
         
         # Handle URIs
-        await handle_uris(update, context, original_addr, new_bridged_addr, is721, base_uri)
+        await handle_uris(update, context, original_addr, new_bridged_addr, is721, base_uri, snapshot.extension,
+                          max_token_id=snapshot.max_token_id, uris=uris)
         
         # Send summary
         summary_msg = (
@@ -724,7 +893,7 @@ async def rebridge(update: Update, context: ContextTypes.DEFAULT_TYPE):
             f"Owner: {original_owner}{' (override)' if owner_override else ''}\n"
             f"Royalty recipient: {royalty_data['recipient']}\n"
             f"Royalty fee: {royalty_data['fee']}\n"
-            f"Total holders: {len(current_holders) if 'current_holders' in locals() else 0}\n"
+            f"Total holders: {len(snapshot.holders)}\n"
         )
         
         await context.bot.send_message(chat_id=update.effective_chat.id, text=summary_msg)
@@ -773,7 +942,7 @@ async def xferownership(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     try:
         # Attempt to transfer ownership
-        tx = nft_bridge.transfer_ownership(collection_address, new_owner)
+        tx = await command_pool.run(nft_bridge.transfer_ownership, collection_address, new_owner)
         
         # Send success message
         await context.bot.send_message(
@@ -805,20 +974,25 @@ def main():
         logger.error("TG_BOT_TOKEN environment variable not set")
         raise ValueError("Please set the TG_BOT_TOKEN environment variable")
 
+    serve_metrics(int(env_vars.METRICS_PORT or METRICS_PORT))
+
     logger.info("Initializing Telegram application")
-    application = ApplicationBuilder().token(env_vars.TG_BOT_TOKEN).build()
+    # Handle updates concurrently, so a long command does not hold back the others
+    application = ApplicationBuilder().token(env_vars.TG_BOT_TOKEN).concurrent_updates(True).build()
 
     logger.debug("Setting up command handlers")
     start_handler = CommandHandler('start', start)
-    bridge_handler = CommandHandler('bridge', bridge)
-    approve_handler = CommandHandler('approve', approve)
-    remint_handler = CommandHandler('remint', remint)
-    reclaim_handler = CommandHandler('reclaim', reclaim)
-    seturis_handler = CommandHandler('seturis', seturis)  # Add this line
-    clear_handler = CommandHandler('clear', clear)  # Add this line
-
-    rebridge_handler = CommandHandler('rebridge', rebridge)  # Add rebridge command
-    xferownership_handler = CommandHandler('xferownership', xferownership)  # Add ownership transfer command
+    bridge_handler = CommandHandler('bridge', exclusive(profiled('bridge', bridge)))
+    approve_handler = CommandHandler('approve', exclusive(profiled('approve', approve)))
+    remint_handler = CommandHandler('remint', exclusive(profiled('remint', remint)))
+    reclaim_handler = CommandHandler('reclaim', exclusive(profiled('reclaim', reclaim)))
+    seturis_handler = CommandHandler('seturis', exclusive(profiled('seturis', seturis)))  # Add this line
+    clear_handler = CommandHandler('clear', exclusive(profiled('clear', clear)))  # Add this line
+
+    rebridge_handler = CommandHandler('rebridge', exclusive(profiled('rebridge', rebridge)))  # Add rebridge command
+    xferownership_handler = CommandHandler('xferownership', exclusive(profiled('xferownership', xferownership)))  # Add ownership transfer command
+    resume_handler = CommandHandler('resume', exclusive(profiled('resume', resume)))
+    bulkbridge_handler = CommandHandler('bulkbridge', exclusive(profiled('bulkbridge', bulkbridge), all_addresses=True))
 
     application.add_handler(start_handler)
     application.add_handler(bridge_handler)
@@ -829,6 +1003,8 @@ def main():
     application.add_handler(clear_handler)
     application.add_handler(rebridge_handler)  # Add rebridge handler
     application.add_handler(xferownership_handler)  # Add ownership transfer handler
+    application.add_handler(resume_handler)
+    application.add_handler(bulkbridge_handler)
 
     logger.info("Starting bot polling")
     application.run_polling()
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from ape import networks
+from ape.api import ReceiptAPI, TransactionAPI
+from eth_utils import keccak, to_hex
+from web3.exceptions import TransactionNotFound
+
+from .constants import (
+    TX_PIPELINE_DEPTH,
+    TX_STUCK_TIMEOUT,
+    TX_GAS_BUMP,
+    TX_GAS_LIMIT_MULTIPLIER,
+    TX_REPLACED_TIMEOUT,
+)
+from .utils import chain_released
+
+logger = logging.getLogger(__name__)
+
+# Node errors for a rebroadcast whose nonce is already taken, by our own earlier tx or another one
+NONCE_TAKEN_ERRORS = ("nonce too low", "already known", "known transaction", "replacement transaction underpriced")
+
+
+@dataclass
+class PendingTx:
+    method: Any
+    args: tuple
+    nonce: int
+    txn: Optional[TransactionAPI] = None
+    txn_hashes: List[str] = field(default_factory=list)
+    sent_at: float = 0.0
+    # Hash and block of whichever of txn_hashes was mined
+    mined_hash: Optional[str] = None
+    block_number: Optional[int] = None
+    # ape receipt of the mined tx, fetched once it has its confirmations
+    receipt: Optional[ReceiptAPI] = None
+    tag: Any = None
+    # When the nonce was first seen consumed with no receipt for any of our hashes
+    nonce_taken_at: Optional[float] = None
+
+    @property
+    def mined(self) -> bool:
+        return self.mined_hash is not None
+
+
+class TxPipeline:
+    """Sign and broadcast contract transactions ahead of their confirmation.
+
+    Up to ``depth`` transactions are kept in flight with locally tracked
+    nonces; receipts are collected at the end. Transactions that sit in the
+    mempool longer than ``stuck_timeout`` are rebroadcast with the same nonce
+    and bumped fees. A transaction is only resent with a fresh nonce once its
+    nonce has been consumed, with none of its hashes having a receipt, for
+    ``replaced_timeout`` seconds, so an RPC whose receipt index lags behind
+    its nonce does not cause a double send.
+
+    It must be used inside the chain context the transactions are meant
+    for, since transactions are built and receipts decoded through ape.
+    With a ChainSession, the raw RPC traffic (nonces, fees, gas estimates,
+    sends and receipt checks) goes over that session's pooled connection,
+    and the waits for receipts release ``chain_lock`` so other threads can
+    use the chains meanwhile; only rebroadcasts take it back, one at a time.
+    """
+
+    def __init__(
+        self,
+        sender,
+        depth: int = TX_PIPELINE_DEPTH,
+        stuck_timeout: float = TX_STUCK_TIMEOUT,
+        replaced_timeout: float = TX_REPLACED_TIMEOUT,
+        gas_bump: float = TX_GAS_BUMP,
+        poll_interval: float = 1.0,
+        on_broadcast: Optional[Callable[[PendingTx], None]] = None,
+        session=None,
+    ):
+        self.sender = sender
+        self.depth = max(1, depth)
+        self.stuck_timeout = stuck_timeout
+        self.replaced_timeout = replaced_timeout
+        self.gas_bump = gas_bump
+        self.poll_interval = poll_interval
+        self.on_broadcast = on_broadcast
+        self.session = session
+        self.pending: List[PendingTx] = []
+        self._next_nonce: Optional[int] = None
+        self._lock = threading.RLock()
+
+    @property
+    def provider(self):
+        return self.session.provider if self.session is not None else networks.provider
+
+    @property
+    def web3(self):
+        return self.session.web3 if self.session is not None else networks.provider.web3
+
+    def _released(self):
+        """Context for waiting on receipts; only a session's Web3 can be used without the chain."""
+        return chain_released() if self.session is not None else nullcontext()
+
+    def _ape(self):
+        """Context for one call through ape from inside ``_released``."""
+        return self.session.use() if self.session is not None else nullcontext()
+
+    def _allocate_nonce(self) -> int:
+        if self._next_nonce is None:
+            self._next_nonce = self.web3.eth.get_transaction_count(self.sender.address, "pending")
+        nonce = self._next_nonce
+        self._next_nonce += 1
+        return nonce
+
+    def _current_fees(self) -> Dict[str, int]:
+        base_fee = self.web3.eth.get_block("latest").get("baseFeePerGas")
+        if base_fee is None:
+            return {"gas_price": self.web3.eth.gas_price}
+        priority_fee = self.web3.eth.max_priority_fee
+        return {"max_fee": 2 * base_fee + priority_fee, "max_priority_fee": priority_fee}
+
+    def _build_txn(self, item: PendingTx, **fee_kwargs) -> TransactionAPI:
+        if self.session is None:
+            return item.method.as_transaction(*item.args, sender=self.sender, nonce=item.nonce, **fee_kwargs)
+
+        receiver = item.method.contract.address
+        data = item.method.encode_input(*item.args)
+        gas_estimate = self.web3.eth.estimate_gas({"from": self.sender.address, "to": receiver, "data": to_hex(data)})
+        return self.provider.network.ecosystem.create_transaction(
+            chain_id=self.web3.eth.chain_id,
+            receiver=receiver,
+            sender=self.sender.address,
+            data=data,
+            nonce=item.nonce,
+            gas_limit=int(gas_estimate * TX_GAS_LIMIT_MULTIPLIER),
+            **(fee_kwargs or self._current_fees()),
+        )
+
+    def _broadcast(self, item: PendingTx, **fee_kwargs):
+        txn = self._build_txn(item, **fee_kwargs)
+        signed = self.sender.sign_transaction(txn)
+        raw_txn = signed.serialize_transaction()
+        # The hash is recorded before sending, so a crash right after the send cannot lose it
+        txn_hash = to_hex(keccak(raw_txn))
+        item.txn = signed
+        item.txn_hashes.append(txn_hash)
+        item.sent_at = time.time()
+        if self.on_broadcast is not None:
+            self.on_broadcast(item)
+        self.web3.eth.send_raw_transaction(raw_txn)
+        logger.info(f"Broadcast tx {txn_hash} with nonce {item.nonce}")
+
+    def _rebroadcast(self, item: PendingTx, **fee_kwargs):
+        """Broadcast a replacement for ``item``; a taken nonce is left to the receipt checks."""
+        try:
+            self._broadcast(item, **fee_kwargs)
+        except Exception as e:
+            if not any(error in str(e).lower() for error in NONCE_TAKEN_ERRORS):
+                raise
+            logger.info(f"Rebroadcast of nonce {item.nonce} rejected ({str(e)}), waiting for its receipt")
+
+    def _bumped_fees(self, txn: Optional[TransactionAPI]) -> Dict[str, int]:
+        """Fees for a replacement of ``txn``, or bumped current fees when the original is not at hand."""
+        fees = self._current_fees() if txn is None else {
+            name: getattr(txn, name, None) for name in ("max_fee", "max_priority_fee", "gas_price")
+        }
+        if fees.get("max_fee") is not None:
+            return {
+                "max_fee": int(fees["max_fee"] * self.gas_bump) + 1,
+                "max_priority_fee": int((fees.get("max_priority_fee") or 0) * self.gas_bump) + 1,
+            }
+        return {"gas_price": int(fees["gas_price"] * self.gas_bump) + 1}
+
+    def _mark_mined(self, item: PendingTx) -> bool:
+        """Record which of the item's hashes was mined, if any, from the raw receipt."""
+        for txn_hash in item.txn_hashes:
+            try:
+                receipt = self.web3.eth.get_transaction_receipt(txn_hash)
+            except TransactionNotFound:
+                continue
+            item.mined_hash = txn_hash
+            item.block_number = receipt["blockNumber"]
+            return True
+        return False
+
+    def _refresh(self):
+        """Mark mined transactions and repair stuck or replaced ones."""
+        unmined = [item for item in self.pending if not item.mined]
+        if not unmined:
+            return
+
+        chain_nonce = self.web3.eth.get_transaction_count(self.sender.address, "latest")
+        for item in unmined:
+            if self._mark_mined(item):
+                continue
+
+            if chain_nonce > item.nonce:
+                # Nonce is used up but none of our hashes has a receipt yet: either the receipt
+                # index lags behind, or the nonce was taken by another tx
+                now = time.time()
+                if item.nonce_taken_at is None:
+                    item.nonce_taken_at = now
+                if now - item.nonce_taken_at < self.replaced_timeout:
+                    continue
+                logger.warning(f"Nonce {item.nonce} was consumed by another tx, resending {item.txn_hashes[-1]}")
+                item.nonce = self._allocate_nonce()
+                item.nonce_taken_at = None
+                with self._ape():
+                    self._rebroadcast(item)
+            else:
+                item.nonce_taken_at = None
+                if time.time() - item.sent_at > self.stuck_timeout:
+                    logger.warning(f"Tx {item.txn_hashes[-1]} stuck for {self.stuck_timeout}s, rebroadcasting with higher fees")
+                    with self._ape():
+                        self._rebroadcast(item, **self._bumped_fees(item.txn))
+
+    def in_flight(self) -> int:
+        return sum(1 for item in self.pending if not item.mined)
+
+    def submit(self, method, *args, tag: Any = None) -> PendingTx:
+        """Broadcast ``method(*args)``, first waiting while ``depth`` txs are unmined.
+
+        ``tag`` is stored on the returned PendingTx for the caller's bookkeeping.
+        """
+        with self._lock:
+            with self._released():
+                while self.in_flight() >= self.depth:
+                    time.sleep(self.poll_interval)
+                    self._refresh()
+
+            item = PendingTx(method=method, args=args, nonce=self._allocate_nonce(), tag=tag)
+            self._broadcast(item)
+            self.pending.append(item)
+            return item
+
+    def adopt(self, method, *args, nonce: int, txn_hashes: List[str], tag: Any = None) -> PendingTx:
+        """Track a tx an earlier run already broadcast with ``nonce``, instead of sending it again.
+
+        While the nonce is unused, the same call is rebroadcast with that nonce
+        and bumped fees, in case the original left the mempool; the node
+        rejects it if the original is still pending. Once the nonce is used,
+        the usual checks apply: a receipt for any of ``txn_hashes`` completes
+        it, and only a nonce that stays used without one gets it resent.
+        """
+        with self._lock:
+            chain_nonce = self.web3.eth.get_transaction_count(self.sender.address, "latest")
+            if self._next_nonce is None:
+                self._next_nonce = self.web3.eth.get_transaction_count(self.sender.address, "pending")
+            item = PendingTx(method=method, args=args, nonce=nonce, txn_hashes=list(txn_hashes),
+                             sent_at=time.time(), tag=tag)
+            if nonce >= chain_nonce:
+                # Keep new txs off the adopted nonce even if the node no longer has the original
+                self._next_nonce = max(self._next_nonce, nonce + 1)
+                if not self._mark_mined(item):
+                    logger.info(f"Rebroadcasting unconfirmed tx with nonce {nonce}")
+                    self._rebroadcast(item, **self._bumped_fees(None))
+            self.pending.append(item)
+            return item
+
+    def collect(self) -> List[ReceiptAPI]:
+        """Wait for every submitted tx and return receipts in submission order."""
+        with self._lock:
+            with self._released():
+                while self.in_flight():
+                    time.sleep(self.poll_interval)
+                    self._refresh()
+
+            receipts = []
+            for item in self.pending:
+                receipt = self.confirm(item)
+                receipt.raise_for_status()
+                receipts.append(receipt)
+
+            self.pending = []
+            return receipts
+
+    def poll(self):
+        """Check on unmined txs once without blocking; mined ones get ``mined_hash`` set."""
+        with self._lock, self._released():
+            self._refresh()
+
+    def idle(self):
+        """Sleep one poll interval, leaving the chains to other threads meanwhile if there is a session."""
+        with self._released():
+            time.sleep(self.poll_interval)
+
+    def is_confirmed(self, *items: PendingTx) -> bool:
+        """Whether the txs are mined with the network's required confirmations, without waiting."""
+        if any(not item.mined for item in items):
+            return False
+        if not items:
+            return True
+        required_confirmations = self.provider.network.required_confirmations
+        head = self.web3.eth.block_number
+        return all(head - item.block_number + 1 >= required_confirmations for item in items)
+
+    def confirm(self, item: PendingTx) -> ReceiptAPI:
+        """Wait for a tx to be mined with the network's required confirmations and return its receipt."""
+        with self._released():
+            while not self.is_confirmed(item):
+                time.sleep(self.poll_interval)
+                self._refresh()
+        if item.receipt is None:
+            item.receipt = self.provider.get_receipt(item.mined_hash)
+        return item.receipt
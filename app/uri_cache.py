@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+
+import threading
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+from .constants import URI_CACHE_MISSING_MAX_AGE
+from .db import connect
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS token_uris (
+    collection TEXT NOT NULL COLLATE NOCASE,
+    token_id INTEGER NOT NULL,
+    uri TEXT,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (collection, token_id)
+);
+"""
+
+
+class UriCache:
+    """On-disk cache of source-chain token URIs keyed by (collection, token_id).
+
+    Ids that turned out not to exist are stored with a NULL uri, so a scan
+    resumed shortly after does not read them again. Entries older than the
+    caller's ``max_age`` are treated as missing, NULL ones already after
+    ``missing_max_age`` so tokens minted since are picked up.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self._conn = connect(path)
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def get_range(self, collection: str, start: int, stop: int, max_age: float,
+                  missing_max_age: float = URI_CACHE_MISSING_MAX_AGE) -> Dict[int, Optional[str]]:
+        """Fresh entries for token ids in [start, stop)."""
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT token_id, uri FROM token_uris WHERE collection = ? AND token_id >= ? AND token_id < ? "
+                "AND fetched_at >= CASE WHEN uri IS NULL THEN ? ELSE ? END",
+                (collection, start, stop, now - min(max_age, missing_max_age), now - max_age),
+            ).fetchall()
+        return {row["token_id"]: row["uri"] for row in rows}
+
+    def put_many(self, collection: str, entries: Iterable[Tuple[int, Optional[str]]]):
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO token_uris (collection, token_id, uri, fetched_at) VALUES (?, ?, ?, ?)",
+                [(collection, token_id, uri, now) for token_id, uri in entries],
+            )
+
+    def invalidate(self, collection: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM token_uris WHERE collection = ?", (collection,))
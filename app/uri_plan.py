@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+
+from collections import Counter
+from dataclasses import dataclass, field
+import logging
+from typing import List, Optional, Tuple
+
+from .utils import parse_url
+
+logger = logging.getLogger(__name__)
+
+# setBaseURI costs a transaction of its own, so it has to replace at least this many writes
+MIN_BASE_URI_MATCHES = 2
+
+
+@dataclass
+class UriWritePlan:
+    base_uri: Optional[str]
+    # Contiguous (start_id, uris) runs that still need explicit per-token storage
+    explicit: List[Tuple[int, List[str]]] = field(default_factory=list)
+    # Contiguous (first_id, last_id) ranges served by base_uri
+    covered_ranges: List[Tuple[int, int]] = field(default_factory=list)
+
+    @property
+    def num_covered(self) -> int:
+        return sum(last - first + 1 for first, last in self.covered_ranges)
+
+    @property
+    def num_explicit(self) -> int:
+        return sum(len(uris) for _, uris in self.explicit)
+
+
+def _patterned(token_uris: List[Optional[str]], start_id: int):
+    """(index, base, extension) of every URI of the form ``base/<id><extension>`` for its own token id."""
+    for i, uri in enumerate(token_uris):
+        if uri is None:
+            continue
+        url_data = parse_url(uri)
+        if url_data is None:
+            continue
+        base, number, ext = url_data
+        if number == str(start_id + i):
+            yield i, base, ext
+
+
+def detect_uri_pattern(token_uris: List[Optional[str]], start_id: int = 0) -> Optional[Tuple[str, str]]:
+    """Most common (base, extension) pair among fetched URIs, None if it would not pay for a base URI.
+
+    Unlike the collection probe, which only reads token 1, this looks at
+    every URI, so it also works when token 1 does not exist.
+    """
+    counts = Counter((base, ext) for _, base, ext in _patterned(token_uris, start_id))
+    if not counts:
+        return None
+    pattern, matches = counts.most_common(1)[0]
+    return pattern if matches >= MIN_BASE_URI_MATCHES else None
+
+
+def plan_uri_writes(token_uris: List[Optional[str]], start_id: int = 0, extension: str = "") -> UriWritePlan:
+    """Find the dominant ``base/<id><extension>`` pattern in a fetched URI list.
+
+    ``token_uris[i]`` is the URI of token ``start_id + i`` (None for missing
+    tokens). Tokens whose URI is exactly ``base + str(id) + extension`` for the
+    most common base are left to the contract's base URI; everything else is
+    returned as contiguous runs to write explicitly. Only ``extension`` is
+    accepted because the bridged ERC721 fixes its extension at deployment;
+    detect_uri_pattern picks it before the contract is deployed.
+    """
+    bases = {i: base for i, base, ext in _patterned(token_uris, start_id) if ext == extension}
+
+    counts = Counter(bases.values())
+    base_uri = None
+    if counts:
+        base_uri, matches = counts.most_common(1)[0]
+        if matches < MIN_BASE_URI_MATCHES:
+            base_uri = None
+
+    plan = UriWritePlan(base_uri=base_uri)
+    run_start, run = None, []
+    for i, uri in enumerate(token_uris):
+        token_id = start_id + i
+        covered = base_uri is not None and bases.get(i) == base_uri
+
+        if covered:
+            if plan.covered_ranges and plan.covered_ranges[-1][1] == token_id - 1:
+                plan.covered_ranges[-1] = (plan.covered_ranges[-1][0], token_id)
+            else:
+                plan.covered_ranges.append((token_id, token_id))
+
+        if uri is None or covered:
+            if run:
+                plan.explicit.append((run_start, run))
+            run_start, run = None, []
+            continue
+
+        if not run:
+            run_start = token_id
+        run.append(uri)
+
+    if run:
+        plan.explicit.append((run_start, run))
+
+    logger.info(
+        f"URI plan: base {base_uri!r} covers {plan.num_covered} tokens in {len(plan.covered_ranges)} ranges, "
+        f"{plan.num_explicit} explicit URIs in {len(plan.explicit)} runs"
+    )
+    return plan
@@ -1,10 +1,14 @@
 #!/usr/bin/env python3
+from contextlib import contextmanager, nullcontext
 from ape import networks
 import os
 import re
+import threading
 import time
 import logging
 
+from .metrics import instrument_provider
+
 flask_env = os.getenv("FLASK_ENV")
 
 logger = logging.getLogger(__name__)
@@ -14,16 +18,63 @@ def chunk(lst, n):
         yield lst[i : i + n]
 
 
+# (ecosystem, network, provider) of the target chain per FLASK_ENV
+TARGET_CHAINS = {
+    "development": ("ethereum", "local", "foundry"),
+    "testnet": ("fantom", "sonictest", "node"),
+    "prod": ("fantom", "sonic", "node"),
+}
+# (ecosystem, network, provider) of the source chain; overridable as "ecosystem:network:provider",
+# e.g. to point both chains at one local node for benchmarks
+SOURCE_CHAIN = tuple(os.getenv("PAINTBRIDGE_SOURCE_CHAIN", "fantom:opera:alchemy").split(":"))
+
+# ape's active provider is process-wide: code that goes through it (ape contracts,
+# multicall, networks.provider) holds this lock, so a thread switching chains cannot
+# pull the provider from under another. Helper threads started while it is held,
+# like the multicall engine's, work inside the holder's chain context. Long waits
+# that only talk to a ChainSession's own Web3 step out of it with chain_released.
+chain_lock = threading.RLock()
+
+
+@contextmanager
+def chain_released():
+    """Let other threads use ape's provider while this one waits on something that does not go through ape.
+
+    Fully releases ``chain_lock`` if this thread holds it. On the way back the
+    lock is taken again and the provider that was active is made active again,
+    since another thread may have switched chains meanwhile.
+    """
+    # RLock's save/restore hooks, as used by threading.Condition, undo every level of re-entry
+    if not chain_lock._is_owned():
+        yield
+        return
+    provider = networks.active_provider
+    state = chain_lock._release_save()
+    try:
+        yield
+    finally:
+        chain_lock._acquire_restore(state)
+        networks.active_provider = provider
+
+
+def use_chain(ecosystem: str, network: str, provider: str):
+    """Provider context for a chain, or a no-op if that chain is already active."""
+    active = networks.active_provider
+    if (
+        active is not None
+        and active.is_connected
+        and active.network.ecosystem.name == ecosystem
+        and active.network.name == network
+    ):
+        return nullcontext()
+    return getattr(networks, ecosystem).get_network(network).use_provider(provider)
+
+
 def target_chain_context(func):
     def wrapper(*args, **kwargs):
-        if flask_env == "development":
-            with networks.ethereum.local.use_provider("foundry"):
-                return func(*args, **kwargs)
-        elif flask_env == "testnet":
-            with networks.fantom.sonictest.use_provider("node"):
-                return func(*args, **kwargs)
-        elif flask_env == "prod":
-            with networks.fantom.sonic.use_provider("node"):
+        if flask_env in TARGET_CHAINS:
+            with chain_lock, use_chain(*TARGET_CHAINS[flask_env]):
+                instrument_provider(networks.provider)
                 return func(*args, **kwargs)
 
     return wrapper
@@ -31,7 +82,8 @@ def target_chain_context(func):
 
 def source_chain_context(func):
     def wrapper(*args, **kwargs):
-        with networks.fantom.opera.use_provider("alchemy"):
+        with chain_lock, use_chain(*SOURCE_CHAIN):
+            instrument_provider(networks.provider)
             return func(*args, **kwargs)
 
     return wrapper
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""End-to-end bridge benchmark on a local chain.
+
+One local foundry (anvil) node plays both the source and the target chain.
+Synthetic ERC721 and ERC1155 source collections are minted at each scale,
+their holders are served by a local stand-in for the PaintSwap API, and the
+NFTBridge pipeline (snapshot, deploy, airdrop, URIs) is run against them.
+Wall time, RPC requests, transactions and gas are reported per stage as
+JSON, so results from different commits can be compared:
+
+    python -m benchmarks.bench_bridge --scales 1000 10000
+    python -m benchmarks.bench_bridge --compare benchmarks/results/<commit>.json
+
+The deployer is loaded like in the app, from the DEPLOYER_NAME and
+DEPLOYER_PASSWORD keystore alias, and is funded from a local test account.
+"""
+
+import argparse
+from datetime import datetime, timezone
+import json
+import logging
+import os
+import subprocess
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+KINDS = ("erc721", "erc1155")
+DEFAULT_SCALES = (1_000, 10_000, 50_000)
+EXPECTED_EID = 1
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+logger = logging.getLogger("benchmarks.bench_bridge")
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def configure_environment(db_path: str):
+    """Point the app at the local chain before anything from it is imported.
+
+    The source chain is overridden to the local node, and the app reads its
+    database path and config at import time.
+    """
+    os.environ["FLASK_ENV"] = "development"
+    os.environ["PAINTBRIDGE_SOURCE_CHAIN"] = "ethereum:local:foundry"
+    os.environ["PAINTBRIDGE_DB"] = db_path
+    os.environ.setdefault("PORT", "5000")
+    os.environ.setdefault("EXPECTED_EID", str(EXPECTED_EID))
+    os.environ.setdefault("DESTINATION_EID", str(EXPECTED_EID))
+
+
+def deploy_infrastructure(deployer) -> Dict[str, str]:
+    """Deploy the endpoint, factory and bridge contracts and export their addresses for the app's config."""
+    from ape import project
+
+    endpoint = project.MockEndpoint.deploy(sender=deployer)
+    factory = project.NFTFactory.deploy(sender=deployer)
+    bridge_control = project.SCCNFTBridge.deploy(endpoint, factory, EXPECTED_EID, sender=deployer)
+    addresses = {
+        "SOURCE_ENDPOINT_ADDRESS": endpoint.address,
+        "TARGET_ENDPOINT_ADDRESS": endpoint.address,
+        "FACTORY_ADDRESS": factory.address,
+        "BRIDGE_ADDRESS": bridge_control.address,
+    }
+    os.environ.update(addresses)
+    return addresses
+
+
+def stage_counter(name: str, collection: str, stage: str) -> float:
+    """Value of a per-collection, per-stage transaction counter of app.metrics."""
+    from prometheus_client import REGISTRY
+
+    return REGISTRY.get_sample_value(name, {"collection": collection.lower(), "stage": stage}) or 0
+
+
+def stage_result(profile, collection: str, stage: str) -> Dict:
+    """Cost of one stage: its wall time and RPC requests from the profile, its txs and gas from app.metrics."""
+    summary = profile.for_stage(stage).summary()
+    return {
+        "seconds": summary["wall_seconds"],
+        "rpc_calls": summary["rpc_calls"],
+        "rpc_seconds": summary["rpc_seconds"],
+        "rpc_by_method": {row["method"]: row["calls"] for row in summary["by_method"]},
+        "txs": int(stage_counter("paintbridge_txs_total", collection, stage)),
+        "gas": int(stage_counter("paintbridge_gas_used_total", collection, stage)),
+    }
+
+
+def bridge_once(nft_bridge, source_address: str) -> Dict[str, Dict]:
+    """Snapshot and bridge one collection with NFTBridge.bridge_collection, measuring each stage."""
+    from app import rpc_profiler
+
+    profile = rpc_profiler.start(f"bridge {source_address}")
+    try:
+        snapshot = nft_bridge.get_collection_snapshot(source_address)
+        nft_bridge.admin_set_bridging_approved(source_address, True)
+        nft_bridge.bridge_collection(snapshot)
+    finally:
+        rpc_profiler.stop(profile)
+
+    # Each synthetic collection is new, so its counters only hold this run
+    stages = {name: stage_result(profile, source_address, name) for name in profile.stage_seconds}
+    for name, stage in stages.items():
+        logger.info(f"  {name}: {stage['seconds']}s, {stage['rpc_calls']} RPC calls, "
+                    f"{stage['txs']} txs, {stage['gas']} gas")
+    return stages
+
+
+def totals(stages: Dict[str, Dict]) -> Dict:
+    return {
+        key: round(sum(stage[key] for stage in stages.values()), 3)
+        for key in ("seconds", "rpc_calls", "rpc_seconds", "txs", "gas")
+    }
+
+
+def run(kinds: List[str], scales: List[int], paintswap_rate: Optional[float]) -> Dict:
+    from ape import accounts, networks
+    from ape_ethereum import multicall
+
+    from .mock_paintswap import MockPaintSwap
+    from .synthetic import deploy_source_collection
+
+    mock = MockPaintSwap().start()
+    with networks.ethereum.local.use_provider("foundry"):
+        multicall.Call.inject()
+        funder = accounts.test_accounts[0]
+        deployer = accounts.load(os.environ["DEPLOYER_NAME"])
+        deployer.set_autosign(True, os.environ["DEPLOYER_PASSWORD"])
+        funder.transfer(deployer, "1000 ether")
+        addresses = deploy_infrastructure(deployer)
+
+        # app modules read their configuration on import
+        from app.constants import PAINTSWAP_RATE_LIMIT
+        from app.metrics import instrument_provider
+        from app.nft_bridge import NFTBridge
+        from app.paintswap import PaintSwapClient
+
+        instrument_provider(networks.provider)
+        nft_bridge = NFTBridge(
+            os.environ["DEPLOYER_NAME"],
+            os.environ["DEPLOYER_PASSWORD"],
+            addresses["SOURCE_ENDPOINT_ADDRESS"],
+            addresses["TARGET_ENDPOINT_ADDRESS"],
+            EXPECTED_EID,
+            addresses["FACTORY_ADDRESS"],
+            addresses["BRIDGE_ADDRESS"],
+            environment="development",
+            skip_authorizer=True,
+            paintswap=PaintSwapClient(base_url=mock.url, rate=paintswap_rate or PAINTSWAP_RATE_LIMIT),
+        )
+
+        runs = []
+        try:
+            for kind in kinds:
+                for scale in scales:
+                    logger.info(f"Minting synthetic {kind} collection of {scale}")
+                    collection = deploy_source_collection(kind, scale, funder)
+                    mock.add_collection(collection.address, collection.paintswap_nfts(), f"Bench {scale}")
+                    logger.info(f"Bridging {kind} x {scale}")
+                    start = time.perf_counter()
+                    stages = bridge_once(nft_bridge, collection.address)
+                    runs.append({
+                        "kind": kind,
+                        "scale": scale,
+                        "holders": collection.num_holders,
+                        "holdings": len(collection.holdings),
+                        "wall_seconds": round(time.perf_counter() - start, 3),
+                        "stages": stages,
+                        "totals": totals(stages),
+                    })
+        finally:
+            mock.stop()
+
+    return {
+        "commit": git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "chain": "ethereum:local:foundry",
+        "paintswap_requests": mock.requests,
+        "runs": runs,
+    }
+
+
+def _delta(new: float, old: float) -> str:
+    if not old:
+        return f"{new} (was {old})"
+    return f"{new} ({(new - old) / old:+.1%})"
+
+
+def compare(result: Dict, baseline: Dict) -> str:
+    """Per-stage changes of ``result`` against a baseline result file."""
+    base_runs = {(run["kind"], run["scale"]): run for run in baseline["runs"]}
+    lines = [f"{result['commit']} vs {baseline['commit']}"]
+    for run in result["runs"]:
+        base = base_runs.get((run["kind"], run["scale"]))
+        if base is None:
+            lines.append(f"{run['kind']} x {run['scale']}: no baseline")
+            continue
+        lines.append(f"{run['kind']} x {run['scale']}:")
+        for name, stage in list(run["stages"].items()) + [("total", run["totals"])]:
+            base_stage = base["totals"] if name == "total" else base["stages"].get(name)
+            if base_stage is None:
+                lines.append(f"  {name}: no baseline")
+                continue
+            lines.append(
+                f"  {name:<9} time {_delta(stage['seconds'], base_stage['seconds'])}, "
+                f"rpc {_delta(stage['rpc_calls'], base_stage['rpc_calls'])}, "
+                f"txs {_delta(stage['txs'], base_stage['txs'])}, "
+                f"gas {_delta(stage['gas'], base_stage['gas'])}"
+            )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--kinds", nargs="+", choices=KINDS, default=list(KINDS))
+    parser.add_argument("--scales", nargs="+", type=int, default=list(DEFAULT_SCALES),
+                        help="Tokens (ERC721) or holdings (ERC1155) per synthetic collection")
+    parser.add_argument("--output", help="Result file, defaults to benchmarks/results/<commit>.json")
+    parser.add_argument("--compare", metavar="BASELINE", help="Result file of an earlier run to compare against")
+    parser.add_argument("--paintswap-rate", type=float,
+                        help="Requests per second allowed to the mock PaintSwap API, defaults to the app's limit")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+    db_dir = tempfile.mkdtemp(prefix="paintbridge-bench-")
+    configure_environment(os.path.join(db_dir, "paintbridge.db"))
+
+    result = run(args.kinds, args.scales, args.paintswap_rate)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{result['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(result, f, indent=2)
+    logger.info(f"Wrote {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            print(compare(result, json.load(f)))
+
+
+if __name__ == "__main__":
+    main()
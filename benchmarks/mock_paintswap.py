@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import logging
+import threading
+from typing import Dict, List
+from urllib.parse import parse_qs, urlparse
+
+logger = logging.getLogger(__name__)
+
+
+class MockPaintSwap:
+    """Local stand-in for the PaintSwap /v2/collections and /v2/userNFTs endpoints.
+
+    Collections are registered with the NFT entries the real API would list
+    for them; /v2/userNFTs pages through those entries in tokenId order.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.collections: Dict[str, Dict] = {}
+        self.nfts: Dict[str, List[Dict]] = {}
+        self.requests = 0
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+            def do_GET(self):
+                mock.requests += 1
+                status, body = mock.handle(self.path)
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self._thread = threading.Thread(target=self.server.serve_forever, name="mock-paintswap", daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def add_collection(self, address: str, nfts: List[Dict], name: str = ""):
+        """Register a collection. ``nfts`` are userNFTs entries: user, tokenId, amount, isERC721."""
+        nfts = sorted(nfts, key=lambda nft: int(nft["tokenId"]))
+        self.nfts[address.lower()] = nfts
+        self.collections[address.lower()] = {
+            "address": address,
+            "name": name,
+            "verified": True,
+            "stats": {
+                "totalNFTs": len(nfts),
+                "numOwners": len({nft["user"].lower() for nft in nfts}),
+            },
+        }
+
+    def handle(self, path: str):
+        url = urlparse(path)
+        parts = url.path.strip("/").split("/")
+        if parts[:2] == ["v2", "collections"] and len(parts) == 3:
+            collection = self.collections.get(parts[2].lower())
+            if collection is None:
+                return 404, {"error": "Collection not found"}
+            return 200, {"collection": collection}
+
+        if parts == ["v2", "userNFTs"]:
+            query = parse_qs(url.query)
+            address = query.get("collections", [""])[0].lower()
+            num_to_skip = int(query.get("numToSkip", ["0"])[0])
+            num_to_fetch = int(query.get("numToFetch", ["1000"])[0])
+            nfts = self.nfts.get(address, [])
+            return 200, {"nfts": nfts[num_to_skip:num_to_skip + num_to_fetch]}
+
+        return 404, {"error": f"Unknown endpoint {url.path}"}
+
+    def start(self) -> "MockPaintSwap":
+        self._thread.start()
+        logger.info(f"Mock PaintSwap API listening on {self.url}")
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
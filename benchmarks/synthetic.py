@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+
+from dataclasses import dataclass
+import logging
+from typing import Dict, List, Tuple
+
+from ape import project
+from eth_utils import keccak, to_checksum_address
+
+logger = logging.getLogger(__name__)
+
+# Tokens (ERC721) or (holder, id) holdings (ERC1155) minted per source transaction
+MINT_BATCH_SIZE = 300
+# Average tokens per holder
+TOKENS_PER_HOLDER = 4
+# ERC1155 holdings per token id
+HOLDINGS_PER_ID = 50
+BASE_URI = "ipfs://paintbridge-bench/"
+
+
+@dataclass
+class SyntheticCollection:
+    kind: str
+    address: str
+    # (holder, token id, amount)
+    holdings: List[Tuple[str, int, int]]
+
+    @property
+    def is721(self) -> bool:
+        return self.kind == "erc721"
+
+    @property
+    def num_holders(self) -> int:
+        return len({holder for holder, _, _ in self.holdings})
+
+    def paintswap_nfts(self) -> List[Dict]:
+        """The collection's entries as the PaintSwap /v2/userNFTs endpoint lists them, numbers as strings."""
+        return [
+            {"user": holder, "tokenId": str(token_id), "amount": str(amount), "isERC721": self.is721}
+            for holder, token_id, amount in self.holdings
+        ]
+
+
+def holder_address(index: int) -> str:
+    """Deterministic EOA-like address for synthetic holder ``index``."""
+    return to_checksum_address(keccak(text=f"paintbridge-bench-holder-{index}")[-20:])
+
+
+def plan_holdings(kind: str, scale: int) -> List[Tuple[str, int, int]]:
+    """``scale`` tokens (ERC721) or holdings (ERC1155) spread over about scale / 4 holders."""
+    num_holders = max(1, scale // TOKENS_PER_HOLDER)
+    if kind == "erc721":
+        return [(holder_address(i % num_holders), i + 1, 1) for i in range(scale)]
+
+    num_ids = max(1, scale // HOLDINGS_PER_ID)
+    holdings: Dict[Tuple[str, int], int] = {}
+    for i in range(scale):
+        key = (holder_address(i % num_holders), 1 + i % num_ids)
+        holdings[key] = holdings.get(key, 0) + 1 + i % 3
+    return [(holder, token_id, amount) for (holder, token_id), amount in holdings.items()]
+
+
+def _units(holdings: List[Tuple[str, int, int]], is721: bool) -> List[tuple]:
+    per_holder: Dict[str, List[Tuple[int, int]]] = {}
+    for holder, token_id, amount in holdings:
+        per_holder.setdefault(holder, []).append((token_id, amount))
+    if is721:
+        return [(holder, [token_id for token_id, _ in tokens]) for holder, tokens in per_holder.items()]
+    return [
+        (holder, [token_id for token_id, _ in tokens], [amount for _, amount in tokens], b"")
+        for holder, tokens in per_holder.items()
+    ]
+
+
+def _batches(units: List[tuple], size: int) -> List[List[tuple]]:
+    batches, current, count = [], [], 0
+    for unit in units:
+        if current and count + len(unit[1]) > size:
+            batches.append(current)
+            current, count = [], 0
+        current.append(unit)
+        count += len(unit[1])
+    if current:
+        batches.append(current)
+    return batches
+
+
+def deploy_source_collection(kind: str, scale: int, owner) -> SyntheticCollection:
+    """Deploy and mint a synthetic source collection on the active (local) chain.
+
+    The source contracts are the bridge's own ERC721/ERC1155, which expose
+    everything the bridge reads from a source collection. The ERC721 uses a
+    base URI so its URIs compress; the ERC1155 gets an explicit URI per id,
+    so bridging it exercises the URI stage.
+    """
+    holdings = plan_holdings(kind, scale)
+    if kind == "erc721":
+        contract = project.ERC721.deploy(
+            owner, f"Bench {scale}", f"B{scale}", BASE_URI, ".json", owner, 500, sender=owner
+        )
+    else:
+        contract = project.ERC1155.deploy(owner, owner, 500, sender=owner)
+        contract.setName(f"Bench {scale}", sender=owner)
+
+    for batch in _batches(_units(holdings, kind == "erc721"), MINT_BATCH_SIZE):
+        contract.bulkAirdrop(batch, sender=owner)
+
+    if kind == "erc1155":
+        token_ids = sorted({token_id for _, token_id, _ in holdings})
+        for start in range(0, len(token_ids), MINT_BATCH_SIZE):
+            ids = token_ids[start:start + MINT_BATCH_SIZE]
+            contract.batchSetTokenURIs(ids[0], [f"{BASE_URI}1155/{token_id}.json" for token_id in ids], sender=owner)
+
+    logger.info(f"Minted {len(holdings)} {kind} holdings at {contract.address}")
+    return SyntheticCollection(kind=kind, address=contract.address, holdings=holdings)
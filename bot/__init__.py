@@ -45,14 +45,21 @@ API_IP_ADDR = "http://34.229.118.170"
 def get_endpoint(addr):
     return f"{API_IP_ADDR}/api/bridge/{addr}"
 
+def get_job_endpoint(job_id):
+    return f"{API_IP_ADDR}/api/jobs/{job_id}"
+
 def bridge_over_api(addr):
+    """Queue a bridge job on the API; the job runs in the API's worker pool."""
     endpoint = get_endpoint(addr)
     logger.info(f"Sending bridging request to {endpoint}")
 
-    response = requests.get(endpoint)
-    if response.status_code == 200:
-        logger.info(f"Successfully bridged {addr}")
-        logger.info(response.json())
+    response = requests.post(endpoint, timeout=30)
+    if response.status_code in (200, 202):
+        result = response.json()
+        if "job_id" in result:
+            logger.info(f"Queued bridge job {result['job_id']} for {addr}, track it at {get_job_endpoint(result['job_id'])}")
+        else:
+            logger.info(result)
     else:
         logger.error(f"Failed to bridge {addr}")
         logger.error(response.text)
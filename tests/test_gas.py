@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+
+from app.gas import (
+    URI_BATCH_BASE_GAS,
+    AirdropGasModel,
+    BurnGasModel,
+    estimate_uri_write_gas,
+    plan_airdrop_batches,
+    plan_burn_batches,
+    plan_uri_batches,
+)
+from app.nft_bridge import AirdropUnit
+
+MODEL = AirdropGasModel(base_gas=100, per_unit_gas=10, per_token_gas=50)
+
+
+def unit(address: str, num_tokens: int, first_id: int = 0) -> AirdropUnit:
+    token_ids = list(range(first_id, first_id + num_tokens))
+    return AirdropUnit(address, token_ids, [1] * num_tokens, True)
+
+
+def test_airdrop_batches_keep_holders_whole_and_within_budget():
+    units = [unit("a", 2), unit("b", 2, 10), unit("c", 2, 20)]
+    # Two holders of two tokens each: 100 + 2 * 10 + 4 * 50 = 320
+    batches = plan_airdrop_batches(units, MODEL, 320)
+    assert [[u.address for u in batch] for batch in batches] == [["a", "b"], ["c"]]
+    assert all(MODEL.estimate(batch) <= 320 for batch in batches)
+
+
+def test_airdrop_batches_split_an_oversized_holder():
+    big = unit("big", 10)
+    batches = plan_airdrop_batches([big], MODEL, 300)
+    assert all(MODEL.estimate(batch) <= 300 for batch in batches)
+    token_ids = [token_id for batch in batches for u in batch for token_id in u.token_ids]
+    assert token_ids == big.token_ids
+    assert all(len(u.amounts) == len(u.token_ids) for batch in batches for u in batch)
+
+
+def test_airdrop_batches_make_progress_below_one_token():
+    batches = plan_airdrop_batches([unit("a", 3)], MODEL, 50)
+    assert [len(batch[0].token_ids) for batch in batches] == [1, 1, 1]
+
+
+
+def test_long_uris_cost_more_storage_than_short_ones():
+    assert estimate_uri_write_gas("ipfs://" + "a" * 60) > estimate_uri_write_gas("ar://a")
+
+
+def test_uri_batches_stay_under_the_ceiling_in_order():
+    uris = [f"ipfs://bafy/{i}.json" for i in range(50)] + ["ar://" + "x" * 200] * 5
+    ceiling = 300_000
+    batches = plan_uri_batches(uris, ceiling)
+    assert [uri for batch in batches for uri in batch] == uris
+    assert all(URI_BATCH_BASE_GAS + sum(map(estimate_uri_write_gas, batch)) <= ceiling for batch in batches)
+    assert len(batches) > 1
+
+
+def test_burn_batches_fit_the_budget():
+    model = BurnGasModel(base_gas=1_000, per_token_gas=100)
+    batches = plan_burn_batches(list(range(25)), model, 2_000)
+    assert [len(batch) for batch in batches] == [10, 10, 5]
+    assert [token_id for batch in batches for token_id in batch] == list(range(25))
+
+
+def test_burn_batches_take_one_token_when_the_budget_is_too_small():
+    model = BurnGasModel(base_gas=1_000, per_token_gas=100)
+    assert plan_burn_batches([1, 2], model, 500) == [[1], [2]]
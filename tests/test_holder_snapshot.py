@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+
+from eth_abi import encode
+from eth_utils import to_checksum_address
+
+from app.constants import ZERO_ADDR
+from app.holder_snapshot import (
+    TRANSFER_BATCH_TOPIC,
+    TRANSFER_SINGLE_TOPIC,
+    TRANSFER_TOPIC,
+    LogHolderScanner,
+)
+
+ALICE = to_checksum_address("0x00000000000000000000000000000000000000a1")
+BOB = to_checksum_address("0x00000000000000000000000000000000000000b0")
+OPERATOR = "0x0000000000000000000000000000000000000001"
+
+
+def topic(value) -> bytes:
+    if isinstance(value, str):
+        return bytes.fromhex(value[2:]).rjust(32, b"\0")
+    return value.to_bytes(32, "big")
+
+
+def transfer(sender: str, to: str, token_id: int) -> dict:
+    return {"topics": [topic(TRANSFER_TOPIC), topic(sender), topic(to), topic(token_id)], "data": b""}
+
+
+def transfer_single(sender: str, to: str, token_id: int, amount: int) -> dict:
+    return {
+        "topics": [topic(TRANSFER_SINGLE_TOPIC), topic(OPERATOR), topic(sender), topic(to)],
+        "data": encode(["uint256", "uint256"], [token_id, amount]),
+    }
+
+
+def transfer_batch(sender: str, to: str, token_ids, amounts) -> dict:
+    return {
+        "topics": [topic(TRANSFER_BATCH_TOPIC), topic(OPERATOR), topic(sender), topic(to)],
+        "data": encode(["uint256[]", "uint256[]"], [token_ids, amounts]),
+    }
+
+
+def test_fold_721_follows_transfers_and_burns():
+    logs = [
+        transfer(ZERO_ADDR, ALICE, 1),
+        transfer(ZERO_ADDR, ALICE, 2),
+        transfer(ALICE, BOB, 1),
+        transfer(ALICE, ZERO_ADDR, 2),
+    ]
+    snapshot = LogHolderScanner.fold(logs, 100)
+    assert snapshot.is721 is True
+    assert snapshot.owners == {1: BOB}
+    assert snapshot.holdings() == {BOB: [(1, 1)]}
+    assert snapshot.num_logs == 4
+
+
+def test_fold_skips_erc20_transfers():
+    erc20 = {"topics": [topic(TRANSFER_TOPIC), topic(ZERO_ADDR), topic(ALICE)], "data": topic(5)}
+    snapshot = LogHolderScanner.fold([erc20], 100)
+    assert snapshot.is721 is None
+    assert snapshot.owners == {}
+
+
+def test_fold_1155_tracks_balances():
+    logs = [
+        transfer_batch(ZERO_ADDR, ALICE, [1, 2], [5, 1]),
+        transfer_single(ALICE, BOB, 1, 2),
+        transfer_single(ALICE, ZERO_ADDR, 2, 1),
+    ]
+    snapshot = LogHolderScanner.fold(logs, 100)
+    assert snapshot.is721 is False
+    assert snapshot.balances == {(ALICE, 1): 3, (BOB, 1): 2}
+    assert snapshot.holdings() == {ALICE: [(1, 3)], BOB: [(1, 2)]}
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+
+import time
+
+import pytest
+
+from app.job_store import JobAlreadyRunning, JobStore
+
+COLLECTION = "0x00000000000000000000000000000000000000c0"
+
+
+@pytest.fixture
+def store(tmp_path):
+    return JobStore(str(tmp_path / "jobs.db"))
+
+
+def test_plan_chunks_stores_the_plan(store):
+    job_id = store.create_job("bridge", COLLECTION)
+    payloads = [{"method": "airdrop721", "args": [COLLECTION, i]} for i in range(3)]
+    chunks = store.plan_chunks(job_id, "airdrop", payloads)
+    assert [chunk["chunk_index"] for chunk in chunks] == [0, 1, 2]
+    assert [chunk["payload"] for chunk in chunks] == payloads
+    assert all(chunk["status"] == "pending" and chunk["tx_hashes"] == [] for chunk in chunks)
+
+
+def test_plan_chunks_returns_the_stored_plan_on_resume(store):
+    job_id = store.create_job("bridge", COLLECTION)
+    store.plan_chunks(job_id, "airdrop", [{"method": "a", "args": []}, {"method": "b", "args": []}])
+    store.record_chunk(job_id, "airdrop", 0, "submitted", ["0x01"], 7)
+
+    chunks = store.plan_chunks(job_id, "airdrop", [{"method": "other", "args": []}])
+    assert [chunk["payload"]["method"] for chunk in chunks] == ["a", "b"]
+    assert chunks[0]["status"] == "submitted"
+    assert chunks[0]["tx_hashes"] == ["0x01"]
+    assert chunks[0]["nonce"] == 7
+
+
+def test_plan_chunks_is_per_stage(store):
+    job_id = store.create_job("bridge", COLLECTION)
+    store.plan_chunks(job_id, "airdrop", [{"method": "a", "args": []}])
+    chunks = store.plan_chunks(job_id, "uris", [{"method": "u", "args": []}])
+    assert [chunk["payload"]["method"] for chunk in chunks] == ["u"]
+
+
+def test_record_chunk_keeps_hashes_and_nonce_on_status_change(store):
+    job_id = store.create_job("bridge", COLLECTION)
+    store.plan_chunks(job_id, "airdrop", [{"method": "a", "args": []}, {"method": "b", "args": []}])
+    store.record_chunk(job_id, "airdrop", 0, "submitted", ["0x01", "0x02"], 3)
+    store.record_chunk(job_id, "airdrop", 0, "confirmed")
+
+    chunk = store.chunks(job_id, "airdrop")[0]
+    assert chunk["status"] == "confirmed"
+    assert chunk["tx_hashes"] == ["0x01", "0x02"]
+    assert chunk["nonce"] == 3
+    assert store.progress(job_id) == {"airdrop": {"confirmed": 1, "pending": 1}}
+    assert store.tx_hashes(job_id) == {"airdrop": ["0x01", "0x02"]}
+
+
+def test_a_job_can_only_be_claimed_once(store):
+    job_id = store.create_job("bridge", COLLECTION)
+    store.claim(job_id)
+    assert store.get_job(job_id)["status"] == "running"
+    with pytest.raises(JobAlreadyRunning):
+        store.claim(job_id)
+
+    store.update_job(job_id, status="failed")
+    store.claim(job_id)
+
+
+def test_a_stale_claim_can_be_taken_over(store, monkeypatch):
+    job_id = store.create_job("bridge", COLLECTION)
+    store.claim(job_id)
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 60)
+    store.claim(job_id, stale_after=30)
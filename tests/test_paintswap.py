@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+
+import time
+
+import pytest
+
+from app.paintswap import PaintSwapClient, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000.0
+        self.slept = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(time, "time", clock.time)
+    monkeypatch.setattr(time, "sleep", clock.sleep)
+    return clock
+
+
+def test_token_bucket_allows_a_burst_then_paces(clock):
+    bucket = TokenBucket(rate=2, burst=3)
+    for _ in range(3):
+        bucket.acquire()
+    assert clock.slept == []
+
+    bucket.acquire()
+    assert clock.slept == [pytest.approx(0.5)]
+
+
+def test_token_bucket_refills_while_idle(clock):
+    bucket = TokenBucket(rate=1, burst=2)
+    bucket.acquire()
+    bucket.acquire()
+    clock.now += 10
+    bucket.acquire()
+    bucket.acquire()
+    # Refilling stops at the burst size
+    assert clock.slept == []
+    bucket.acquire()
+    assert clock.slept == [pytest.approx(1.0)]
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, data=None, etag=None):
+        self.status_code = status_code
+        self._data = data
+        self.headers = {"ETag": etag} if etag else {}
+
+    def json(self):
+        return self._data
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+class FakeHttp:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests.append((url, dict(headers or {})))
+        return self.responses.pop(0)
+
+
+def client_with(responses, cache_ttl: float = 300) -> PaintSwapClient:
+    client = PaintSwapClient(base_url="http://paintswap.test", rate=1_000, burst=1_000, cache_ttl=cache_ttl)
+    client.http = FakeHttp(responses)
+    return client
+
+
+def test_fresh_responses_come_from_the_cache(clock):
+    client = client_with([FakeResponse(200, {"collection": {"name": "A"}})])
+    assert client.collection("0xabc") == {"name": "A"}
+    clock.now += 10
+    assert client.collection("0xabc") == {"name": "A"}
+    assert len(client.http.requests) == 1
+
+
+def test_max_age_zero_bypasses_the_cache(clock):
+    client = client_with([FakeResponse(200, {"nfts": [1]}), FakeResponse(200, {"nfts": [2]})])
+    assert client.user_nfts_page("0xabc", 0) == [1]
+    assert client.user_nfts_page("0xabc", 0, max_age=0) == [2]
+    assert len(client.http.requests) == 2
+
+
+def test_stale_responses_are_revalidated_with_their_etag(clock):
+    client = client_with([FakeResponse(200, {"collection": {"name": "A"}}, etag='"v1"'), FakeResponse(304)],
+                         cache_ttl=60)
+    client.collection("0xabc")
+    clock.now += 61
+    assert client.collection("0xabc") == {"name": "A"}
+    assert client.http.requests[1][1] == {"If-None-Match": '"v1"'}
+
+
+def test_invalidate_drops_the_collection(clock):
+    client = client_with([FakeResponse(200, {"collection": {"name": "A"}}),
+                          FakeResponse(200, {"collection": {"name": "B"}})])
+    client.collection("0xAbC")
+    client.invalidate("0xabc")
+    assert client.collection("0xAbC") == {"name": "B"}
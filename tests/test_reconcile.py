@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+
+from app.reconcile import diff_1155, diff_721
+
+ALICE = "0x00000000000000000000000000000000000000A1"
+BOB = "0x00000000000000000000000000000000000000B0"
+
+
+def test_diff_721_matching_ownership_is_empty():
+    plan = diff_721({1: ALICE, 2: BOB}, {1: ALICE.lower(), 2: BOB})
+    assert plan.is_empty
+    assert plan.unchanged == 2
+
+
+def test_diff_721_mints_missing_and_misowned_ids():
+    plan = diff_721({1: ALICE, 2: ALICE, 3: BOB}, {1: ALICE, 2: BOB})
+    assert plan.mints == {ALICE: [(2, 1)], BOB: [(3, 1)]}
+    # Id 2 exists and is only reassigned, id 3 is new
+    assert plan.new_token_ids == [3]
+    assert plan.unchanged == 1
+
+
+def test_diff_721_burns_ids_the_source_no_longer_has():
+    plan = diff_721({1: ALICE}, {1: ALICE, 5: BOB, 4: BOB})
+    assert plan.burns721 == [4, 5]
+    assert plan.num_mints == 0
+
+
+def test_diff_1155_mints_and_burns_balance_deltas():
+    holders = {ALICE.lower(): ALICE, BOB.lower(): BOB}
+    desired = {(ALICE.lower(), 1): 5, (BOB.lower(), 2): 1}
+    current = {(ALICE.lower(), 1): 2, (BOB.lower(), 1): 3}
+    plan = diff_1155(desired, current, holders)
+    assert plan.mints == {ALICE: [(1, 3)], BOB: [(2, 1)]}
+    assert plan.burns1155 == [(BOB, 1, 3)]
+    assert plan.new_token_ids == [2]
+    assert plan.unchanged == 0
+
+
+def test_diff_1155_matching_balances_is_empty():
+    holders = {ALICE.lower(): ALICE}
+    plan = diff_1155({(ALICE.lower(), 1): 2}, {(ALICE.lower(), 1): 2}, holders)
+    assert plan.is_empty
+    assert plan.unchanged == 1
+    assert plan.new_token_ids == []
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+
+import time
+
+import pytest
+
+from app.uri_cache import UriCache
+
+COLLECTION = "0x00000000000000000000000000000000000000c0"
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return UriCache(str(tmp_path / "uris.db"))
+
+
+def test_get_range_returns_entries_in_range(cache):
+    cache.put_many(COLLECTION, [(0, "ipfs://0"), (1, None), (5, "ipfs://5")])
+    assert cache.get_range(COLLECTION, 0, 5, max_age=60) == {0: "ipfs://0", 1: None}
+
+
+def test_collections_are_matched_case_insensitively(cache):
+    cache.put_many(COLLECTION, [(0, "ipfs://0")])
+    assert cache.get_range(COLLECTION.upper().replace("0X", "0x"), 0, 1, max_age=60) == {0: "ipfs://0"}
+
+
+def test_stale_entries_are_missing(cache, monkeypatch):
+    cache.put_many(COLLECTION, [(0, "ipfs://0")])
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 120)
+    assert cache.get_range(COLLECTION, 0, 1, max_age=60) == {}
+    assert cache.get_range(COLLECTION, 0, 1, max_age=0) == {}
+
+
+def test_put_many_replaces_and_invalidate_drops(cache):
+    cache.put_many(COLLECTION, [(0, None)])
+    cache.put_many(COLLECTION, [(0, "ipfs://0")])
+    assert cache.get_range(COLLECTION, 0, 1, max_age=60) == {0: "ipfs://0"}
+
+    cache.invalidate(COLLECTION)
+    assert cache.get_range(COLLECTION, 0, 1, max_age=60) == {}
+
+
+def test_missing_ids_expire_sooner(cache, monkeypatch):
+    cache.put_many(COLLECTION, [(0, "ipfs://0"), (1, None)])
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 120)
+    assert cache.get_range(COLLECTION, 0, 2, max_age=3600, missing_max_age=60) == {0: "ipfs://0"}
+    assert cache.get_range(COLLECTION, 0, 2, max_age=3600, missing_max_age=600) == {0: "ipfs://0", 1: None}
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+
+from app.uri_plan import detect_uri_pattern, plan_uri_writes
+
+BASE = "ipfs://bafy/"
+
+
+def test_dominant_base_covers_matching_ids():
+    uris = [f"{BASE}{i}.json" for i in range(5)]
+    plan = plan_uri_writes(uris, extension=".json")
+    assert plan.base_uri == BASE
+    assert plan.covered_ranges == [(0, 4)]
+    assert plan.explicit == []
+
+
+def test_outliers_and_gaps_are_written_explicitly():
+    uris = [f"{BASE}0.json", "ar://other", f"{BASE}2.json", None, f"{BASE}4.json", "ar://last"]
+    plan = plan_uri_writes(uris, start_id=0, extension=".json")
+    assert plan.base_uri == BASE
+    assert plan.covered_ranges == [(0, 0), (2, 2), (4, 4)]
+    assert plan.explicit == [(1, ["ar://other"]), (5, ["ar://last"])]
+    assert plan.num_covered == 3
+    assert plan.num_explicit == 2
+
+
+def test_ids_are_offset_by_start_id():
+    uris = [f"{BASE}{i}" for i in range(10, 13)]
+    plan = plan_uri_writes(uris, start_id=10)
+    assert plan.base_uri == BASE
+    assert plan.covered_ranges == [(10, 12)]
+
+
+def test_other_extension_is_not_covered():
+    uris = [f"{BASE}{i}.json" for i in range(3)]
+    plan = plan_uri_writes(uris, extension="")
+    assert plan.base_uri is None
+    assert plan.explicit == [(0, uris)]
+
+
+def test_a_single_match_does_not_pay_for_a_base_uri():
+    uris = [f"{BASE}0", "ar://a", "ar://b"]
+    plan = plan_uri_writes(uris)
+    assert plan.base_uri is None
+    assert plan.covered_ranges == []
+    assert plan.explicit == [(0, uris)]
+
+
+def test_pattern_is_detected_without_token_1():
+    uris = [f"{BASE}0.json", None, f"{BASE}2.json", "ar://other", f"{BASE}4.json"]
+    assert detect_uri_pattern(uris) == (BASE, ".json")
+    plan = plan_uri_writes(uris, extension=".json")
+    assert plan.covered_ranges == [(0, 0), (2, 2), (4, 4)]
+    assert plan.explicit == [(3, ["ar://other"])]
+
+
+def test_no_pattern_below_the_minimum_matches():
+    assert detect_uri_pattern([f"{BASE}0.json", "ar://a", None]) is None
+    assert detect_uri_pattern([]) is None